@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+"""The benchmark definitions.
+
+A benchmark is a setup function that gets a SceneGenerator and returns
+(func, inputs). The runner calls func(*args) for every args in inputs
+and reports the time per call, so the setup work (creating the random
+bodies) is never measured.
+"""
+from fractions import Fraction
+
+from sgl import calc
+from sgl.cache import ResultCache
+from sgl.fit import LineFitter, PlaneFitter
+from sgl.hull import convex_hull, vertices
+from sgl.line import Line, clip_lines
+from sgl.plane import Plane, clip_planes, planes_from_coefficients
+from sgl.point import Point
+from sgl.predicates import orient3d
+from sgl.region import ConvexRegion, side
+from sgl.solver import solve, solve_batch
+from sgl.triangle import cast_rays
+from sgl.util import unify_types
+from sgl.vector import Vector
+
+#: Number of inputs generated for each benchmark
+COUNT = 200
+
+BENCHMARKS = []
+
+
+def benchmark(name):
+    """Register the decorated setup function under the given name."""
+    def decorator(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return decorator
+
+
+def swapped(pair):
+    """Turn a pair factory for (a, b) into one for (b, a)."""
+    def factory(gen):
+        a, b = pair(gen)
+        return b, a
+    return factory
+
+
+def _register_calc(op, types, scenario, pair):
+    func = getattr(calc, op)
+
+    def setup(gen):
+        return func, [pair(gen) for _ in range(COUNT)]
+    benchmark("calc.{}[{}:{}]".format(op, types, scenario))(setup)
+
+
+def point_point(gen):
+    return gen.point(), gen.point()
+
+
+def point_line(gen):
+    return gen.point(), gen.line()
+
+
+def point_plane(gen):
+    return gen.point(), gen.plane()
+
+
+def points_on_line(gen):
+    line = gen.line()
+    return Point(line.sv + gen.coordinate() * line.dv), line
+
+
+LINE_LINE = [
+    ("intersecting", lambda gen: gen.intersecting_lines()),
+    ("skew", lambda gen: gen.skew_lines()),
+    ("parallel", lambda gen: gen.parallel_lines()),
+    ("near-parallel", lambda gen: gen.near_parallel_lines()),
+    ("coincident", lambda gen: gen.coincident_lines()),
+]
+
+LINE_PLANE = [
+    ("general", lambda gen: gen.line_plane()),
+    ("parallel", lambda gen: gen.parallel_line_plane()),
+    ("near-parallel", lambda gen: gen.near_parallel_line_plane()),
+    ("contained", lambda gen: gen.contained_line_plane()),
+]
+
+PLANE_PLANE = [
+    ("general", lambda gen: gen.plane_pair()),
+    ("parallel", lambda gen: gen.parallel_planes()),
+    ("near-parallel", lambda gen: gen.near_parallel_planes()),
+]
+
+# Every calc function for every pair of types it supports. Scenarios
+# that an implementation can't handle are still listed; the runner
+# records the error instead of a timing.
+CALC_CASES = []
+for _op in ("intersection", "parallel", "angle", "orthogonal", "distance"):
+    CALC_CASES += [(_op, "Line/Line", s, f) for s, f in LINE_LINE]
+    CALC_CASES += [(_op, "Line/Plane", s, f) for s, f in LINE_PLANE]
+    CALC_CASES += [(_op, "Plane/Line", s, swapped(f)) for s, f in LINE_PLANE]
+    if _op != "distance":
+        CALC_CASES += [(_op, "Plane/Plane", s, f) for s, f in PLANE_PLANE]
+CALC_CASES += [
+    ("distance", "Point/Point", "random", point_point),
+    ("distance", "Point/Line", "random", point_line),
+    ("distance", "Point/Line", "on-line", points_on_line),
+    ("distance", "Line/Point", "random", swapped(point_line)),
+    ("distance", "Point/Plane", "random", point_plane),
+    ("distance", "Plane/Point", "random", swapped(point_plane)),
+]
+
+CALC_CASES += [("closest_points", "Line/Line", s, f) for s, f in LINE_LINE]
+
+for _case in CALC_CASES:
+    _register_calc(*_case)
+
+
+@benchmark("calc.closest_points_batch[{} pairs]".format(COUNT))
+def bench_closest_points_batch(gen):
+    pairs = [gen.skew_lines() for _ in range(COUNT)]
+    lines_a, lines_b = [a for a, _ in pairs], [b for _, b in pairs]
+    return calc.closest_points_batch, [(lines_a, lines_b)]
+
+
+def _register_solve(rows, scenario, make):
+    def setup(gen):
+        # solve() works in place, so every call gets a fresh copy
+        matrices = [make(gen) for _ in range(COUNT)]
+        return (lambda m: solve([list(row) for row in m]),
+                [(m,) for m in matrices])
+    benchmark("solver.solve[{}x{}:{}]".format(rows, rows + 1, scenario))(setup)
+
+
+def _random_system(rows):
+    return lambda gen: gen.matrix(rows, rows + 1)
+
+
+def _singular_system(rows):
+    def make(gen):
+        m = gen.matrix(rows, rows + 1)
+        m[-1] = [2 * x for x in m[0]]
+        return m
+    return make
+
+
+for _rows in (1, 2, 3, 5, 10):
+    _register_solve(_rows, "random", _random_system(_rows))
+for _rows in (2, 3):
+    _register_solve(_rows, "singular", _singular_system(_rows))
+
+
+def _register_solve_batch(rows, scenario, make):
+    def setup(gen):
+        matrices = [make(gen) for _ in range(COUNT)]
+        return (lambda ms: [s() for s in solve_batch(ms) if s.exact],
+                [(matrices,)])
+    benchmark("solver.solve_batch[{} {}x{}:{}]".format(
+        COUNT, rows, rows + 1, scenario))(setup)
+
+
+def _solve_loop(ms):
+    solutions = [solve([list(row) for row in m]) for m in ms]
+    return [s() for s in solutions if s.exact]
+
+
+@benchmark("solver.solve[{} 3x4:random, loop]".format(COUNT))
+def bench_solve_loop(gen):
+    return _solve_loop, [([gen.matrix(3, 4) for _ in range(COUNT)],)]
+
+
+for _rows in (2, 3):
+    _register_solve_batch(_rows, "random", _random_system(_rows))
+    _register_solve_batch(_rows, "singular", _singular_system(_rows))
+
+
+@benchmark("solver.Solution.__call__[3x4]")
+def bench_solution_call(gen):
+    solutions = [solve(gen.matrix(3, 4)) for _ in range(COUNT)]
+    return (lambda s: s(), [(s,) for s in solutions])
+
+
+@benchmark("Point(x, y, z)[int]")
+def bench_point_int(gen):
+    coords = [tuple(gen.random.randint(-100, 100) for _ in range(3))
+              for _ in range(COUNT)]
+    return Point, coords
+
+
+@benchmark("Point(x, y, z)[float]")
+def bench_point_float(gen):
+    return Point, [tuple(gen.point()) for _ in range(COUNT)]
+
+
+@benchmark("Point(Vector)")
+def bench_point_vector(gen):
+    return Point, [(gen.vector(),) for _ in range(COUNT)]
+
+
+@benchmark("Point.pv")
+def bench_point_pv(gen):
+    return Point.pv, [(gen.point(),) for _ in range(COUNT)]
+
+
+@benchmark("Vector(x, y, z)[float]")
+def bench_vector_float(gen):
+    return Vector, [tuple(gen.vector()) for _ in range(COUNT)]
+
+
+@benchmark("Vector(Point, Point)")
+def bench_vector_points(gen):
+    return Vector, [(gen.point(), gen.point()) for _ in range(COUNT)]
+
+
+@benchmark("Vector(list)")
+def bench_vector_list(gen):
+    return Vector, [(list(gen.vector()),) for _ in range(COUNT)]
+
+
+@benchmark("Line(Point, Vector)")
+def bench_line(gen):
+    return Line, [(gen.point(), gen.vector()) for _ in range(COUNT)]
+
+
+@benchmark("Plane(Point, Vector)")
+def bench_plane_pn(gen):
+    return Plane, [(gen.point(), gen.vector()) for _ in range(COUNT)]
+
+
+@benchmark("Plane(Point, Point, Point)")
+def bench_plane_3p(gen):
+    return Plane, [(gen.point(), gen.point(), gen.point())
+                   for _ in range(COUNT)]
+
+
+@benchmark("Plane(a, b, c, d)")
+def bench_plane_gf(gen):
+    return Plane, [tuple(gen.vector()) + (gen.coordinate(),)
+                   for _ in range(COUNT)]
+
+
+@benchmark("plane.planes_from_coefficients[{} planes]".format(COUNT))
+def bench_planes_from_coefficients(gen):
+    rows = [tuple(gen.vector()) + (gen.coordinate(),) for _ in range(COUNT)]
+    return planes_from_coefficients, [(rows,)]
+
+
+@benchmark("Plane.parametric")
+def bench_plane_parametric(gen):
+    return (lambda plane: plane.parametric()), [(gen.plane(),)
+                                                for _ in range(COUNT)]
+
+
+BOX = ((-10, -10, -10), (10, 10, 10))
+
+
+@benchmark("Line.clip")
+def bench_line_clip(gen):
+    gen.size = 15
+    return (lambda line: line.clip(BOX)), [(gen.line(),) for _ in range(COUNT)]
+
+
+@benchmark("line.clip_lines[{} lines]".format(COUNT))
+def bench_clip_lines(gen):
+    gen.size = 15
+    lines = [gen.line() for _ in range(COUNT)]
+    return (lambda lines: clip_lines(lines, BOX)), [(lines,)]
+
+
+@benchmark("Plane.clip")
+def bench_plane_clip(gen):
+    return (lambda plane: plane.clip(BOX)), [(gen.plane(),)
+                                             for _ in range(COUNT)]
+
+
+@benchmark("plane.clip_planes[{} planes]".format(COUNT))
+def bench_clip_planes(gen):
+    planes = [gen.plane() for _ in range(COUNT)]
+    return (lambda planes: clip_planes(planes, BOX)), [(planes,)]
+
+
+def ray_triangle_hit(gen):
+    triangle = gen.triangle()
+    a, b, c = triangle
+    # A point inside of the triangle
+    target = Point((a.x + b.x + c.x) / 3.0, (a.y + b.y + c.y) / 3.0,
+                   (a.z + b.z + c.z) / 3.0)
+    return gen.ray_at(target), triangle
+
+
+def ray_triangle_miss(gen):
+    return gen.ray(), gen.triangle()
+
+
+for _scenario, _pair in (("hit", ray_triangle_hit),
+                         ("random", ray_triangle_miss)):
+    _register_calc("intersection", "Ray/Triangle", _scenario, _pair)
+
+
+@benchmark("triangle.cast_rays[50 rays x 100 triangles]")
+def bench_cast_rays(gen):
+    rays = [gen.ray() for _ in range(50)]
+    triangles = [gen.triangle() for _ in range(100)]
+    return cast_rays, [(rays, triangles)]
+
+
+def coplanar_points(gen):
+    """Four points that lie in one plane, up to rounding."""
+    a, b, c = gen.point(), gen.point(), gen.point()
+    s, t = gen.random.random(), gen.random.random()
+    return a, b, c, Point(a.pv() + s * (b.pv() - a.pv()) +
+                          t * (c.pv() - a.pv()))
+
+
+def _register_orient3d(scenario, make):
+    def setup(gen):
+        return orient3d, [make(gen) for _ in range(COUNT)]
+    benchmark("predicates.orient3d[{}]".format(scenario))(setup)
+
+
+_register_orient3d("random", lambda gen: tuple(gen.point() for _ in range(4)))
+_register_orient3d("coplanar", coplanar_points)
+
+
+@benchmark("cache.intersection[Plane/Plane:hit]")
+def bench_cache_hit(gen):
+    cache = ResultCache(maxsize=COUNT)
+    pairs = [gen.plane_pair() for _ in range(COUNT)]
+
+    def cached(a, b):
+        return cache.call("intersection", calc.intersection, a, b)
+    for a, b in pairs:
+        cached(a, b)
+    return cached, pairs
+
+
+@benchmark("calc.distance[{} Points/Plane:broadcast]".format(COUNT))
+def bench_distance_broadcast(gen):
+    points = [gen.point() for _ in range(COUNT)]
+    return calc.distance, [(points, gen.plane())]
+
+
+@benchmark("calc.distance[{} Points/Plane:loop]".format(COUNT))
+def bench_distance_loop(gen):
+    points = [gen.point() for _ in range(COUNT)]
+
+    def loop(points, plane):
+        return [calc.distance(point, plane) for point in points]
+    return loop, [(points, gen.plane())]
+
+
+@benchmark("fit.PlaneFitter[{} points]".format(COUNT * 10))
+def bench_plane_fitter(gen):
+    points = [gen.point() for _ in range(COUNT * 10)]
+    return (lambda points: PlaneFitter(points).plane()), [(points,)]
+
+
+@benchmark("fit.LineFitter[{} points]".format(COUNT * 10))
+def bench_line_fitter(gen):
+    points = [gen.point() for _ in range(COUNT * 10)]
+    return (lambda points: LineFitter(points).line()), [(points,)]
+
+
+def three_planes(gen):
+    return gen.plane(), gen.plane(), gen.plane()
+
+
+@benchmark("calc.intersection[Plane/Plane/Plane]")
+def bench_three_planes(gen):
+    return calc.intersection, [three_planes(gen) for _ in range(COUNT)]
+
+
+@benchmark("hull.vertices[{} half-spaces]".format(COUNT))
+def bench_vertices(gen):
+    # Planes touching a sphere around the origin, facing outwards
+    halfspaces = []
+    for _ in range(COUNT):
+        n = gen.vector().normalized()
+        halfspaces.append(Plane(Point(n * 5), n))
+    return vertices, [(halfspaces,)]
+
+
+@benchmark("hull.convex_hull[10000 points]")
+def bench_convex_hull(gen):
+    points = [tuple(gen.point()) for _ in range(10000)]
+    return convex_hull, [(points,)]
+
+
+@benchmark("Hull.contains[10000 points]")
+def bench_hull_contains(gen):
+    points = [tuple(gen.point()) for _ in range(10000)]
+    return convex_hull(points).contains, [(points,)]
+
+
+@benchmark("region.side[10000 points]")
+def bench_side(gen):
+    points = [tuple(gen.point()) for _ in range(10000)]
+    return side, [(gen.plane(), points)]
+
+
+@benchmark("ConvexRegion.contains[10000 points]")
+def bench_region_contains(gen):
+    # The region is a box in the middle of the points
+    points = [tuple(gen.point()) for _ in range(10000)]
+    size = max(abs(c) for p in points for c in p) / 2
+    region = ConvexRegion([Plane(x, y, z, size) for x, y, z in
+                           [(1, 0, 0), (-1, 0, 0), (0, 1, 0),
+                            (0, -1, 0), (0, 0, 1), (0, 0, -1)]])
+    return region.contains, [(points,)]
+
+
+def _register_unify(scenario, make):
+    def setup(gen):
+        return unify_types, [(make(gen),) for _ in range(COUNT)]
+    benchmark("util.unify_types[{}]".format(scenario))(setup)
+
+
+_register_unify("int", lambda gen: [gen.random.randint(-9, 9)
+                                    for _ in range(3)])
+_register_unify("float", lambda gen: list(gen.point()))
+_register_unify("mixed", lambda gen: [1, gen.coordinate(), 3])
+_register_unify("fraction", lambda gen: [
+    Fraction(gen.random.randint(-9, 9), gen.random.randint(1, 9)),
+    gen.random.randint(-9, 9),
+    gen.coordinate(),
+])
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""Seeded random scene generators for the benchmarks.
+
+Every generator draws from its own random.Random, so the same seed
+always produces the same bodies, no matter which benchmarks run before.
+"""
+import random
+
+from sgl.line import Line
+from sgl.plane import Plane
+from sgl.point import Point
+from sgl.ray import Ray
+from sgl.triangle import Triangle
+from sgl.vector import Vector
+
+
+class SceneGenerator(object):
+    """Creates random bodies inside a cube of the given size."""
+    def __init__(self, seed=0, size=10.0):
+        self.random = random.Random(seed)
+        self.size = size
+
+    def coordinate(self):
+        return self.random.uniform(-self.size, self.size)
+
+    def point(self):
+        return Point(self.coordinate(), self.coordinate(), self.coordinate())
+
+    def vector(self):
+        """A random vector that is far enough from the zero vector to
+        be used as a direction or normal.
+        """
+        while True:
+            v = Vector(self.random.gauss(0, 1), self.random.gauss(0, 1),
+                       self.random.gauss(0, 1))
+            if abs(v) > 1e-3:
+                return v
+
+    def perpendicular(self, v):
+        """A random vector orthogonal to v."""
+        while True:
+            w = v.cross(self.vector())
+            if abs(w) > 1e-3:
+                return w
+
+    def line(self):
+        return Line(self.point(), self.vector())
+
+    def plane(self):
+        return Plane(self.point(), self.vector())
+
+    def ray(self):
+        return Ray(self.point(), self.vector())
+
+    def triangle(self):
+        while True:
+            try:
+                return Triangle(self.point(), self.point(), self.point())
+            except ValueError:
+                # Collinear corners, very unlikely
+                pass
+
+    def ray_at(self, target):
+        """A random ray that goes through the point target."""
+        origin = self.point()
+        return Ray(origin, target.pv() - origin.pv())
+
+    def near_parallel(self, v, eps=1e-6):
+        """A vector that encloses an angle of about eps with v."""
+        return v + eps * abs(v) * self.perpendicular(v).normalized()
+
+    # Pairs of bodies in special configurations
+
+    def intersecting_lines(self):
+        p = self.point()
+        return (Line(p.moved(self.vector()), p.pv() - self.point().pv()),
+                Line(p, self.vector()))
+
+    def skew_lines(self):
+        return self.line(), self.line()
+
+    def parallel_lines(self):
+        a = self.line()
+        return a, Line(self.point(), -2.5 * a.dv)
+
+    def near_parallel_lines(self, eps=1e-6):
+        a = self.line()
+        return a, Line(self.point(), self.near_parallel(a.dv, eps))
+
+    def coincident_lines(self):
+        a = self.line()
+        return a, Line(a.sv + 3 * a.dv, -a.dv)
+
+    def line_plane(self):
+        return self.line(), self.plane()
+
+    def parallel_line_plane(self):
+        plane = self.plane()
+        return Line(self.point(), self.perpendicular(plane.n)), plane
+
+    def near_parallel_line_plane(self, eps=1e-6):
+        plane = self.plane()
+        dv = self.near_parallel(self.perpendicular(plane.n), eps)
+        return Line(self.point(), dv), plane
+
+    def contained_line_plane(self):
+        plane = self.plane()
+        direction = self.perpendicular(plane.n)
+        return Line(plane.p, direction), plane
+
+    def plane_pair(self):
+        return self.plane(), self.plane()
+
+    def parallel_planes(self):
+        a = self.plane()
+        return a, Plane(self.point(), -3 * a.n)
+
+    def near_parallel_planes(self, eps=1e-6):
+        a = self.plane()
+        return a, Plane(self.point(), self.near_parallel(a.n, eps))
+
+    def matrix(self, rows, columns):
+        """A random rows x columns matrix of floats."""
+        return [[self.coordinate() for _ in range(columns)]
+                for _ in range(rows)]
+
+    def many(self, factory, count):
+        return [factory() for _ in range(count)]
+
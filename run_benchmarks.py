@@ -0,0 +1,118 @@
+#!/usr/bin/python
+"""Run the sgl benchmarks.
+
+    python run_benchmarks.py                      # print the results
+    python run_benchmarks.py -o results.json      # ...and save them
+    python run_benchmarks.py -c baseline.json     # compare with a baseline
+
+In compare mode, a benchmark counts as a regression if it got slower by
+more than the threshold (10% by default) and the script exits with
+status 1 if there are any.
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+
+from bench.benchmarks import BENCHMARKS
+from bench.scenes import SceneGenerator
+
+
+def measure(func, inputs, repeat):
+    """Return the best time per call in microseconds."""
+    def loop():
+        for args in inputs:
+            func(*args)
+    timer = timeit.Timer(loop)
+    # Make every sample take at least ~20ms so the timer resolution
+    # doesn't matter
+    number = 1
+    while timer.timeit(number) < 0.02 and number < 1000:
+        number *= 2
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number / len(inputs) * 1e6
+
+
+def run(selected, seed, repeat):
+    results = {}
+    for name, setup in selected:
+        func, inputs = setup(SceneGenerator(seed))
+        try:
+            usec = measure(func, inputs, repeat)
+        except Exception as exc:
+            results[name] = {"error": "{}: {}".format(type(exc).__name__,
+                                                      exc)}
+            print("{:<50} {}".format(name, results[name]["error"]))
+            continue
+        results[name] = {"usec": usec, "calls": len(inputs)}
+        print("{:<50} {:>10.2f} us".format(name, usec))
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print the relative change for each benchmark and return the list
+    of regressions.
+    """
+    regressions = []
+    print()
+    print("{:<50} {:>10} {:>10} {:>8}".format(
+        "benchmark", "baseline", "current", "change"))
+    for name in sorted(results):
+        new = results[name].get("usec")
+        old = baseline.get(name, {}).get("usec")
+        if new is None or old is None:
+            status = "error" if new is None else "new"
+            print("{:<50} {:>10} {:>10} {:>8}".format(
+                name, "-" if old is None else "{:.2f}".format(old),
+                "-" if new is None else "{:.2f}".format(new), status))
+            continue
+        change = (new - old) / old
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print("{:<50} {:>10.2f} {:>10.2f} {:>+7.1f}%{}".format(
+            name, old, new, change * 100, flag))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", help="write the results as JSON")
+    parser.add_argument("-c", "--compare", metavar="BASELINE",
+                        help="compare against a JSON file written by -o")
+    parser.add_argument("-t", "--threshold", type=float, default=0.10,
+                        help="relative slowdown that counts as regression")
+    parser.add_argument("-k", "--filter", default="",
+                        help="only run benchmarks containing this string")
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    selected = [(name, setup) for name, setup in BENCHMARKS
+                if args.filter in name]
+    results = run(selected, args.seed, args.repeat)
+
+    if args.output:
+        with open(args.output, "w") as fd:
+            json.dump({
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "seed": args.seed,
+                "results": results,
+            }, fd, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as fd:
+            baseline = json.load(fd)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\n{} regression(s)".format(len(regressions)))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -39,4 +39,10 @@ setup(
         keywords="analytic geometry",
 
         install_requires=[],
+
+        entry_points={
+            "console_scripts": [
+                "sgl = sgl.cli:main",
+            ],
+        },
 )
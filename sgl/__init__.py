@@ -1,21 +1,82 @@
-from .calc import distance, intersection, parallel, angle, orthogonal
+import importlib
+import sys
+
+# Public name -> submodule that defines it. The submodules are only
+# imported when one of their names is first used (PEP 562), so that
+# "import sgl" stays cheap for processes that only need a part of it.
+_exports = {
+    "ConvexRegion": "region",
+    "Hull": "hull",
+    "Line": "line",
+    "LineFitter": "fit",
+    "MutableVector": "vector",
+    "Plane": "plane",
+    "PlaneFitter": "fit",
+    "Point": "point",
+    "Ray": "ray",
+    "Segment": "segment",
+    "Transform": "transform",
+    "Triangle": "triangle",
+    "Vector": "vector",
+    "angle": "calc",
+    "axpy": "vector",
+    "caching": "cache",
+    "cast_rays": "triangle",
+    "chebyshev_center": "hull",
+    "clip_lines": "line",
+    "clip_planes": "plane",
+    "closest_points": "calc",
+    "closest_points_batch": "calc",
+    "convex_hull": "hull",
+    "coplanar": "predicates",
+    "cross_dot": "vector",
+    "distance": "calc",
+    "dot": "vector",
+    "draw": "draw",
+    "intersection": "calc",
+    "lerp": "vector",
+    "lines_intersect": "predicates",
+    "norm2": "vector",
+    "orient3d": "predicates",
+    "orthogonal": "calc",
+    "parallel": "calc",
+    "plane_side": "predicates",
+    "planes_from_coefficients": "plane",
+    "profiling": "stats",
+    "side": "region",
+    "solve": "solver",
+    "solve_batch": "solver",
+    "vertices": "hull",
+}
+
+__all__ = tuple(sorted(_exports))
+
+
+def __getattr__(name):
+    try:
+        module = _exports[name]
+    except KeyError:
+        raise AttributeError("module {!r} has no attribute {!r}"
+                             .format(__name__, name))
+    value = getattr(importlib.import_module("." + module, __name__), name)
+    # Cache it, so __getattr__ is only hit once per name
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
+
+
+# The function draw() has the name of its module, and importing the
+# module sgl.draw (e.g. in Point.draw()) sets that attribute of the
+# package to the module, so the function can't be loaded lazily.
+# Imported here, the module is only loaded once and the name stays
+# bound to the function.
 from .draw import draw
-from .line import Line
-from .plane import Plane
-from .point import Point
-from .solver import solve
-from .vector import Vector
-
-__all__ = (
-    "Line",
-    "Plane",
-    "Point",
-    "Vector",
-    "angle",
-    "distance",
-    "draw",
-    "intersection",
-    "orthogonal",
-    "parallel",
-    "solve",
-)
+
+if sys.version_info < (3, 7):
+    # No module level __getattr__, import everything eagerly
+    for _name in __all__:
+        __getattr__(_name)
+    del _name
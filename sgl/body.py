@@ -6,23 +6,28 @@ class GeoBody(object):
     L1.intersection(L2)
     instead of
     intersection(L1, L2)
+
+    sgl.calc needs the concrete bodies, which derive from this class, so
+    it can't be imported here. Instead, sgl.calc replaces the methods
+    below with its own functions as soon as it is loaded; they only run
+    if nothing has imported sgl.calc yet.
     """
     def intersection(self, other):
-        from .calc import intersection
-        return intersection(self, other)
+        from . import calc
+        return calc.intersection(self, other)
 
     def distance(self, other):
-        from .calc import distance
-        return distance(self, other)
+        from . import calc
+        return calc.distance(self, other)
 
     def parallel(self, other):
-        from .calc import parallel
-        return parallel(self, other)
+        from . import calc
+        return calc.parallel(self, other)
 
     def angle(self, other):
-        from .calc import angle
-        return angle(self, other)
+        from . import calc
+        return calc.angle(self, other)
 
     def orthogonal(self, other):
-        from .calc import orthogonal
-        return orthogonal(self, other)
+        from . import calc
+        return calc.orthogonal(self, other)
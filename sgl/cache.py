@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""Opt-in memoization of the calc functions.
+
+    >>> from sgl import caching
+    >>> with caching(maxsize=1000) as cache:
+    ...     for frame in frames:
+    ...         render(frame)   # asks for the same intersections again
+    >>> cache.hits, cache.misses
+
+The results are keyed on the values of the operands at the time of the
+call, not on the objects, so changing a Point after it was used can't
+return a stale result. Results are copied on the way into and out of
+the cache, so changing a returned Point doesn't change the cached one
+either. For batches (lists of bodies), every element is cached on its
+own. Operands that aren't sgl bodies (and calls with more than two
+arguments) are not cached. The operations that calc runs internally
+(e.g. distance(Line, Plane) calls distance(Point, Plane)) go through
+the cache as well.
+
+Like sgl.stats.profiling(), the functions are only replaced inside the
+with block (using sgl.util.rebind), and not for references that your
+own code took before the block started.
+"""
+import contextlib
+import numbers
+from collections import OrderedDict
+
+from . import calc
+from .line import Line
+from .plane import Plane
+from .point import Point
+from .ray import Ray
+from .segment import Segment
+from .stats import OPERATIONS
+from .triangle import Triangle
+from .util import rebind
+from .vector import Vector
+
+# class -> function returning the values that identify a body
+_KEYS = {
+    Point: lambda p: (p.x, p.y, p.z),
+    Vector: lambda v: tuple(v._v),
+    Line: lambda l: tuple(l.sv._v) + tuple(l.dv._v),
+    Ray: lambda r: tuple(r.sv._v) + tuple(r.dv._v),
+    Segment: lambda s: tuple(s.sv._v) + tuple(s.dv._v),
+    Plane: lambda p: (p.p[0], p.p[1], p.p[2]) + tuple(p.n._v),
+    Triangle: lambda t: (t.a.x, t.a.y, t.a.z, t.b.x, t.b.y, t.b.z,
+                         t.c.x, t.c.y, t.c.z),
+}
+
+# Results of these types are returned as they are. The set is the fast
+# path for the common ones, the ABC check is slow.
+_SCALARS = set((int, float, bool, type(None), type(NotImplemented)))
+_IMMUTABLE = numbers.Number
+
+# The ResultCache that is currently in use, if any
+_active = None
+
+
+def body_key(body):
+    """Return a hashable snapshot of the value of the body, or None if
+    it is no body that can be cached.
+    """
+    try:
+        key = _KEYS[type(body)]
+    except KeyError:
+        return None
+    values = key(body)
+    # 1 == 1.0 == Fraction(1), but they don't give the same results
+    return (type(body), values, tuple(type(value) for value in values))
+
+
+def _copy(value):
+    """A deep copy of a result, but a lot cheaper than copy.deepcopy()
+    for the few kinds of results that calc has.
+    """
+    if type(value) in _SCALARS or isinstance(value, _IMMUTABLE):
+        return value
+    elif isinstance(value, tuple):
+        items = [_copy(item) for item in value]
+        # namedtuples like ClosestPoints take the items one by one
+        return type(value)(*items) if hasattr(value, "_fields") else \
+            tuple(items)
+    elif isinstance(value, list):
+        return [_copy(item) for item in value]
+    # A body, copy its attributes (coordinates, vectors, points)
+    new = object.__new__(type(value))
+    new.__dict__.update((name, _copy(attr))
+                        for name, attr in vars(value).items())
+    return new
+
+
+class ResultCache(object):
+    """A bounded mapping of (operation, operand values) to results,
+    which evicts the least recently used entry when it is full.
+    """
+    def __init__(self, maxsize=1024):
+        if maxsize < 1:
+            raise ValueError("maxsize has to be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        """Remove all entries, the statistics are kept."""
+        self._data.clear()
+
+    def hit_rate(self):
+        """The fraction of the lookups that were hits."""
+        total = self.hits + self.misses
+        return self.hits / float(total) if total else 0.0
+
+    def as_dict(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+    def call(self, name, func, a, b):
+        """Return func(a, b), from the cache if possible."""
+        key_a, key_b = body_key(a), body_key(b)
+        if key_a is None or key_b is None:
+            return func(a, b)
+        key = (name, key_a, key_b)
+        data = self._data
+        try:
+            # Move it to the end, to the most recently used entries
+            result = data.pop(key)
+        except KeyError:
+            self.misses += 1
+            result = func(a, b)
+            if len(data) >= self.maxsize:
+                data.popitem(last=False)
+                self.evictions += 1
+            data[key] = _copy(result)
+            return result
+        self.hits += 1
+        data[key] = result
+        return _copy(result)
+
+
+def _wrap_operation(name, func):
+    def call(a, b):
+        return _active.call(name, func, a, b)
+
+    def wrapper(a, b, *args):
+        if args:
+            return func(a, b, *args)
+        elif isinstance(a, calc.BATCH_TYPES) or \
+                isinstance(b, calc.BATCH_TYPES):
+            return calc.broadcast(call, a, b)
+        return call(a, b)
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+@contextlib.contextmanager
+def caching(maxsize=1024, cache=None):
+    """Cache the results of the calc functions inside the with block.
+    Yields the ResultCache, whose hits, misses and evictions can be
+    checked afterwards. Pass an existing ResultCache as cache to keep
+    its entries across blocks.
+
+    On Python 3 this can also be used as a decorator:
+
+        @caching(maxsize=100)
+        def update(scene):
+            ...
+    """
+    global _active
+    if _active is not None:
+        raise RuntimeError("caching() is already active")
+    if cache is None:
+        cache = ResultCache(maxsize)
+    pairs = [(getattr(calc, name), _wrap_operation(name, getattr(calc, name)))
+             for name in OPERATIONS]
+    _active = cache
+    for original, wrapper in pairs:
+        rebind(original, wrapper)
+    try:
+        yield cache
+    finally:
+        for original, wrapper in reversed(pairs):
+            rebind(wrapper, original)
+        _active = None
+
+
+__all__ = ("caching", "ResultCache")
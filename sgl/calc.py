@@ -1,10 +1,233 @@
 # -*- coding: utf-8 -*-
+"""The functions that work on two bodies.
+
+Each function looks up a kernel for the types of its operands in a
+table, so the type checks are done by one dictionary lookup. Either
+operand can also be a list or tuple of bodies (nested for more
+dimensions), which is broadcast against the other operand like NumPy
+does it:
+
+    >>> distance(Point(0, 0, 0), [Point(1, 0, 0), Point(0, 2, 0)])
+    [1.0, 2.0]
+    >>> distance([[a], [b]], [c, d, e])    # 2x1 and 3 -> 2x3
+    [[distance(a, c), distance(a, d), distance(a, e)],
+     [distance(b, c), distance(b, d), distance(b, e)]]
+
+The result is a (nested) list then. The kernel is only looked up once
+per combination of types, not once per element.
+"""
+import itertools
 import math
+from collections import namedtuple
+from .body import GeoBody
 from .line import Line
 from .plane import Plane
 from .point import Point
+from .ray import Ray
+from .segment import Segment
 from .solver import solve, null
-from .vector import Vector
+from .triangle import Triangle, hit_parameters, prepare
+from .vector import Vector, axpy, cross_dot, dot, norm2
+
+#: operation -> {(type of a, type of b): kernel(a, b)}
+KERNELS = {
+    "intersection": {},
+    "parallel": {},
+    "angle": {},
+    "orthogonal": {},
+    "distance": {},
+    "closest_points": {},
+}
+
+#: operation -> {(type of the items, type of the single operand):
+#: kernel(items, single)} for a flat batch against a single body
+BATCH_KERNELS = dict((op, {}) for op in KERNELS)
+
+# The types whose instances are treated as batches of operands
+BATCH_TYPES = (list, tuple)
+
+
+def kernel(op, types_a, types_b, symmetric=True):
+    """Register the decorated function as the kernel of op for
+    operands of types_a and types_b (a type or a tuple of types).
+    Unless symmetric is False, it is registered for the swapped
+    operands as well.
+    """
+    if not isinstance(types_a, tuple):
+        types_a = (types_a,)
+    if not isinstance(types_b, tuple):
+        types_b = (types_b,)
+
+    def decorator(func):
+        table = KERNELS[op]
+        for type_a in types_a:
+            for type_b in types_b:
+                table[type_a, type_b] = func
+                if symmetric and (type_b, type_a) not in table:
+                    table[type_b, type_a] = _swapped(func)
+        return func
+    return decorator
+
+
+def batch_kernel(op, type_items, type_single):
+    """Register the decorated function as the kernel of op for a flat
+    batch of type_items against a single type_single, on either side.
+    It gets (items, single) and returns the list of results. The
+    results have to be the same as from the kernel for single bodies,
+    it's only faster because it does the work for the single body once.
+    """
+    def decorator(func):
+        BATCH_KERNELS[op][type_items, type_single] = func
+        return func
+    return decorator
+
+
+def _swapped(func):
+    def swapped(a, b):
+        return func(b, a)
+    swapped.__name__ = func.__name__
+    swapped.__doc__ = func.__doc__
+    return swapped
+
+
+def _resolve(table, type_a, type_b):
+    """Find the kernel for subclasses of the registered types, and
+    remember it. Returns None if there is none.
+    """
+    for base_a in type_a.__mro__:
+        for base_b in type_b.__mro__:
+            func = table.get((base_a, base_b))
+            if func is not None:
+                table[type_a, type_b] = func
+                return func
+    return None
+
+
+def _dispatch(op, a, b):
+    table = KERNELS[op]
+    func = table.get((type(a), type(b)))
+    if func is not None:
+        return func(a, b)
+    if isinstance(a, BATCH_TYPES) or isinstance(b, BATCH_TYPES):
+        return _broadcast(op, a, b)
+    func = _resolve(table, type(a), type(b))
+    if func is None:
+        return NotImplemented
+    return func(a, b)
+
+
+def _shape(x):
+    """The shape of nested lists, judged by the first elements."""
+    shape = []
+    while isinstance(x, BATCH_TYPES):
+        shape.append(len(x))
+        if not x:
+            break
+        x = x[0]
+    return tuple(shape)
+
+
+def broadcast_shapes(shape_a, shape_b):
+    """Return the shape of the result of an operation between batches
+    of the given shapes, following NumPy's rules: the shapes are
+    aligned at their last dimension, and two dimensions fit if they are
+    equal or one of them is 1.
+    """
+    n = max(len(shape_a), len(shape_b))
+    shape_a = (1,) * (n - len(shape_a)) + tuple(shape_a)
+    shape_b = (1,) * (n - len(shape_b)) + tuple(shape_b)
+    shape = []
+    for x, y in zip(shape_a, shape_b):
+        if x == y or y == 1:
+            shape.append(x)
+        elif x == 1:
+            shape.append(y)
+        else:
+            raise ValueError("Can't broadcast batches of shapes {} and {}"
+                             .format(shape_a, shape_b))
+    return tuple(shape)
+
+
+def broadcast(func, a, b):
+    """Return func(x, y) for the elements x of a and y of b, broadcast
+    against each other, as a (nested) list. Operands that aren't lists
+    or tuples are single elements.
+    """
+    shape_a, shape_b = _shape(a), _shape(b)
+    shape = broadcast_shapes(shape_a, shape_b)
+    return _map(func, a, len(shape_a), b, len(shape_b), shape)
+
+
+def _batch_kernel(op, a, b):
+    """The batch kernel for a flat batch a and a single body b, if
+    there is one.
+    """
+    batch_table = BATCH_KERNELS[op]
+    if not batch_table or isinstance(b, BATCH_TYPES) or not a:
+        return None
+    type_items = type(a[0])
+    func = batch_table.get((type_items, type(b)))
+    if func is None or isinstance(a[0], BATCH_TYPES):
+        return None
+    for item in a:
+        if type(item) is not type_items:
+            return None
+    return func
+
+
+def _broadcast(op, a, b):
+    # A flat batch against a single body can have its own kernel
+    if isinstance(a, BATCH_TYPES):
+        func = _batch_kernel(op, a, b)
+        if func is not None:
+            return func(a, b)
+    else:
+        func = _batch_kernel(op, b, a)
+        if func is not None:
+            return func(b, a)
+    # The kernels are looked up once per combination of types
+    table = KERNELS[op]
+    kernels = {}
+
+    def call(x, y):
+        key = (type(x), type(y))
+        try:
+            func = kernels[key]
+        except KeyError:
+            func = kernels[key] = (table.get(key) or
+                                   _resolve(table, type(x), type(y)))
+        if func is None:
+            return NotImplemented
+        return func(x, y)
+    return broadcast(call, a, b)
+
+
+def _stretch(x, dims, n, rest):
+    """The n items of x for one dimension of the result, and the
+    dimensions of x that are left. x has dims dimensions, rest is the
+    number of result dimensions after this one.
+    """
+    if dims <= rest:
+        # x doesn't have this dimension, it's the same for all items
+        return itertools.repeat(x, n), dims
+    if len(x) == n:
+        return x, dims - 1
+    elif len(x) == 1:
+        return itertools.repeat(x[0], n), dims - 1
+    raise ValueError("Can't broadcast a batch of {} items to {}"
+                     .format(len(x), n))
+
+
+def _map(call, a, dims_a, b, dims_b, shape):
+    if not shape:
+        return call(a, b)
+    n, rest = shape[0], shape[1:]
+    items_a, dims_a = _stretch(a, dims_a, n, len(rest))
+    items_b, dims_b = _stretch(b, dims_b, n, len(rest))
+    if not rest:
+        return [call(x, y) for x, y in zip(items_a, items_b)]
+    return [_map(call, x, dims_a, y, dims_b, rest)
+            for x, y in zip(items_a, items_b)]
 
 
 def acute(rad):
@@ -13,75 +236,159 @@ def acute(rad):
         rad = math.pi - rad
     return rad
 
-      
-def intersection(a, b):
+
+def on_body(a, t):
+    """Checks if the parameter t of a Line, Ray or Segment belongs to
+    the body (s + t*u is a point of it).
+    """
+    if isinstance(a, Ray):
+        return t >= 0
+    elif isinstance(a, Segment):
+        return 0 <= t <= 1
+    return True
+
+
+def intersection(a, b, c=None):
     """Return the intersection between two objects. This can either be
     - None (no intersection)
-    - a Point (Line/Line or Plane/Line intersection)
+    - a Point (Line/Line, Plane/Line, Plane/Ray, Plane/Segment and
+      Triangle/Line, Triangle/Ray or Triangle/Segment intersection)
     - a Line (Plane/Plane intersection)
+    - the Ray or Segment itself, if it lies in the Plane
+
+    A Line, Ray or Segment that lies in the plane of a Triangle is
+    treated as not intersecting it.
+
+    intersection(a, b, c) intersects three Planes, which gives a Point,
+    or for special cases None, a Line or the Plane itself.
     """
-    if isinstance(a, Line) and isinstance(b, Line):
-        # For the line-line intersection, we have to solve
-        # s1 + λ u1 = t1 + μ v1
-        # s2 + λ u2 = t2 + μ v2
-        # s3 + λ u3 = t3 + μ v3
-        # rearrange a bit, and you get
-        solution = solve([
-            [a.dv[0], -b.dv[0], b.sv[0] - a.sv[0]],
-            [a.dv[1], -b.dv[1], b.sv[1] - a.sv[1]],
-            [a.dv[2], -b.dv[2], b.sv[2] - a.sv[2]],
-        ])
-        # No intersection
-        if not solution:
-            return None
-        # We get λ and μ, we need to pick one and plug it into the
-        # right equation
-        lmb, mu = solution()
-        lmb = float(lmb)
-        # could've chosen b.sv + mu * b.dv instead, it doesn't matter
-        # as they will point (pun intended) to the same point.
-        return Point(a.sv + lmb * a.dv)
-
-    elif isinstance(a, Line) and isinstance(b, Plane):
-        # the line can be contained in the plane, in this case the whole
-        # line is the intersection
-        if a in b:
-            return a
-        # if they are parallel, there is no intersection
-        elif parallel(a, b):
-            return None
-        # Given the plane in general form, if we insert the line
-        # coordinate by coordinate we get
-        # a (s1 + μ u1) + b (s2 + μ u2) + c (s3 + μ u3) = d
-        # where s is the support vector of the line
-        #       u is the direction vector of the line
-        #       μ is the parameter
-        # rearrange and solve for the parameter:
-        mu = (b.n * b.p.pv() - b.n * a.sv) / (b.n * a.dv)
-        mu = float(mu)
-        return Point(a.sv + mu * a.dv)
-    elif isinstance(a, Plane) and isinstance(b, Line):
-        return intersection(b, a)
-
-    elif isinstance(a, Plane) and isinstance(b, Plane):
-        # if you solve
-        # a x1 + b x2 + c x3 = d
-        # e x1 + f x2 + g x3 = h
-        # you will get infinitely many solutions (if the planes are
-        # intersecting). All those solutions are points on the 
-        # intersection line. So we just chose two solutions, i.e.
-        # two points, and lay a line through both of these.
-        solution = solve([
-            list(a.n) + [a.n * a.p.pv()],
-            list(b.n) + [b.n * b.p.pv()],
-        ])
-        if not solution:
-            return None
-        # Choose two arbitrary points/solutions
-        p1, p2 = Point(solution(1)), Point(solution(2))
-        return Line(p1.pv(), p2.pv() - p1.pv())
+    if c is not None:
+        if not (isinstance(a, Plane) and isinstance(b, Plane) and
+                isinstance(c, Plane)):
+            return NotImplemented
+        return _intersection_three_planes(a, b, c)
+    return _dispatch("intersection", a, b)
+
+
+@kernel("intersection", Line, Line)
+def _intersection_line_line(a, b):
+    # For the line-line intersection, we have to solve
+    # s1 + λ u1 = t1 + μ v1
+    # s2 + λ u2 = t2 + μ v2
+    # s3 + λ u3 = t3 + μ v3
+    # rearrange a bit, and you get
+    solution = solve([
+        [a.dv[0], -b.dv[0], b.sv[0] - a.sv[0]],
+        [a.dv[1], -b.dv[1], b.sv[1] - a.sv[1]],
+        [a.dv[2], -b.dv[2], b.sv[2] - a.sv[2]],
+    ])
+    # No intersection
+    if not solution:
+        return None
+    # We get λ and μ, we need to pick one and plug it into the
+    # right equation
+    lmb, mu = solution()
+    lmb = float(lmb)
+    # could've chosen b.sv + mu * b.dv instead, it doesn't matter
+    # as they will point (pun intended) to the same point.
+    return Point(axpy(a.sv, lmb, a.dv))
+
 
-    return NotImplemented
+@kernel("intersection", Line, Plane)
+def _intersection_line_plane(a, b):
+    # the line can be contained in the plane, in this case the whole
+    # line is the intersection
+    if a in b:
+        return a
+    # if they are parallel, there is no intersection
+    elif parallel(a, b):
+        return None
+    # Given the plane in general form, if we insert the line
+    # coordinate by coordinate we get
+    # a (s1 + μ u1) + b (s2 + μ u2) + c (s3 + μ u3) = d
+    # where s is the support vector of the line
+    #       u is the direction vector of the line
+    #       μ is the parameter
+    # rearrange and solve for the parameter:
+    mu = (dot(b.n, b.p) - dot(b.n, a.sv)) / dot(b.n, a.dv)
+    mu = float(mu)
+    return Point(axpy(a.sv, mu, a.dv))
+
+
+@kernel("intersection", (Ray, Segment), Plane)
+def _intersection_ray_plane(a, b):
+    # The same as for a Line, but the parameter has to be in the
+    # range of the ray or segment
+    if a.line() in b:
+        return a
+    elif a.dv.orthogonal(b.n):
+        return None
+    mu = (dot(b.n, b.p) - dot(b.n, a.sv)) / dot(b.n, a.dv)
+    if not on_body(a, mu):
+        return None
+    return Point(axpy(a.sv, float(mu), a.dv))
+
+
+@kernel("intersection", (Line, Ray, Segment), Triangle)
+def _intersection_line_triangle(a, b):
+    # Möller–Trumbore: we solve
+    # s + t u = A + v (B - A) + w (C - A)
+    # for the parameter t and the barycentric coordinates v, w with
+    # Cramer's rule, and give up as soon as v or w is out of range.
+    hit = hit_parameters(a.sv, a.dv, prepare(b))
+    if hit is None or not on_body(a, hit[0]):
+        return None
+    return Point(axpy(a.sv, float(hit[0]), a.dv))
+
+
+@kernel("intersection", Plane, Plane)
+def _intersection_plane_plane(a, b):
+    # if you solve
+    # a x1 + b x2 + c x3 = d
+    # e x1 + f x2 + g x3 = h
+    # you will get infinitely many solutions (if the planes are
+    # intersecting). All those solutions are points on the
+    # intersection line. So we just chose two solutions, i.e.
+    # two points, and lay a line through both of these.
+    solution = solve([
+        list(a.n) + [dot(a.n, a.p)],
+        list(b.n) + [dot(b.n, b.p)],
+    ])
+    if not solution:
+        return None
+    # Choose two arbitrary points/solutions
+    p1, p2 = Point(solution(1)), Point(solution(2))
+    return Line(p1.pv(), p2.pv() - p1.pv())
+
+
+def _intersection_three_planes(a, b, c):
+    # With the general forms n1 x = d1, n2 x = d2 and n3 x = d3,
+    # Cramer's rule boils down to
+    #      d1 (n2 × n3) + d2 (n3 × n1) + d3 (n1 × n2)
+    # x = --------------------------------------------
+    #                   n1 * (n2 × n3)
+    n1, n2, n3 = a.n._v, b.n._v, c.n._v
+    c23 = (n2[1] * n3[2] - n2[2] * n3[1], n2[2] * n3[0] - n2[0] * n3[2],
+           n2[0] * n3[1] - n2[1] * n3[0])
+    det = dot(n1, c23)
+    # det / (|n1| |n2| |n3|) is the volume spanned by the unit normals
+    if not null(det * det / (norm2(n1) * norm2(n2) * norm2(n3))):
+        c31 = (n3[1] * n1[2] - n3[2] * n1[1], n3[2] * n1[0] - n3[0] * n1[2],
+               n3[0] * n1[1] - n3[1] * n1[0])
+        c12 = (n1[1] * n2[2] - n1[2] * n2[1], n1[2] * n2[0] - n1[0] * n2[2],
+               n1[0] * n2[1] - n1[1] * n2[0])
+        d1, d2, d3 = dot(n1, a.p), dot(n2, b.p), dot(n3, c.p)
+        return Point((d1 * c23[0] + d2 * c31[0] + d3 * c12[0]) / det,
+                     (d1 * c23[1] + d2 * c31[1] + d3 * c12[1]) / det,
+                     (d1 * c23[2] + d2 * c31[2] + d3 * c12[2]) / det)
+    # The normals are in one plane, so the intersection is a line or
+    # nothing, unless all planes are the same
+    for x, y, z in ((a, b, c), (a, c, b), (b, c, a)):
+        if not parallel(x, y):
+            return intersection(intersection(x, y), z)
+    if a == b and a == c:
+        return a
+    return None
 
 
 def parallel(a, b):
@@ -90,18 +397,22 @@ def parallel(a, b):
     - Plane/Line
     - Plane/Plane
     """
-    if isinstance(a, Line) and isinstance(b, Line):
-        return a.dv.parallel(b.dv)
+    return _dispatch("parallel", a, b)
+
+
+@kernel("parallel", Line, Line)
+def _parallel_line_line(a, b):
+    return a.dv.parallel(b.dv)
 
-    elif isinstance(a, Line) and isinstance(b, Plane):
-        return a.dv.orthogonal(b.n)
-    elif isinstance(a, Plane) and isinstance(b, Line):
-        return parallel(b, a)
-    
-    elif isinstance(a, Plane) and isinstance(b, Plane):
-        return a.n.parallel(b.n)
 
-    return NotImplemented
+@kernel("parallel", Line, Plane)
+def _parallel_line_plane(a, b):
+    return a.dv.orthogonal(b.n)
+
+
+@kernel("parallel", Plane, Plane)
+def _parallel_plane_plane(a, b):
+    return a.n.parallel(b.n)
 
 
 def angle(a, b):
@@ -110,23 +421,27 @@ def angle(a, b):
     - Plane/Line
     - Plane/Plane
     """
-    if isinstance(a, Line) and isinstance(b, Line):
-        return acute(a.dv.angle(b.dv))
+    return _dispatch("angle", a, b)
+
 
-    elif isinstance(a, Line) and isinstance(b, Plane):
-        rad = acute(a.dv.angle(b.n))
-        # What we are actually calculating is the angle between
-        # the normal of the plane and the line, but the normal
-        # is 90° from the plane. So the actual angle between a plane
-        # a line is 90° - that angle
-        return 0.5 * math.pi - rad
-    elif isinstance(a, Plane) and isinstance(b, Line):
-        return angle(b, a)
+@kernel("angle", Line, Line)
+def _angle_line_line(a, b):
+    return acute(a.dv.angle(b.dv))
 
-    elif isinstance(a, Plane) and isinstance(b, Plane):
-        return acute(a.n.angle(b.n))
 
-    return NotImplemented
+@kernel("angle", Line, Plane)
+def _angle_line_plane(a, b):
+    rad = acute(a.dv.angle(b.n))
+    # What we are actually calculating is the angle between
+    # the normal of the plane and the line, but the normal
+    # is 90° from the plane. So the actual angle between a plane
+    # a line is 90° - that angle
+    return 0.5 * math.pi - rad
+
+
+@kernel("angle", Plane, Plane)
+def _angle_plane_plane(a, b):
+    return acute(a.n.angle(b.n))
 
 
 def orthogonal(a, b):
@@ -135,18 +450,22 @@ def orthogonal(a, b):
     - Plane/Line
     - Plane/Plane
     """
-    if isinstance(a, Line) and isinstance(b, Line):
-        return null(a.dv * b.dv)
+    return _dispatch("orthogonal", a, b)
+
+
+@kernel("orthogonal", Line, Line)
+def _orthogonal_line_line(a, b):
+    return null(a.dv * b.dv)
 
-    elif isinstance(a, Line) and isinstance(b, Plane):
-        return a.dv.parallel(b.n)
-    elif isinstance(a, Plane) and isinstance(b, Line):
-        return orthogonal(b, a)
 
-    elif isinstance(a, Plane) and isinstance(b, Plane):
-        return a.n.orthogonal(b.n)
-    
-    return NotImplemented
+@kernel("orthogonal", Line, Plane)
+def _orthogonal_line_plane(a, b):
+    return a.dv.parallel(b.n)
+
+
+@kernel("orthogonal", Plane, Plane)
+def _orthogonal_plane_plane(a, b):
+    return a.n.orthogonal(b.n)
 
 
 def distance(a, b):
@@ -156,59 +475,178 @@ def distance(a, b):
     - Line/Line
     - Plane/Point
     - Plane/Line
+    - Segment/Point
+    - Ray/Point
+    - Triangle/Point
     """
-    if isinstance(a, Point) and isinstance(b, Point):
-        # The distance between two Points A and B is just the length of
-        # the vector AB
-        return Vector(a, b).length()
-
-    elif isinstance(a, Point) and isinstance(b, Line):
-        # To get the distance between a point and a line, we place an
-        # auxiliary plane P. P is orthogonal to the line and contains
-        # the point. To achieve this, we just use the direction vector
-        # of the line as the normal vector of the plane.
-        aux_plane = Plane(a, b.dv)
-        # We then calculate the intersection of the auxiliary plane and
-        # the line
-        foot = intersection(aux_plane, b)
-        # And finally the distance between the point and the
-        # intersection point, which can be reduced to a Point-Point
+    return _dispatch("distance", a, b)
+
+
+@kernel("distance", Point, Point)
+def _distance_point_point(a, b):
+    # The distance between two Points A and B is just the length of
+    # the vector AB
+    return norm2((b.x - a.x, b.y - a.y, b.z - a.z)) ** 0.5
+
+
+@kernel("distance", Point, Line)
+def _distance_point_line(a, b):
+    # To get the distance between a point and a line, we could place
+    # an auxiliary plane through the point, orthogonal to the line,
+    # and measure the distance to its intersection with the line.
+    # The same foot point is at the parameter
+    #      _   _    _     _  2
+    # μ = (a - s) * u / | u |
+    # which gives us the distance right away.
+    w = (a.x - b.sv[0], a.y - b.sv[1], a.z - b.sv[2])
+    mu = dot(w, b.dv) / norm2(b.dv)
+    return norm2((w[0] - mu * b.dv[0],
+                  w[1] - mu * b.dv[1],
+                  w[2] - mu * b.dv[2])) ** 0.5
+
+
+@batch_kernel("distance", Point, Line)
+def _distance_points_line(points, line):
+    # The same as above, with the line's coordinates taken out once
+    s0, s1, s2 = line.sv._v
+    u0, u1, u2 = line.dv._v
+    uu = norm2(line.dv._v)
+    result = []
+    for a in points:
+        w0, w1, w2 = a.x - s0, a.y - s1, a.z - s2
+        mu = (w0 * u0 + w1 * u1 + w2 * u2) / uu
+        result.append(norm2((w0 - mu * u0, w1 - mu * u1,
+                             w2 - mu * u2)) ** 0.5)
+    return result
+
+
+@kernel("distance", Line, Line)
+def _distance_line_line(a, b):
+    # To get the distance between two lines, we just use the formula
+    #        _   _    _
+    # d = | (q - p) * n |
+    # where n is a vector orthogonal to both lines and with length 1!
+    # We can achieve this by using the normalized cross product, or
+    # without normalizing, by dividing the triple product by its
+    # length. For parallel lines there is no such n, so the whole
+    # thing is left to closest_points().
+    return closest_points(a, b).distance
+
+
+@kernel("distance", Point, Plane)
+def _distance_point_plane(a, b):
+    # To get the distance between a point and a plane, we could
+    # take a line that's orthogonal to the plane and goes through
+    # the point, intersect it with the plane and measure the
+    # distance to the intersection. All that boils down to the
+    # Hesse normal form:
+    #        _   _    _     _
+    # d = | (a - p) * n | / |n|
+    return abs(dot(b.n, a) - dot(b.n, b.p)) / norm2(b.n) ** 0.5
+
+
+@batch_kernel("distance", Point, Plane)
+def _distance_points_plane(points, plane):
+    n0, n1, n2 = plane.n._v
+    d = dot(plane.n._v, plane.p)
+    length = norm2(plane.n._v) ** 0.5
+    return [abs(n0 * a.x + n1 * a.y + n2 * a.z - d) / length
+            for a in points]
+
+
+@kernel("distance", Line, Plane)
+def _distance_line_plane(a, b):
+    if parallel(a, b):
+        # If the line is parallel, every point has the same distance
+        # to the plane, so we just pick one point and calculate its
         # distance
-        return distance(a, foot)
-    elif isinstance(a, Line) and isinstance(b, Point):
-        return distance(b, a)
-
-    elif isinstance(a, Line) and isinstance(b, Line):
-        # To get the distance between two lines, we just use the formula
-        #        _   _    _
-        # d = | (q - p) * n |
-        # where n is a vector orthogonal to both lines and with length 1!
-        # We can achieve this by using the normalized cross product
-        normale = a.dv.cross(b.dv).normalized()
-        return abs((b.sv - a.sv) * normale)
-
-    elif isinstance(a, Point) and isinstance(b, Plane):
-        # To get the distance between a point and a plane, we just take
-        # a line that's orthogonal to the plane and goes through the
-        # point
-        aux_line = Line(a, b.n)
-        # We then get the intersection point...
-        foot = intersection(aux_line, b)
-        # ...and finally the distance
-        return distance(a, foot)
-    elif isinstance(a, Plane) and isinstance(b, Point):
-        return distance(b, a)
-
-    elif isinstance(a, Line) and isinstance(b, Plane):
-        if parallel(a, b):
-            # If the line is parallel, every point has the same distance
-            # to the plane, so we just pick one point and calculate its
-            # distance
-            return distance(Point(a.sv), b)
-        # If they are not parallel, they will eventually intersect, so
-        # the distance is 0
-        return 0.0
-    elif isinstance(a, Plane) and isinstance(b, Line):
-        return distance(b, a)
-
-    return NotImplemented
+        return distance(Point(a.sv), b)
+    # If they are not parallel, they will eventually intersect, so
+    # the distance is 0
+    return 0.0
+
+
+@kernel("distance", Point, (Segment, Ray, Triangle))
+def _distance_point_closest(a, b):
+    # The distance to the closest point of the body
+    return distance(a, b.closest_point(a))
+
+
+#: The result of closest_points()
+ClosestPoints = namedtuple("ClosestPoints", ["point_a", "point_b", "param_a",
+                                             "param_b", "distance",
+                                             "parallel"])
+
+
+def _closest_parameters(s, u, q, v):
+    """The parameters (λ, μ) of the closest points s + λu and q + μv of
+    two lines, and whether the lines are parallel.
+    """
+    # The connection of the closest points is parallel to n = u × v,
+    # which gives (with w = q - s)
+    # λ = (w × v) * n / |n|²  and  μ = (w × u) * n / |n|²
+    # Unlike the normal equations with (u * u)(v * v) - (u * v)², the
+    # cross products don't cancel out for lines that are almost parallel.
+    w = (q[0] - s[0], q[1] - s[1], q[2] - s[2])
+    n = (u[1] * v[2] - u[2] * v[1], u[2] * v[0] - u[0] * v[2],
+         u[0] * v[1] - u[1] * v[0])
+    nn = norm2(n)
+    # nn / (uu * vv) is sin² of the angle between the lines, only
+    # rounding is left below this bound
+    if nn <= 1e-15 * dot(u, u) * dot(v, v):
+        # Every point has a partner at the same distance, we take the
+        # support vector of the first line and its foot on the second
+        return 0, -dot(v, w) / dot(v, v), True
+    return cross_dot(n, w, v) / nn, cross_dot(n, w, u) / nn, False
+
+
+def closest_points(a, b):
+    """Returns the closest points of the lines a and b, their parameters
+    and the distance between them as a ClosestPoints tuple
+    (point_a, point_b, param_a, param_b, distance, parallel), where
+    point_a = a.sv + param_a * a.dv and the same for b.
+
+    For parallel (and coincident) lines there are infinitely many such
+    pairs. Then param_a is 0 and point_b is the foot of a's support
+    vector on b.
+    """
+    return _dispatch("closest_points", a, b)
+
+
+@kernel("closest_points", Line, Line)
+def _closest_points_line_line(a, b):
+    lmb, mu, par = _closest_parameters(a.sv, a.dv, b.sv, b.dv)
+    pa, pb = axpy(a.sv, lmb, a.dv), axpy(b.sv, mu, b.dv)
+    d = norm2((pb[0] - pa[0], pb[1] - pa[1], pb[2] - pa[2])) ** 0.5
+    return ClosestPoints(Point(pa), Point(pb), lmb, mu, d, par)
+
+
+def closest_points_batch(lines_a, lines_b):
+    """Returns [closest_points(a, b) for a, b in zip(lines_a, lines_b)].
+    Either side can also be a single Line, which is then paired with
+    every line of the other side.
+    """
+    if isinstance(lines_a, Line):
+        lines_a = [lines_a] * len(lines_b)
+    if isinstance(lines_b, Line):
+        lines_b = [lines_b] * len(lines_a)
+    if len(lines_a) != len(lines_b):
+        raise ValueError("Can't pair {} lines with {} lines"
+                         .format(len(lines_a), len(lines_b)))
+    result = []
+    for a, b in zip(lines_a, lines_b):
+        s, u, q, v = a.sv._v, a.dv._v, b.sv._v, b.dv._v
+        lmb, mu, par = _closest_parameters(s, u, q, v)
+        pa = (s[0] + lmb * u[0], s[1] + lmb * u[1], s[2] + lmb * u[2])
+        pb = (q[0] + mu * v[0], q[1] + mu * v[1], q[2] + mu * v[2])
+        d = norm2((pb[0] - pa[0], pb[1] - pa[1], pb[2] - pa[2])) ** 0.5
+        result.append(ClosestPoints(Point(pa), Point(pb), lmb, mu, d, par))
+    return result
+
+
+# Bind the functions above as the GeoBody methods, so that
+# a.distance(b) is a plain call of distance(a, b) without the import
+# that GeoBody's fallback methods have to do.
+for _name in ("intersection", "parallel", "angle", "orthogonal", "distance"):
+    setattr(GeoBody, _name, globals()[_name])
+del _name
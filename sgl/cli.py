@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""The sgl command: evaluate queries from files or stdin.
+
+    $ sgl problems.jsonl -j 4 > answers.jsonl
+
+Every input line is a query in the format of sgl.protocol, e.g.
+
+    {"op": "distance", "args": [{"type": "Point", "coords": [0, 0, 5]},
+                                {"type": "Plane", "p": [0, 0, 0],
+                                 "n": [0, 0, 1]}]}
+
+(on one line). The responses are written in the order of the queries,
+as soon as they are ready. Queries without an "id" get their line
+number (counted over all inputs) as id. At the end, the number of
+queries, the throughput and percentiles of the time per query are
+written to stderr.
+"""
+from __future__ import print_function
+import argparse
+import multiprocessing
+import sys
+import time
+
+from . import protocol
+from .util import percentile
+
+_clock = getattr(time, "perf_counter", time.time)
+
+
+def read_queries(files):
+    """Yield (line number, line) for the non-empty lines of the given
+    files, "-" is stdin.
+    """
+    number = 0
+    for name in files:
+        stream = sys.stdin if name == "-" else open(name)
+        try:
+            for line in stream:
+                number += 1
+                if line.strip():
+                    yield number, line
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+def evaluate_line(item):
+    """Answer one input line, returns (response, seconds)."""
+    number, line = item
+    start = _clock()
+    try:
+        query = protocol.loads(line)
+    except protocol.ProtocolError as e:
+        response = {"id": number, "error": str(e)}
+    else:
+        if isinstance(query, dict) and "id" not in query:
+            query["id"] = number
+        response = protocol.evaluate(query)
+    return response, _clock() - start
+
+
+def summary(count, errors, wall, latencies):
+    """Return the statistics that are written to stderr at the end."""
+    lines = ["queries: {} ({} errors) in {:.3f}s, {:.1f} queries/s".format(
+        count, errors, wall, count / wall if wall else 0.0)]
+    if latencies:
+        lines.append("time per query: " + ", ".join(
+            "p{} {:.1f}us".format(q, percentile(latencies, q) * 1e6)
+            for q in (50, 90, 99)))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="sgl", description="Evaluate sgl queries (JSON lines).")
+    parser.add_argument("files", nargs="*", default=["-"],
+                        help="input files, - or nothing for stdin")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of worker processes (0: one per CPU)")
+    parser.add_argument("-c", "--chunk-size", type=int, default=64,
+                        help="queries that a worker gets at once")
+    parser.add_argument("-o", "--output", default="-",
+                        help="output file, - for stdout")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="don't write the statistics to stderr")
+    args = parser.parse_args(argv)
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    queries = read_queries(args.files)
+    pool = None
+    if args.jobs == 1:
+        results = (evaluate_line(item) for item in queries)
+    else:
+        pool = multiprocessing.Pool(args.jobs or None)
+        # imap keeps the order and hands out the queries in chunks
+        results = pool.imap(evaluate_line, queries, args.chunk_size)
+
+    count = errors = 0
+    latencies = []
+    start = _clock()
+    try:
+        for response, seconds in results:
+            count += 1
+            if "error" in response:
+                errors += 1
+            latencies.append(seconds)
+            output.write(protocol.dumps(response))
+        output.flush()
+    finally:
+        if pool is not None:
+            # All results are in (or we're stopping early anyway)
+            pool.terminate()
+            pool.join()
+        if output is not sys.stdout:
+            output.close()
+    wall = _clock() - start
+    if not args.quiet:
+        print(summary(count, errors, wall, latencies), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
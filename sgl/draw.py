@@ -1,51 +1,309 @@
 # -*- coding: utf-8 -*-
 import math
+import os
+import time
 from .line import Line
 from .point import Point
 from .vector import Vector
 
-def draw_parallels(renderer, box, start, count, direction, delta,
-                   color=(0.7, 0.7, 0.7), opacity=0.5):
-    """Draw count parallel lines, pointing in direction, starting at
-    start and changing by delta each step.
+_clock = getattr(time, "perf_counter", time.time)
+
+
+def vtk_coords(p):
+    """Return the coordinates of p (anything indexable) in the order
+    that vtk uses. Coordinate axes are labelled differently in maths and
+    3d graphics programming.
     """
-    for i in range(count):
-        Line(start, direction).draw(renderer, box, color=color)
-        start = Point(start.pv() + delta)
+    return (p[1], p[2], p[0])
 
 
-def draw(elements, background=(0.5, 0.5, 0.5), size=(640, 480),
-        box=((-10, -10, -10), (10, 10, 10)), grid=(1, 0, 1)):
-    """Visualize the given elements.
+def set_input(consumer, data):
+    """Connect a vtkPolyData to a mapper or filter. VTK 6 renamed
+    SetInput to SetInputData.
+    """
+    if hasattr(consumer, "SetInputData"):
+        consumer.SetInputData(data)
+    else:
+        consumer.SetInput(data)
 
-    box defines a cuboid that acts as a boundary. Only stuff inside of
-    the cuboid is drawn. The cuboid is defined as
-        ((minx, miny, minz), (maxx, maxy, maxz)).
 
-    grid defines if a coordinate grid should be drawn. It conists of
-    three float values (x1x2, x1x3, x2x3). The values specify the
-    distance between each grid line. If the distance is 0, the grid
-    will not be drawn.
+class Batch(object):
+    """Collects the primitives (segments, points, polygons, arrows) of
+    many elements, so that they can be rendered with a single vtkPolyData,
+    mapper and actor per style instead of a vtk pipeline per element.
+
+    The elements add their primitives with their collect() method, the
+    batch is turned into actors with render().
     """
-    min_, max_ = box
-    import vtk
+    def __init__(self):
+        # color -> [(A, B), ...]
+        self.segments = {}
+        # (color, radius) -> [P, ...]
+        self.points = {}
+        # color -> [[P1, P2, ...], ...]
+        self.polygons = {}
+        # color -> [(tip, direction), ...]
+        self.cones = {}
 
-    renderer = vtk.vtkRenderer()
-    renderer.SetBackground(*background)
+    def add_segment(self, a, b, color):
+        self.segments.setdefault(tuple(color), []).append((a, b))
 
-    renderWindow = vtk.vtkRenderWindow()
-    renderWindow.SetSize(*size)
-    renderWindow.LineSmoothingOn()
-    renderWindow.PolygonSmoothingOn()
-    renderWindow.PointSmoothingOn()
-    renderWindow.AddRenderer(renderer)
-    renderWindow.SetWindowName("sgl")
+    def add_point(self, p, color, radius):
+        self.points.setdefault((tuple(color), radius), []).append(p)
+
+    def add_points(self, points, color, radius):
+        """Add many points (Points or coordinate triples) at once."""
+        self.points.setdefault((tuple(color), radius), []).extend(points)
+
+    def add_polygon(self, points, color):
+        self.polygons.setdefault(tuple(color), []).append(points)
+
+    def add_arrow(self, origin, end, color):
+        """An arrow from origin to end, that is a segment with a little
+        hat (cone) on it.
+        """
+        self.add_segment(origin, end, color)
+        direction = tuple(e - o for o, e in zip(origin, end))
+        self.cones.setdefault(tuple(color), []).append((end, direction))
+
+    def __len__(self):
+        """The number of collected primitives."""
+        return sum(len(items) for kind in (self.segments, self.points,
+                                           self.polygons, self.cones)
+                   for items in kind.values())
+
+    def build(self):
+        """Build the vtkPolyData for every kind of primitive and style.
+        Returns a dict (kind, style, detail) -> Layer, where detail is
+        the level of detail that was chosen for the number of points or
+        cones (see POINT_LOD and CONE_LOD).
+        """
+        import vtk
+        layers = {}
+        for color, segments in self.segments.items():
+            layers["segments", color, None] = Layer(
+                color, _segment_data(vtk, segments), None)
+        for color, polygons in self.polygons.items():
+            layers["polygons", color, None] = Layer(
+                color, _polygon_data(vtk, polygons), None)
+        for (color, radius), points in self.points.items():
+            resolution = level_of_detail(POINT_LOD, len(points))
+            key = ("points", (color, radius), resolution)
+            if resolution is None:
+                layers[key] = Layer(color, _vertex_data(vtk, points),
+                                    VERTEX_SIZE)
+            else:
+                layers[key] = Layer(
+                    color, _sphere_data(vtk, points, radius, resolution),
+                    None)
+        for color, cones in self.cones.items():
+            resolution = level_of_detail(CONE_LOD, len(cones))
+            # Too many arrows to draw their heads, the shafts have to do
+            if resolution is not None:
+                layers["cones", color, resolution] = Layer(
+                    color, _cone_data(vtk, cones, resolution), None)
+        return layers
+
+    def render(self, renderer):
+        """Add one actor per kind of primitive and style to the given
+        renderer (vtk) and return the list of actors.
+        """
+        import vtk
+        actors = []
+        for layer in self.build().values():
+            actor = _actor(vtk, layer)
+            renderer.AddActor(actor)
+            actors.append(actor)
+        return actors
+
+
+class Layer(object):
+    """The geometry of one kind of primitive in one style. point_size
+    is set for vertices, which are drawn in screen space.
+    """
+    def __init__(self, color, data, point_size):
+        self.color = color
+        self.data = data
+        self.point_size = point_size
+
+
+def _actor(vtk, layer):
+    mapper = vtk.vtkPolyDataMapper()
+    set_input(mapper, layer.data)
+    actor = vtk.vtkActor()
+    actor.SetMapper(mapper)
+    prop = actor.GetProperty()
+    prop.SetColor(*layer.color)
+    if layer.point_size is not None:
+        prop.SetPointSize(layer.point_size)
+        if hasattr(prop, "RenderPointsAsSpheresOn"):
+            prop.RenderPointsAsSpheresOn()
+    return actor
 
-    renderWindowInteractor = vtk.vtkRenderWindowInteractor()
-    renderWindowInteractor.SetRenderWindow(renderWindow)
-    renderWindowInteractor.GetInteractorStyle().SetCurrentStyleToTrackballCamera()
 
-    # Add axes
+def _segment_data(vtk, segments):
+    points = vtk.vtkPoints()
+    lines = vtk.vtkCellArray()
+    for a, b in segments:
+        lines.InsertNextCell(2)
+        lines.InsertCellPoint(points.InsertNextPoint(*vtk_coords(a)))
+        lines.InsertCellPoint(points.InsertNextPoint(*vtk_coords(b)))
+    data = vtk.vtkPolyData()
+    data.SetPoints(points)
+    data.SetLines(lines)
+    return data
+
+
+def _polygon_data(vtk, polygons):
+    points = vtk.vtkPoints()
+    polys = vtk.vtkCellArray()
+    for polygon in polygons:
+        polys.InsertNextCell(len(polygon))
+        for point in polygon:
+            polys.InsertCellPoint(points.InsertNextPoint(*vtk_coords(point)))
+    data = vtk.vtkPolyData()
+    data.SetPoints(points)
+    data.SetPolys(polys)
+    return data
+
+
+#: Level of detail for points: (up to this many points, use spheres
+#: with this resolution). More points than that are drawn as vertices.
+POINT_LOD = ((1000, 16), (20000, 8), (200000, 4))
+
+#: Level of detail for arrow heads: (up to this many arrows, use cones
+#: with this resolution). More arrows than that are drawn without heads.
+CONE_LOD = ((1000, 16), (50000, 6))
+
+#: Size in pixels of points that are drawn as vertices
+VERTEX_SIZE = 3
+
+
+def level_of_detail(table, count):
+    """Return the resolution that table (see POINT_LOD) gives for count
+    items, or None if there are too many for any of its entries.
+    """
+    for limit, resolution in table:
+        if count <= limit:
+            return resolution
+    return None
+
+
+def _point_buffer(vtk, points):
+    """Put the coordinates of all points into one vtkPoints."""
+    buffer = vtk.vtkPoints()
+    buffer.SetNumberOfPoints(len(points))
+    set_point = buffer.SetPoint
+    for i, p in enumerate(points):
+        set_point(i, p[1], p[2], p[0])
+    return buffer
+
+
+def _glyph_data(vtk, points, source, directions=None):
+    """Place a copy of the output of source at each of the points,
+    turned into the given directions if there are any. One vtkGlyph3D
+    does all of them, instead of one source per point.
+    """
+    data = vtk.vtkPolyData()
+    data.SetPoints(_point_buffer(vtk, points))
+    glyph = vtk.vtkGlyph3D()
+    if directions is not None:
+        vectors = vtk.vtkDoubleArray()
+        vectors.SetNumberOfComponents(3)
+        vectors.SetNumberOfTuples(len(directions))
+        for i, v in enumerate(directions):
+            vectors.SetTuple3(i, v[1], v[2], v[0])
+        data.GetPointData().SetVectors(vectors)
+        glyph.SetVectorModeToUseVector()
+        glyph.OrientOn()
+    else:
+        glyph.OrientOff()
+    set_input(glyph, data)
+    glyph.SetSourceConnection(source.GetOutputPort())
+    glyph.SetScaleModeToDataScalingOff()
+    glyph.Update()
+    return glyph.GetOutput()
+
+
+def _sphere_data(vtk, points, radius, resolution):
+    source = vtk.vtkSphereSource()
+    source.SetRadius(radius)
+    source.SetThetaResolution(resolution)
+    source.SetPhiResolution(resolution)
+    return _glyph_data(vtk, points, source)
+
+
+def _vertex_data(vtk, points):
+    verts = vtk.vtkCellArray()
+    for i in range(len(points)):
+        verts.InsertNextCell(1)
+        verts.InsertCellPoint(i)
+    data = vtk.vtkPolyData()
+    data.SetPoints(_point_buffer(vtk, points))
+    data.SetVerts(verts)
+    return data
+
+
+def _cone_data(vtk, cones, resolution):
+    # The cone source points along the x axis, the glyph filter turns
+    # it into the direction of each arrow
+    source = vtk.vtkConeSource()
+    source.SetHeight(1)
+    source.SetRadius(0.2)
+    source.SetResolution(resolution)
+    return _glyph_data(vtk, [tip for tip, _ in cones], source,
+                       [direction for _, direction in cones])
+
+
+class PointCloud(object):
+    """Many points that are drawn together, e.g. a scanned point cloud.
+
+    points can be Points or plain coordinate triples; the latter avoid
+    creating a Point object for each of a million points. A cloud is
+    drawn with a single glyph pipeline (or as vertices if it is big,
+    see POINT_LOD), just like the Points given to draw().
+    """
+    def __init__(self, points, color=(1, 0, 1), radius=0.2):
+        self.points = points
+        self.color = color
+        self.radius = radius
+
+    def __len__(self):
+        return len(self.points)
+
+    def __repr__(self):
+        return "PointCloud(<{} points>)".format(len(self))
+
+    def collect(self, batch, box, color=None, radius=None):
+        """Add the points to the given sgl.draw.Batch. The box argument
+        is ignored. color and radius default to the ones of the cloud.
+        """
+        batch.add_points(self.points,
+                         self.color if color is None else color,
+                         self.radius if radius is None else radius)
+
+
+def draw_parallels(batch, box, start, count, direction, delta,
+                   color=(0.7, 0.7, 0.7)):
+    """Draw count parallel lines, pointing in direction, starting at
+    start and changing by delta each step.
+    """
+    for i in range(count):
+        Line(start, direction).collect(batch, box, color=color)
+        start = Point(start.pv() + delta)
+
+
+def grid_count(low, high, delta):
+    """Return (start, count) for grid lines every delta units between
+    low and high.
+    """
+    start = int(math.ceil(low))
+    stop = int(math.floor(high))
+    return start, int(math.floor((stop - start) / float(delta))) + 1
+
+
+def make_axes(vtk):
+    """Return the actor for the coordinate axes."""
     axes = vtk.vtkAxesActor()
     axes.SetTotalLength(10, 10, 10)
     for actor in (
@@ -61,76 +319,424 @@ def draw(elements, background=(0.5, 0.5, 0.5), size=(640, 480),
     axes.SetYAxisLabelText("x3")
     axes.SetZAxisLabelText("x1")
     axes.SetConeRadius(0.1)
-    renderer.AddActor(axes)
+    return axes
 
-    # Add grid
+
+def collect_grid(batch, box, grid):
+    """Add the coordinate grid to the given batch, see draw() for the
+    meaning of box and grid.
+    """
+    min_, max_ = box
     if grid[0]:  # x1x2
-        start = int(math.ceil(min_[0]))
-        stop = int(math.floor(max_[0]))
         delta = grid[0]
-        draw_parallels(renderer, box,
+        start, count = grid_count(min_[0], max_[0], delta)
+        draw_parallels(batch, box,
                 start=Point(start, 0, 0),
                 direction=Vector(0, 1, 0),
                 delta=Vector(delta, 0, 0),
-                count=(stop - start + 1)/delta,
+                count=count,
         )
-        start = int(math.ceil(min_[1]))
-        stop = int(math.floor(max_[1]))
-        delta = grid[0]
-        draw_parallels(renderer, box,
+        start, count = grid_count(min_[1], max_[1], delta)
+        draw_parallels(batch, box,
                 start=Point(0, start, 0),
                 direction=Vector(1, 0, 0),
                 delta=Vector(0, delta, 0),
-                count=(stop - start + 1)/delta,
+                count=count,
         )
 
     if grid[1]:  # x1x3
-        start = int(math.ceil(min_[0]))
-        stop = int(math.floor(max_[0]))
         delta = grid[1]
-        draw_parallels(renderer, box,
+        start, count = grid_count(min_[0], max_[0], delta)
+        draw_parallels(batch, box,
                 start=Point(start, 0, 0),
                 direction=Vector(0, 0, 1),
                 delta=Vector(delta, 0, 0),
-                count=(stop - start + 1)/delta,
+                count=count,
         )
-        start = int(math.ceil(min_[2]))
-        stop = int(math.floor(max_[2]))
-        delta = grid[1]
-        draw_parallels(renderer, box,
+        start, count = grid_count(min_[2], max_[2], delta)
+        draw_parallels(batch, box,
                 start=Point(0, 0, start),
                 direction=Vector(1, 0, 0),
                 delta=Vector(0, 0, delta),
-                count=(stop - start + 1)/delta,
+                count=count,
         )
 
     if grid[2]:  # x2x3
-        start = int(math.ceil(min_[1]))
-        stop = int(math.floor(max_[1]))
         delta = grid[2]
-        draw_parallels(renderer, box,
+        start, count = grid_count(min_[1], max_[1], delta)
+        draw_parallels(batch, box,
                 start=Point(0, start, 0),
                 direction=Vector(0, 0, 1),
                 delta=Vector(0, delta, 0),
-                count=(stop - start + 1)/delta,
+                count=count,
         )
-        start = int(math.ceil(min_[2]))
-        stop = int(math.floor(max_[2]))
-        delta = grid[2]
-        draw_parallels(renderer, box,
+        start, count = grid_count(min_[2], max_[2], delta)
+        draw_parallels(batch, box,
                 start=Point(0, 0, start),
                 direction=Vector(0, 1, 0),
                 delta=Vector(0, 0, delta),
-                count=(stop - start + 1)/delta,
+                count=count,
         )
-        
+
+
+class Camera(object):
+    """Camera parameters for rendering, given in sgl coordinates.
+
+    position and focal_point are points (or coordinate triples),
+    view_up is the direction that points upwards on the screen. If
+    position is None, the camera is placed so that the whole scene is
+    visible. zoom > 1 magnifies the image, view_angle is the vertical
+    opening angle in degrees.
+    """
+    def __init__(self, position=None, focal_point=(0, 0, 0), view_up=None,
+                 zoom=1.0, view_angle=None):
+        self.position = position
+        self.focal_point = focal_point
+        self.view_up = view_up
+        self.zoom = zoom
+        self.view_angle = view_angle
+
+    def apply(self, renderer):
+        """Set up the active camera of the given renderer (vtk)."""
+        camera = renderer.GetActiveCamera()
+        if self.position is None:
+            renderer.ResetCamera()
+        else:
+            camera.SetPosition(*vtk_coords(self.position))
+        camera.SetFocalPoint(*vtk_coords(self.focal_point))
+        if self.view_up is not None:
+            camera.SetViewUp(*vtk_coords(self.view_up))
+        if self.view_angle is not None:
+            camera.SetViewAngle(self.view_angle)
+        if self.zoom != 1.0:
+            camera.Zoom(self.zoom)
+        renderer.ResetCameraClippingRange()
+
+
+# File extension -> name of the vtk writer class
+IMAGE_WRITERS = {
+    ".png": "vtkPNGWriter",
+    ".jpg": "vtkJPEGWriter",
+    ".jpeg": "vtkJPEGWriter",
+    ".bmp": "vtkBMPWriter",
+    ".tif": "vtkTIFFWriter",
+    ".tiff": "vtkTIFFWriter",
+    ".pnm": "vtkPNMWriter",
+}
+
+
+def _writer_name(filename):
+    """Return the name of the vtk writer class for the extension of
+    filename.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    try:
+        return IMAGE_WRITERS[extension]
+    except KeyError:
+        raise ValueError("Unsupported image format: {!r}".format(extension))
+
+
+class OffscreenRenderer(object):
+    """Renders scenes to image files without opening a window.
+
+    The render window, the axes and the grids are created once and
+    reused for every scene, which is what makes batch rendering fast.
+    On machines without a display this needs a vtk that is built with
+    OSMesa or EGL support, no GPU is required for the former.
+    """
+    def __init__(self, size=(640, 480)):
+        import vtk
+        self._vtk = vtk
+        self.renderer = vtk.vtkRenderer()
+        self.window = vtk.vtkRenderWindow()
+        self.window.SetOffScreenRendering(1)
+        self.window.SetSize(*size)
+        self.window.AddRenderer(self.renderer)
+        self._axes = make_axes(vtk)
+        # (box, grid) -> list of actors
+        self._grids = {}
+        self._image = vtk.vtkWindowToImageFilter()
+        self._image.SetInput(self.window)
+        self._image.ReadFrontBufferOff()
+        self._writers = {}
+
+    def _grid(self, box, grid):
+        """The actors of the grid, render() adds them to the renderer."""
+        key = (tuple(map(tuple, box)), tuple(grid))
+        if key not in self._grids:
+            batch = Batch()
+            collect_grid(batch, box, grid)
+            self._grids[key] = [_actor(self._vtk, layer)
+                                for layer in batch.build().values()]
+        return self._grids[key]
+
+    def _writer(self, filename):
+        name = _writer_name(filename)
+        if name not in self._writers:
+            writer = getattr(self._vtk, name)()
+            writer.SetInputConnection(self._image.GetOutputPort())
+            self._writers[name] = writer
+        return self._writers[name]
+
+    def render(self, elements, filename, background=(0.5, 0.5, 0.5),
+               box=((-10, -10, -10), (10, 10, 10)), grid=(1, 0, 1),
+               camera=None):
+        """Render the given elements into the image file filename. The
+        format is chosen by the file extension (png, jpg, bmp, tiff,
+        pnm). See draw() for the other arguments and Camera for camera.
+        """
+        renderer = self.renderer
+        renderer.RemoveAllViewProps()
+        renderer.SetBackground(*background)
+        renderer.AddActor(self._axes)
+        for actor in self._grid(box, grid):
+            renderer.AddActor(actor)
+        batch = Batch()
+        for element in elements:
+            element.collect(batch, box)
+        batch.render(renderer)
+
+        (camera or Camera()).apply(renderer)
+        self.window.Render()
+        self._image.Modified()
+        writer = self._writer(filename)
+        writer.SetFileName(filename)
+        writer.Write()
+
+
+# size -> OffscreenRenderer, so that consecutive calls of
+# render_to_file share their render window
+_offscreen = {}
+
+
+def render_to_file(elements, filename, background=(0.5, 0.5, 0.5),
+                   size=(640, 480), box=((-10, -10, -10), (10, 10, 10)),
+                   grid=(1, 0, 1), camera=None):
+    """Render the given elements into an image file without opening a
+    window. The arguments are the same as for draw(), camera can be a
+    Camera to control the view. The render window is kept and reused
+    for the next call with the same size.
+    """
+    # Fail before the render window is set up
+    _writer_name(filename)
+    size = tuple(size)
+    if size not in _offscreen:
+        _offscreen[size] = OffscreenRenderer(size)
+    _offscreen[size].render(elements, filename, background=background,
+                            box=box, grid=grid, camera=camera)
+
+
+def make_window(vtk, renderer, size):
+    """Create the interactive render window and its interactor."""
+    renderWindow = vtk.vtkRenderWindow()
+    renderWindow.SetSize(*size)
+    renderWindow.LineSmoothingOn()
+    renderWindow.PolygonSmoothingOn()
+    renderWindow.PointSmoothingOn()
+    renderWindow.AddRenderer(renderer)
+    renderWindow.SetWindowName("sgl")
+
+    renderWindowInteractor = vtk.vtkRenderWindowInteractor()
+    renderWindowInteractor.SetRenderWindow(renderWindow)
+    renderWindowInteractor.GetInteractorStyle().SetCurrentStyleToTrackballCamera()
+    return renderWindow, renderWindowInteractor
+
+
+class Scene(object):
+    """A scene that keeps the vtk actors of its elements around.
+
+    Unlike draw(), which builds everything from scratch, a Scene lets
+    you add, remove and update single elements, and only the geometry
+    of that element is recomputed. Renders are throttled to at most one
+    per min_interval seconds, so you can call render() after every
+    change of an evolving configuration:
+
+        point = Point(0, 0, 0)
+        scene = Scene([Plane(0, 0, 1, -1)])
+        def step(scene):
+            point[0] += 0.1   # move the point
+            scene.update(point)
+        scene.add(point)
+        scene.show(step)
+
+    Elements are identified by identity, so update() is meant for
+    elements that were changed in place (or whose style changed), like
+    the Point above, which supports item assignment.
+    The other arguments are the same as for draw().
+    """
+    def __init__(self, elements=(), background=(0.5, 0.5, 0.5),
+                 size=(640, 480), box=((-10, -10, -10), (10, 10, 10)),
+                 grid=(1, 0, 1), camera=None, min_interval=1 / 30.0):
+        import vtk
+        self._vtk = vtk
+        self.box = box
+        self.camera = camera
+        self.min_interval = min_interval
+        self.renderer = vtk.vtkRenderer()
+        self.renderer.SetBackground(*background)
+        self.window, self.interactor = make_window(vtk, self.renderer, size)
+        # The axes and the grid never change
+        self.renderer.AddActor(make_axes(vtk))
+        batch = Batch()
+        collect_grid(batch, box, grid)
+        batch.render(self.renderer)
+        # id(element) -> _SceneEntry
+        self._entries = {}
+        self._last_render = None
+        self._dirty = True
+        for element in elements:
+            self.add(element)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, element):
+        return id(element) in self._entries
+
+    def _entry(self, element):
+        try:
+            return self._entries[id(element)]
+        except KeyError:
+            raise ValueError("{!r} is not part of the scene".format(element))
+
+    def add(self, element, **style):
+        """Add an element. style are keyword arguments for the collect()
+        method of the element, e.g. color.
+        """
+        if element in self:
+            raise ValueError("{!r} is already part of the scene"
+                             .format(element))
+        entry = self._entries[id(element)] = _SceneEntry(element, style)
+        self._sync(entry)
+
+    def update(self, element, **style):
+        """Recompute the geometry of an element after it changed. New
+        style arguments are merged into the old ones.
+        """
+        entry = self._entry(element)
+        entry.style.update(style)
+        self._sync(entry)
+
+    def remove(self, element):
+        """Remove an element from the scene."""
+        entry = self._entry(element)
+        del self._entries[id(element)]
+        for actor in entry.actors.values():
+            self.renderer.RemoveActor(actor)
+        self._dirty = True
+
+    def _sync(self, entry):
+        """Bring the actors of an entry up to date. Existing actors get
+        the new geometry, so only new kinds of primitives need new
+        actors.
+        """
+        batch = Batch()
+        entry.element.collect(batch, self.box, **entry.style)
+        data = batch.build()
+        for key in list(entry.actors):
+            if key not in data:
+                self.renderer.RemoveActor(entry.actors.pop(key))
+        for key, layer in data.items():
+            actor = entry.actors.get(key)
+            if actor is None:
+                actor = entry.actors[key] = _actor(self._vtk, layer)
+                self.renderer.AddActor(actor)
+            else:
+                set_input(actor.GetMapper(), layer.data)
+        self._dirty = True
+
+    def render(self, force=False):
+        """Render the scene if anything changed since the last render,
+        but not more often than once per min_interval seconds, unless
+        force is True. Returns True if the scene was rendered.
+        """
+        if not (self._dirty or force):
+            return False
+        now = _clock()
+        if self._last_render is None:
+            (self.camera or Camera()).apply(self.renderer)
+        elif not force and now - self._last_render < self.min_interval:
+            return False
+        self.window.Render()
+        self._last_render = now
+        self._dirty = False
+        return True
+
+    def show(self, callback=None, interval=None):
+        """Open the interactive window. If callback is given, it is
+        called with the scene every interval seconds (min_interval by
+        default) and the scene is rendered afterwards, which is the way
+        to animate it. Blocks until the window is closed.
+        """
+        self.render(force=True)
+        if callback is not None:
+            if interval is None:
+                interval = self.min_interval
+
+            def on_timer(obj, event):
+                callback(self)
+                self.render()
+            self.interactor.Initialize()
+            self.interactor.AddObserver("TimerEvent", on_timer)
+            self.interactor.CreateRepeatingTimer(int(interval * 1000))
+        self.interactor.Start()
+
+
+class _SceneEntry(object):
+    """An element of a Scene, together with its style and actors."""
+    def __init__(self, element, style):
+        self.element = element
+        self.style = style
+        # (kind, style, detail) -> actor, see Batch.build
+        self.actors = {}
+
+
+def draw(elements, background=(0.5, 0.5, 0.5), size=(640, 480),
+        box=((-10, -10, -10), (10, 10, 10)), grid=(1, 0, 1), output=None,
+        camera=None):
+    """Visualize the given elements.
+
+    box defines a cuboid that acts as a boundary. Only stuff inside of
+    the cuboid is drawn. The cuboid is defined as
+        ((minx, miny, minz), (maxx, maxy, maxz)).
+
+    grid defines if a coordinate grid should be drawn. It conists of
+    three float values (x1x2, x1x3, x2x3). The values specify the
+    distance between each grid line. If the distance is 0, the grid
+    will not be drawn.
+
+    If output is a file name, the scene is rendered offscreen into that
+    image file (see render_to_file) instead of opening a window.
+
+    camera optionally sets up the view, see Camera.
+
+    All elements are collected into a single Batch, so the scene
+    consists of a handful of actors no matter how many elements there
+    are.
+    """
+    if output is not None:
+        render_to_file(elements, output, background=background, size=size,
+                       box=box, grid=grid, camera=camera)
+        return
+
+    import vtk
+
+    renderer = vtk.vtkRenderer()
+    renderer.SetBackground(*background)
+    renderWindow, renderWindowInteractor = make_window(vtk, renderer, size)
+
+    renderer.AddActor(make_axes(vtk))
+
+    batch = Batch()
+    collect_grid(batch, box, grid)
     for element in elements:
-        element.draw(renderer, box)
+        element.collect(batch, box)
+    batch.render(renderer)
 
-    renderer.ResetCamera()
-    renderer.GetActiveCamera().SetFocalPoint(0, 0, 0)
+    (camera or Camera()).apply(renderer)
     renderWindow.Render()
     renderWindowInteractor.Start()
 
 
-__all__ = ("draw",)
+__all__ = ("draw", "render_to_file", "Batch", "Camera", "OffscreenRenderer",
+           "PointCloud", "Scene")
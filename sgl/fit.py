@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""Least-squares fitting of bodies to point clouds, in one pass and
+constant memory.
+
+    >>> fitter = PlaneFitter()
+    >>> for chunk in scan:
+    ...     fitter.extend(chunk)
+    >>> fitter.plane(), fitter.rms()
+
+LineFitter does the same for lines.
+
+A fitter only keeps the number of points, their mean and the sums of
+the squared deviations from the mean (the scatter matrix), so it can be
+fed any number of points. Fitters of different chunks (e.g. from worker
+processes, they can be pickled) are combined with merge(), which gives
+the same result as feeding all points to one fitter.
+
+The points can be Points or plain coordinate triples.
+"""
+from __future__ import division
+import math
+from .line import Line
+from .plane import Plane, _basis
+from .point import Point
+from .solver import null
+from .vector import Vector
+
+
+class _Moments(object):
+    """The running mean and scatter matrix of a point cloud."""
+    def __init__(self, points=()):
+        self.count = 0
+        self.mean = (0.0, 0.0, 0.0)
+        # The sums of the products of the deviations from the mean,
+        # xx, xy, xz, yy, yz, zz
+        self._m2 = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        self.extend(points)
+
+    def __len__(self):
+        return self.count
+
+    def add(self, point):
+        """Add a single point."""
+        return self.extend((point,))
+
+    def extend(self, points):
+        """Add all points of an iterable, returns the fitter."""
+        points = iter(points)
+        for first in points:
+            break
+        else:
+            return self
+        # The sums of a chunk are taken relative to its first point, so
+        # that they don't lose precision for clouds far from the origin
+        kx, ky, kz = _coords(first)
+        n = 1
+        sx = sy = sz = 0.0
+        sxx = sxy = sxz = syy = syz = szz = 0.0
+        for p in points:
+            if type(p) is Point:
+                x, y, z = p.x - kx, p.y - ky, p.z - kz
+            else:
+                x, y, z = p[0] - kx, p[1] - ky, p[2] - kz
+            n += 1
+            sx += x
+            sy += y
+            sz += z
+            sxx += x * x
+            sxy += x * y
+            sxz += x * z
+            syy += y * y
+            syz += y * z
+            szz += z * z
+        mx, my, mz = sx / n, sy / n, sz / n
+        m2 = (sxx - sx * mx, sxy - sx * my, sxz - sx * mz,
+              syy - sy * my, syz - sy * mz, szz - sz * mz)
+        self._combine(n, (kx + mx, ky + my, kz + mz), m2)
+        return self
+
+    def merge(self, other):
+        """Add the points of another fitter, returns this one."""
+        self._combine(other.count, other.mean, other._m2)
+        return self
+
+    def _combine(self, n, mean, m2):
+        # Chan et al.: the scatter matrices of two parts add up, plus
+        # the scatter of the two means
+        if not n:
+            return
+        if not self.count:
+            self.count, self.mean, self._m2 = n, tuple(mean), tuple(m2)
+            return
+        total = self.count + n
+        dx, dy, dz = (mean[0] - self.mean[0], mean[1] - self.mean[1],
+                      mean[2] - self.mean[2])
+        f = self.count * n / total
+        a = self._m2
+        self._m2 = (a[0] + m2[0] + f * dx * dx, a[1] + m2[1] + f * dx * dy,
+                    a[2] + m2[2] + f * dx * dz, a[3] + m2[3] + f * dy * dy,
+                    a[4] + m2[4] + f * dy * dz, a[5] + m2[5] + f * dz * dz)
+        g = n / total
+        self.mean = (self.mean[0] + g * dx, self.mean[1] + g * dy,
+                     self.mean[2] + g * dz)
+        self.count = total
+
+    def covariance(self):
+        """Return the covariance matrix of the points (as a list of
+        rows, divided by the number of points).
+        """
+        if not self.count:
+            raise ValueError("No points")
+        xx, xy, xz, yy, yz, zz = [m / self.count for m in self._m2]
+        return [[xx, xy, xz], [xy, yy, yz], [xz, yz, zz]]
+
+    def _principal_axes(self, minimum):
+        """The eigenvalues of the scatter matrix (largest first), and
+        the eigenvector of the largest one, or of the smallest one if
+        minimum is True.
+        """
+        xx, xy, xz, yy, yz, zz = self._m2
+        m = [[xx, xy, xz], [xy, yy, yz], [xz, yz, zz]]
+        values = symmetric_eigenvalues(m)
+        return values, eigenvector(m, values[2 if minimum else 0])
+
+
+class PlaneFitter(_Moments):
+    """Fits a plane to points in the least-squares sense (the sum of
+    the squared distances to the plane is the smallest). The plane goes
+    through the mean of the points, and its normal is the direction in
+    which they spread least.
+    """
+    def plane(self):
+        """Return the best-fit Plane for the points so far. Raises
+        ValueError for fewer than three points, or if they are all on
+        one line.
+        """
+        if self.count < 3:
+            raise ValueError("A plane needs at least 3 points, not {}"
+                             .format(self.count))
+        values, normal = self._principal_axes(True)
+        if not values[0] or null(values[1] / values[0]):
+            raise ValueError("The points are on one line, they don't "
+                             "define a plane")
+        return Plane(Point(self.mean), Vector(normal))
+
+    def rms(self):
+        """Return the root mean square of the distances of the points to
+        the best-fit plane.
+        """
+        if not self.count:
+            raise ValueError("No points")
+        # The smallest eigenvalue is lost in rounding for thin clouds,
+        # the variance along the normal isn't
+        _, normal = self._principal_axes(True)
+        return math.sqrt(max(_spread(self.covariance(), normal), 0.0))
+
+
+class LineFitter(_Moments):
+    """Fits a line to points in the least-squares sense (total least
+    squares, the sum of the squared distances to the line is the
+    smallest). The line goes through the mean of the points, in the
+    direction in which they spread most.
+    """
+    def line(self):
+        """Return the best-fit Line for the points so far. Raises
+        ValueError for fewer than two different points.
+        """
+        if self.count < 2:
+            raise ValueError("A line needs at least 2 points, not {}"
+                             .format(self.count))
+        values, direction = self._principal_axes(False)
+        if values[0] <= 0:
+            raise ValueError("The points are all the same, they don't "
+                             "define a line")
+        return Line(Point(self.mean), Vector(direction))
+
+    def rms(self):
+        """Return the root mean square of the distances of the points to
+        the best-fit line.
+        """
+        if not self.count:
+            raise ValueError("No points")
+        # The squared distances are the spread in the two directions
+        # orthogonal to the line. Taking the trace minus the largest
+        # eigenvalue instead would cancel out for thin clouds
+        _, direction = self._principal_axes(False)
+        m = self.covariance()
+        u, v = _basis(direction)
+        return math.sqrt(max(_spread(m, u) + _spread(m, v), 0.0))
+
+
+def _coords(p):
+    if type(p) is Point:
+        return p.x, p.y, p.z
+    x, y, z = p
+    return x, y, z
+
+
+def _spread(m, v):
+    """Return v * m v, the variance in the direction of the unit vector v
+    for a covariance matrix m.
+    """
+    return sum(v[i] * m[i][j] * v[j] for i in range(3) for j in range(3))
+
+
+def symmetric_eigenvalues(m):
+    """Return the eigenvalues of a symmetric 3x3 matrix in descending
+    order, in closed form (the trigonometric solution of the
+    characteristic cubic).
+    """
+    p1 = m[0][1] ** 2 + m[0][2] ** 2 + m[1][2] ** 2
+    q = (m[0][0] + m[1][1] + m[2][2]) / 3
+    if p1 == 0:
+        # Diagonal already
+        return sorted((m[0][0], m[1][1], m[2][2]), reverse=True)
+    p2 = ((m[0][0] - q) ** 2 + (m[1][1] - q) ** 2 + (m[2][2] - q) ** 2 +
+          2 * p1)
+    p = math.sqrt(p2 / 6)
+    # B = (m - q I) / p has eigenvalues 2 cos(φ + 2kπ/3)
+    b = [[(m[i][j] - (q if i == j else 0)) / p for j in range(3)]
+         for i in range(3)]
+    r = (b[0][0] * (b[1][1] * b[2][2] - b[1][2] * b[2][1]) -
+         b[0][1] * (b[1][0] * b[2][2] - b[1][2] * b[2][0]) +
+         b[0][2] * (b[1][0] * b[2][1] - b[1][1] * b[2][0])) / 2
+    phi = math.acos(min(max(r, -1.0), 1.0)) / 3
+    largest = q + 2 * p * math.cos(phi)
+    smallest = q + 2 * p * math.cos(phi + 2 * math.pi / 3)
+    return [largest, 3 * q - largest - smallest, smallest]
+
+
+def eigenvector(m, value):
+    """Return a unit eigenvector of the symmetric 3x3 matrix m for the
+    eigenvalue value (as a tuple).
+    """
+    rows = [[m[i][j] - (value if i == j else 0) for j in range(3)]
+            for i in range(3)]
+    # The eigenvector is orthogonal to all rows of m - value I, so it's
+    # the cross product of two of them; take the longest for precision
+    best, length = None, 0.0
+    for i, j in ((0, 1), (0, 2), (1, 2)):
+        a, b = rows[i], rows[j]
+        c = (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2],
+             a[0] * b[1] - a[1] * b[0])
+        l = c[0] * c[0] + c[1] * c[1] + c[2] * c[2]
+        if l > length:
+            best, length = c, l
+    scale = max(abs(x) for row in m for x in row)
+    if best is None or null(length / scale ** 4 if scale else 0):
+        # The eigenvalue is a double (or triple) one, any vector
+        # orthogonal to the remaining row will do
+        row = max(rows, key=lambda r: r[0] ** 2 + r[1] ** 2 + r[2] ** 2)
+        if null(max(abs(x) for x in row) / scale if scale else 0):
+            return (1.0, 0.0, 0.0)
+        axis = min(range(3), key=lambda i: abs(row[i]))
+        helper = [0, 0, 0]
+        helper[axis] = 1
+        best = (row[1] * helper[2] - row[2] * helper[1],
+                row[2] * helper[0] - row[0] * helper[2],
+                row[0] * helper[1] - row[1] * helper[0])
+        length = best[0] ** 2 + best[1] ** 2 + best[2] ** 2
+    length = math.sqrt(length)
+    return (best[0] / length, best[1] / length, best[2] / length)
+
+
+__all__ = ("LineFitter", "PlaneFitter")
@@ -0,0 +1,548 @@
+# -*- coding: utf-8 -*-
+"""Convex polyhedra: the convex hull of a point set, and the vertices
+of a region bounded by half-spaces.
+
+A half-space is given as a Plane whose normal points outwards, it
+contains the points x with (x - p) * n <= 0. The vertices are found
+through duality instead of intersecting every triple of planes: after
+moving an interior point c to the origin, the half-space n x <= h
+becomes the point n / h, and the facets of the convex hull of those
+points are exactly the vertices of the region. Half-spaces that don't
+touch the region end up inside the hull and drop out on their own.
+"""
+from __future__ import division
+import math
+from collections import namedtuple
+
+from . import calc
+from .plane import _sort_around, planes_from_coefficients
+from .point import Point
+from .solver import null
+
+#: The result of vertices(): the Points, for each half-space the indices
+#: of the vertices on it (counterclockwise seen from outside, empty if the
+#: half-space doesn't touch the region) and the edges as pairs of vertex
+#: indices
+Polyhedron = namedtuple("Polyhedron", ["points", "facets", "edges"])
+
+
+def _unit_halfspaces(halfspaces):
+    """Return (n, d) with unit normals n for the half-spaces n x <= d."""
+    result = []
+    for plane in halfspaces:
+        n = plane.n._v
+        length = math.sqrt(n[0] * n[0] + n[1] * n[1] + n[2] * n[2])
+        n = (n[0] / length, n[1] / length, n[2] / length)
+        result.append((n, n[0] * plane.p.x + n[1] * plane.p.y +
+                       n[2] * plane.p.z))
+    return result
+
+
+def chebyshev_center(halfspaces):
+    """Return (center, radius) of the largest ball inside the region
+    bounded by the half-spaces (Planes with outward normals). The radius
+    is negative if the region is empty. Raises ValueError if the region
+    is unbounded in a way that the ball can grow without limit.
+
+    This is the linear program: maximize r with n x + r <= d for the
+    unit normals n. It is solved through its dual (minimize d y with
+    sum(y n) = 0, sum(y) = 1, y >= 0), which only has four rows, so
+    every simplex step takes time linear in the number of half-spaces.
+    """
+    units = _unit_halfspaces(halfspaces)
+    count = len(units)
+    # The columns are y (count) and the artificial variables (4), which
+    # start as the basis; their columns hold the inverse of the basis
+    rows = [[n[k] for n, _ in units] + [1 if j == k else 0 for j in range(4)]
+            for k in range(3)]
+    rows.append([1] * count + [0, 0, 0, 1])
+    rhs = [0, 0, 0, 1]
+    basis = [count, count + 1, count + 2, count + 3]
+    columns = count + 4
+
+    def optimize(costs, allowed):
+        # The reduced costs of the current basis
+        reduced = list(costs)
+        for k, b in enumerate(basis):
+            if costs[b]:
+                for j in range(columns):
+                    reduced[j] -= costs[b] * rows[k][j]
+        bland = False
+        while True:
+            entering = None
+            if bland:
+                for j in range(allowed):
+                    if reduced[j] < -1e-12:
+                        entering = j
+                        break
+            else:
+                best = -1e-12
+                for j in range(allowed):
+                    if reduced[j] < best:
+                        entering, best = j, reduced[j]
+            if entering is None:
+                return True
+            leaving, ratio = None, None
+            for k in range(4):
+                a = rows[k][entering]
+                if a > 1e-12:
+                    r = rhs[k] / a
+                    if ratio is None or r < ratio or (
+                            r == ratio and basis[k] < basis[leaving]):
+                        leaving, ratio = k, r
+            if leaving is None:
+                return False
+            if ratio == 0:
+                # Degenerate step, Bland's rule from now on can't cycle
+                bland = True
+            _pivot(rows, rhs, leaving, entering)
+            factor = reduced[entering]
+            pivot_row = rows[leaving]
+            for j in range(columns):
+                reduced[j] -= factor * pivot_row[j]
+            basis[leaving] = entering
+
+    # Phase I: get rid of the artificial variables
+    optimize([0] * count + [1, 1, 1, 1], count)
+    if sum(rhs[k] for k, b in enumerate(basis) if b >= count) > 1e-9:
+        raise ValueError("The region is unbounded")
+    # Artificial variables that are still in the basis (at zero) are
+    # pivoted out if possible
+    for k, b in enumerate(basis):
+        if b >= count:
+            for j in range(count):
+                if abs(rows[k][j]) > 1e-9:
+                    _pivot(rows, rhs, k, j)
+                    basis[k] = j
+                    break
+    # Phase II
+    costs = [d for _, d in units] + [0, 0, 0, 0]
+    if not optimize(costs, count):
+        raise ValueError("The region is empty")
+    # The solution of the primal problem are the simplex multipliers
+    # costs_B * B^-1
+    x = [sum(costs[b] * rows[k][count + j] for k, b in enumerate(basis))
+         for j in range(4)]
+    return Point(x[0], x[1], x[2]), x[3]
+
+
+def _pivot(rows, rhs, k, j):
+    pivot_row = rows[k]
+    a = pivot_row[j]
+    rows[k] = pivot_row = [x / a for x in pivot_row]
+    rhs[k] = rhs[k] / a
+    for i, row in enumerate(rows):
+        if i != k and row[j]:
+            f = row[j]
+            rows[i] = [x - f * y for x, y in zip(row, pivot_row)]
+            rhs[i] -= f * rhs[k]
+
+
+def _quickhull(points):
+    """Return the faces of the convex hull of the points (coordinate
+    triples) as (i, j, k) index triples, counterclockwise seen from
+    outside, and their planes as (unit normal, offset). Points closer
+    than a tolerance to a face are treated as lying in it, so faces of
+    the hull can be split into several coplanar triangles.
+
+    Raises ValueError if all points lie in one plane.
+    """
+    count = len(points)
+    if count < 4:
+        raise ValueError("A hull needs at least 4 points, not {}"
+                         .format(count))
+    scale = max(max(abs(c) for c in p) for p in points) or 1.0
+    eps = 1e-10 * scale
+
+    def plane(i, j, k):
+        a, b, c = points[i], points[j], points[k]
+        u = (b[0] - a[0], b[1] - a[1], b[2] - a[2])
+        v = (c[0] - a[0], c[1] - a[1], c[2] - a[2])
+        n = (u[1] * v[2] - u[2] * v[1], u[2] * v[0] - u[0] * v[2],
+             u[0] * v[1] - u[1] * v[0])
+        length = math.sqrt(n[0] * n[0] + n[1] * n[1] + n[2] * n[2])
+        if not length:
+            return (0.0, 0.0, 0.0), 0.0
+        n = (n[0] / length, n[1] / length, n[2] / length)
+        return n, n[0] * a[0] + n[1] * a[1] + n[2] * a[2]
+
+    def height(p, face):
+        n, offset = planes[face]
+        return n[0] * p[0] + n[1] * p[1] + n[2] * p[2] - offset
+
+    # The initial tetrahedron: the two extreme points that are farthest
+    # apart, the point farthest from their line and the one farthest
+    # from the plane of those three
+    extremes = set()
+    for axis in range(3):
+        extremes.add(min(range(count), key=lambda i: points[i][axis]))
+        extremes.add(max(range(count), key=lambda i: points[i][axis]))
+    extremes = sorted(extremes)
+
+    def dist2(i, j):
+        a, b = points[i], points[j]
+        return ((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 +
+                (a[2] - b[2]) ** 2)
+    pairs = [(i, j) for i in extremes for j in extremes if i < j]
+    if not pairs:
+        raise ValueError("The points are all the same")
+    i0, i1 = max(pairs, key=lambda pair: dist2(*pair))
+    a, b = points[i0], points[i1]
+    d = (b[0] - a[0], b[1] - a[1], b[2] - a[2])
+
+    def line_dist2(i):
+        p = points[i]
+        w = (p[0] - a[0], p[1] - a[1], p[2] - a[2])
+        c = (w[1] * d[2] - w[2] * d[1], w[2] * d[0] - w[0] * d[2],
+             w[0] * d[1] - w[1] * d[0])
+        return c[0] * c[0] + c[1] * c[1] + c[2] * c[2]
+    i2 = max(range(count), key=line_dist2)
+    dd = d[0] * d[0] + d[1] * d[1] + d[2] * d[2]
+    if not dd or math.sqrt(line_dist2(i2) / dd) <= eps:
+        raise ValueError("The points are on one line")
+    n, offset = plane(i0, i1, i2)
+    i3 = max(range(count), key=lambda i: abs(
+        n[0] * points[i][0] + n[1] * points[i][1] + n[2] * points[i][2] -
+        offset))
+    p3 = points[i3]
+    if abs(n[0] * p3[0] + n[1] * p3[1] + n[2] * p3[2] - offset) <= eps:
+        raise ValueError("The points are in one plane")
+
+    faces = []
+    planes = []
+    # The points outside of each face, and the farthest one of them
+    outside = []
+    farthest = []
+    alive = []
+    # Directed edge (i, j) -> the face that has it (counterclockwise)
+    edges = {}
+
+    def add_face(i, j, k):
+        face = len(faces)
+        faces.append((i, j, k))
+        planes.append(plane(i, j, k))
+        outside.append([])
+        farthest.append((eps, None))
+        alive.append(True)
+        edges[i, j] = edges[j, k] = edges[k, i] = face
+        return face
+
+    tetrahedron = (i0, i1, i2, i3)
+    for skip in range(4):
+        i, j, k = [t for index, t in enumerate(tetrahedron) if index != skip]
+        other = points[tetrahedron[skip]]
+        n, offset = plane(i, j, k)
+        if n[0] * other[0] + n[1] * other[1] + n[2] * other[2] > offset:
+            i, j = j, i
+        add_face(i, j, k)
+
+    def assign(indices, candidates):
+        # Give each point to the first face that it is outside of; the
+        # plane equations are unpacked here since this is the hot loop
+        tests = [(planes[f][0][0], planes[f][0][1], planes[f][0][2],
+                  planes[f][1], f) for f in candidates]
+        for index in indices:
+            x, y, z = points[index]
+            for nx, ny, nz, offset, face in tests:
+                h = nx * x + ny * y + nz * z - offset
+                if h > eps:
+                    outside[face].append(index)
+                    if h > farthest[face][0]:
+                        farthest[face] = (h, index)
+                    break
+
+    corners = set(tetrahedron)
+    assign([i for i in range(count) if i not in corners], range(4))
+
+    pending = [face for face in range(4) if outside[face]]
+    while pending:
+        face = pending.pop()
+        if not alive[face] or not outside[face]:
+            continue
+        apex = farthest[face][1]
+        p = points[apex]
+        # The faces that the apex can see, and the horizon around them
+        visible = set([face])
+        hidden = set()
+        horizon = []
+        stack = [face]
+        while stack:
+            current = stack.pop()
+            i, j, k = faces[current]
+            for u, v in ((i, j), (j, k), (k, i)):
+                neighbour = edges[v, u]
+                if neighbour in visible:
+                    continue
+                if neighbour not in hidden and height(p, neighbour) > eps:
+                    visible.add(neighbour)
+                    stack.append(neighbour)
+                else:
+                    hidden.add(neighbour)
+                    horizon.append((u, v))
+        orphans = []
+        for current in visible:
+            alive[current] = False
+            orphans.extend(i for i in outside[current] if i != apex)
+            outside[current] = []
+            i, j, k = faces[current]
+            for edge in ((i, j), (j, k), (k, i)):
+                if edges.get(edge) == current:
+                    del edges[edge]
+        new_faces = [add_face(u, v, apex) for u, v in horizon]
+        assign(orphans, new_faces)
+        pending.extend(new for new in new_faces if outside[new])
+
+    return ([faces[f] for f in range(len(faces)) if alive[f]],
+            [planes[f] for f in range(len(faces)) if alive[f]])
+
+
+class Hull(object):
+    """The convex hull of a set of points, see convex_hull().
+
+    vertices are the Points on the hull, indices their positions in the
+    input, faces the triangles as index triples into vertices
+    (counterclockwise seen from outside) and planes the Plane of each
+    face, with the normal pointing outwards.
+    """
+    def __init__(self, vertices, indices, faces, planes, tolerance):
+        self.vertices = vertices
+        self.indices = indices
+        self.faces = faces
+        self.planes = planes
+        self.tolerance = tolerance
+        coords = [(p.x, p.y, p.z) for p in vertices]
+        self._box = ([min(p[axis] for p in coords) - tolerance
+                      for axis in range(3)],
+                     [max(p[axis] for p in coords) + tolerance
+                      for axis in range(3)])
+        # The mean of the vertices is inside, and seen from there every
+        # face covers a cone of directions. A point is inside of the
+        # hull if it's below the face whose cone it is in, which is
+        # found by walking from cone to cone, see contains()
+        count = len(coords)
+        self._center = c = (sum(p[0] for p in coords) / count,
+                            sum(p[1] for p in coords) / count,
+                            sum(p[2] for p in coords) / count)
+        owner = {}
+        for f, (i, j, k) in enumerate(faces):
+            owner[i, j] = owner[j, k] = owner[k, i] = f
+        self._cones = cones = []
+        for (i, j, k), plane in zip(faces, planes):
+            n = plane.n
+            cone = [n[0], n[1], n[2], n * plane.p.pv() + tolerance]
+            for u, v in ((i, j), (j, k), (k, i)):
+                a, b = coords[u], coords[v]
+                a = (a[0] - c[0], a[1] - c[1], a[2] - c[2])
+                b = (b[0] - c[0], b[1] - c[1], b[2] - c[2])
+                # The normal of the side of the cone through edge u, v,
+                # pointing into the cone
+                e = (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2],
+                     a[0] * b[1] - a[1] * b[0])
+                length = math.sqrt(e[0] * e[0] + e[1] * e[1] + e[2] * e[2])
+                cone.extend((e[0] / length, e[1] / length, e[2] / length,
+                             owner[v, u]))
+            cones.append(tuple(cone))
+        # The cone to start the walk from for each cell of a grid on the
+        # six sides of a cube around the center, so that walks are short
+        self._grid = grid = max(1, min(64, int(math.sqrt(len(faces) / 6))))
+        self._starts = starts = []
+        face = 0
+        for side in range(6):
+            for i in range(grid):
+                for j in range(grid):
+                    u = [0, 0, 0]
+                    u[side // 2] = 1 if side % 2 == 0 else -1
+                    u[(side // 2 + 1) % 3] = (2 * i + 1) / grid - 1
+                    u[(side // 2 + 2) % 3] = (2 * j + 1) / grid - 1
+                    face = self._locate(u[0], u[1], u[2], 0, face)
+                    if face is None:
+                        face = 0
+                    starts.append(face)
+
+    def __repr__(self):
+        return "Hull({} vertices, {} faces)".format(len(self.vertices),
+                                                     len(self.faces))
+
+    def __contains__(self, point):
+        return self.contains((point,))[0]
+
+    def _locate(self, ux, uy, uz, slack, face):
+        """Return the face whose cone contains the direction u (up to
+        slack), walking from the given face over the side that u is
+        farthest behind. The walk only gets shorter on a convex hull,
+        None (after as many steps as there are faces) only happens
+        through rounding.
+        """
+        cones = self._cones
+        for _ in range(len(cones)):
+            (_, _, _, _, e0x, e0y, e0z, n0, e1x, e1y, e1z, n1,
+             e2x, e2y, e2z, n2) = cones[face]
+            s0 = e0x * ux + e0y * uy + e0z * uz
+            s1 = e1x * ux + e1y * uy + e1z * uz
+            s2 = e2x * ux + e2y * uy + e2z * uz
+            if s0 >= slack and s1 >= slack and s2 >= slack:
+                return face
+            if s0 <= s1 and s0 <= s2:
+                face = n0
+            elif s1 <= s2:
+                face = n1
+            else:
+                face = n2
+        return None
+
+    def contains(self, points):
+        """Return a list that says for each of the points (Points or
+        coordinate triples) whether it is inside of the hull or on its
+        surface.
+        """
+        (x0, y0, z0), (x1, y1, z1) = self._box
+        cx, cy, cz = self._center
+        cones = self._cones
+        grid = self._grid
+        starts = self._starts
+        locate = self._locate
+        result = []
+        for p in points:
+            if type(p) is Point:
+                x, y, z = p.x, p.y, p.z
+            else:
+                x, y, z = p
+            # Most points far from the hull already fail the bounding box
+            if not (x0 <= x <= x1 and y0 <= y <= y1 and z0 <= z <= z1):
+                result.append(False)
+                continue
+            ux, uy, uz = x - cx, y - cy, z - cz
+            ax, ay, az = abs(ux), abs(uy), abs(uz)
+            # The grid cell of the direction u
+            if ax >= ay and ax >= az:
+                m, side, s, t = ax, 0 if ux > 0 else 1, uy, uz
+            elif ay >= az:
+                m, side, s, t = ay, 2 if uy > 0 else 3, uz, ux
+            else:
+                m, side, s, t = az, 4 if uz > 0 else 5, ux, uy
+            if not m:
+                # The center itself
+                result.append(True)
+                continue
+            i = min(int((s / m + 1) * grid / 2), grid - 1)
+            j = min(int((t / m + 1) * grid / 2), grid - 1)
+            # Directions through an edge or a vertex are in several cones,
+            # don't let rounding send the walk around in circles
+            face = locate(ux, uy, uz, -1e-12 * m,
+                          starts[(side * grid + i) * grid + j])
+            if face is None:
+                result.append(all(cone[0] * x + cone[1] * y +
+                                  cone[2] * z <= cone[3] for cone in cones))
+            else:
+                a, b, c, d = cones[face][:4]
+                result.append(a * x + b * y + c * z <= d)
+        return result
+
+
+def convex_hull(points):
+    """Return the convex Hull of the points (Points or coordinate
+    triples), computed with quickhull in expected O(n log n).
+
+    Duplicate points and points within a small tolerance of the hull
+    surface are not vertices, so a face of the hull that several input
+    points lie on can be split into coplanar triangles. Raises
+    ValueError for fewer than four points or if they don't span a
+    volume (all the same, on one line or in one plane).
+    """
+    coords = [(p.x, p.y, p.z) if type(p) is Point else tuple(p)
+              for p in points]
+    faces, planes = _quickhull(coords)
+    index = {}
+    for face in faces:
+        for i in face:
+            if i not in index:
+                index[i] = len(index)
+    indices = sorted(index, key=index.get)
+    scale = max(max(abs(c) for c in p) for p in coords) or 1.0
+    return Hull([Point(*coords[i]) for i in indices], indices,
+                [(index[i], index[j], index[k]) for i, j, k in faces],
+                planes_from_coefficients([n + (offset,)
+                                          for n, offset in planes]),
+                1e-10 * scale)
+
+
+def vertices(halfspaces):
+    """Return the vertices of the bounded convex region that the
+    half-spaces (Planes with outward normals) enclose, as a Polyhedron
+    (points, facets, edges). Raises ValueError if the region is empty,
+    unbounded or flat.
+    """
+    halfspaces = list(halfspaces)
+    if len(halfspaces) < 4:
+        raise ValueError("A bounded region needs at least 4 half-spaces, "
+                         "not {}".format(len(halfspaces)))
+    center, radius = chebyshev_center(halfspaces)
+    units = _unit_halfspaces(halfspaces)
+    size = max(abs(d) for _, d in units) or 1.0
+    if radius < -1e-10 * size:
+        raise ValueError("The region is empty")
+    elif radius <= 1e-10 * size:
+        raise ValueError("The region is flat, it has no interior")
+    c = (center.x, center.y, center.z)
+    dual = []
+    for n, d in units:
+        h = d - (n[0] * c[0] + n[1] * c[1] + n[2] * c[2])
+        dual.append((n[0] / h, n[1] / h, n[2] / h))
+    faces, planes = _quickhull(dual)
+    for n, offset in planes:
+        if offset <= 1e-10:
+            raise ValueError("The region is unbounded")
+
+    # Triangles of the same hull face belong to the same vertex, that's
+    # where more than three planes meet
+    group = list(range(len(faces)))
+
+    def find(f):
+        while group[f] != f:
+            group[f] = group[group[f]]
+            f = group[f]
+        return f
+    owner = {}
+    for f, (i, j, k) in enumerate(faces):
+        owner[i, j] = owner[j, k] = owner[k, i] = f
+    for f, (i, j, k) in enumerate(faces):
+        n, offset = planes[f]
+        for u, v in ((i, j), (j, k), (k, i)):
+            g = owner[v, u]
+            m, other = planes[g]
+            if (null(1 - (n[0] * m[0] + n[1] * m[1] + n[2] * m[2])) and
+                    null((offset - other) / offset)):
+                group[find(f)] = find(g)
+
+    index = {}
+    points = []
+    facets = [set() for _ in halfspaces]
+    for f, (i, j, k) in enumerate(faces):
+        root = find(f)
+        if root not in index:
+            index[root] = len(points)
+            # The vertex is where the three half-spaces meet
+            points.append(calc.intersection(halfspaces[i], halfspaces[j],
+                                            halfspaces[k]))
+        for h in (i, j, k):
+            facets[h].add(index[root])
+    edges = set()
+    for f, (i, j, k) in enumerate(faces):
+        for u, v in ((i, j), (j, k), (k, i)):
+            a, b = index[find(f)], index[find(owner[v, u])]
+            if a != b:
+                edges.add((min(a, b), max(a, b)))
+
+    ordered = []
+    for h, facet in enumerate(facets):
+        facet = sorted(facet)
+        if len(facet) >= 3:
+            coords = _sort_around([tuple(points[v]) + (v,) for v in facet],
+                                  halfspaces[h].n._v)
+            facet = [v[3] for v in coords]
+        ordered.append(facet)
+    return Polyhedron(points, ordered, sorted(edges))
+
+
+__all__ = ("chebyshev_center", "convex_hull", "vertices", "Hull",
+           "Polyhedron")
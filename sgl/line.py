@@ -1,10 +1,20 @@
 # -*- coding: utf-8 -*-
+from __future__ import division
 from .body import GeoBody
 from .point import Point
 from .vector import Vector
 
 class Line(GeoBody):
     """Provides a line in 3d space"""
+    @classmethod
+    def fit(cls, points):
+        """Returns the line that fits the given points (Points or
+        coordinate triples) best, in the least-squares sense. See
+        sgl.fit.LineFitter for fitting in chunks.
+        """
+        from .fit import LineFitter
+        return LineFitter(points).line()
+
     def __init__(self, a, b):
         """Line(Point, Point):
         A Line going through both given points.
@@ -51,56 +61,90 @@ class Line(GeoBody):
         """
         return (self.sv, self.dv)
 
-    def draw(self, renderer, box, color=(0, 0, 1)):
-        """Draw the plane on the given renderer (vtk). box should have
-        the shape ((minx, miny, minz), (maxx, maxy, maxz)) and it
-        defines the cuboid in which the plane should be drawn.
+    def clip(self, box):
+        """Clip the line to the cuboid box, given as ((minx, miny, minz),
+        (maxx, maxy, maxz)).
+
+        Returns (t0, t1, A, B), where [t0, t1] is the parameter interval
+        of the part inside the box and A, B are the points for t0 and
+        t1, or None if the line misses the box.
+        """
+        return clip_lines((self,), box)[0]
+
+    def collect(self, batch, box, color=(0, 0, 1)):
+        """Add the part of the line inside of box to the given
+        sgl.draw.Batch. box should have the shape ((minx, miny, minz),
+        (maxx, maxy, maxz)).
 
         color defaults to blue.
         """
-        from .plane import Plane
-        min_, max_ = box
-        # Define the boundary planes
-        boundaries = [
-            Plane(Point(max_[0], 0, 0), Vector(1, 0, 0)),
-            Plane(Point(min_[0], 0, 0), Vector(1, 0, 0)),
-            Plane(Point(0, max_[1], 0), Vector(0, 1, 0)),
-            Plane(Point(0, min_[1], 0), Vector(0, 1, 0)),
-            Plane(Point(0, 0, max_[2]), Vector(0, 0, 1)),
-            Plane(Point(0, 0, min_[2]), Vector(0, 0, 1)),
-        ]
-        intersections = filter(None, map(self.intersection, boundaries))
-        # If a line is a subset of a plane, we get Lines as results. We
-        # need to remove them or they will fuck everything up.
-        intersections = filter(lambda x: not isinstance(x, Line),
-                intersections)
-        # Filter out the out-of-bounds points and remove duplicates
-        def in_bounds(point):
-            return (
-                min_[0] <= point.x <= max_[0] and
-                min_[1] <= point.y <= max_[1] and
-                min_[2] <= point.z <= max_[2]
-            )
-        intersections = list(set(filter(in_bounds, intersections)))
-        # If everything went right, we will have 2 points left
-        if len(intersections) != 2:
-            # This happens if the line has no part within the given
-            # cuboid (or it just touches a corner)
-            return
-        A, B = intersections
-
-        import vtk
-        source = vtk.vtkLineSource()
-        # Coordinate axes are labelled differently in maths and 3d
-        # graphics programming
-        source.SetPoint1(A.y, A.z, A.x)
-        source.SetPoint2(B.y, B.z, B.x)
-        mapper = vtk.vtkPolyDataMapper()
-        mapper.SetInput(source.GetOutput())
-        actor = vtk.vtkActor()
-        actor.SetMapper(mapper)
-        actor.GetProperty().SetColor(*color)
-        renderer.AddActor(actor)
-
-
-__all__ = ("Line",)
+        clipped = self.clip(box)
+        # A line that only touches an edge or a corner has nothing to
+        # draw
+        if clipped is not None and clipped[0] != clipped[1]:
+            batch.add_segment(clipped[2], clipped[3], color)
+
+    def draw(self, renderer, box, color=(0, 0, 1)):
+        """Draw the line on the given renderer (vtk). See collect() for
+        the arguments.
+        """
+        from .draw import Batch
+        batch = Batch()
+        self.collect(batch, box, color=color)
+        batch.render(renderer)
+
+
+def clip_parameters(s, d, box):
+    """Clip the line x = s + t*d to the cuboid box using the slab
+    method and return the parameter interval (t0, t1) inside the box,
+    or None if the line misses it.
+
+    The line is inside the box for t in the intersection of the three
+    intervals in which it is between the two planes (slabs) of each
+    axis.
+    """
+    min_, max_ = box
+    t0 = t1 = None
+    for i in (0, 1, 2):
+        si, di = s[i], d[i]
+        if di == 0:
+            # Parallel to the slab, either always inside or never
+            if not min_[i] <= si <= max_[i]:
+                return None
+            continue
+        ta = (min_[i] - si) / di
+        tb = (max_[i] - si) / di
+        if ta > tb:
+            ta, tb = tb, ta
+        if t0 is None or ta > t0:
+            t0 = ta
+        if t1 is None or tb < t1:
+            t1 = tb
+        if t0 > t1:
+            return None
+    return t0, t1
+
+
+def clip_lines(lines, box):
+    """Clip all given lines to the cuboid box at once. Returns a list
+    with the result of Line.clip(box) for each line.
+    """
+    results = []
+    for line in lines:
+        s, d = line.sv._v, line.dv._v
+        interval = clip_parameters(s, d, box)
+        if interval is None:
+            results.append(None)
+            continue
+        t0, t1 = interval
+        # Building the points from the coordinates saves the temporary
+        # vectors of s + t*d
+        results.append((
+            t0, t1,
+            Point(s[0] + t0 * d[0], s[1] + t0 * d[1], s[2] + t0 * d[2]),
+            Point(s[0] + t1 * d[0], s[1] + t1 * d[1], s[2] + t1 * d[2]),
+        ))
+    return results
+
+
+__all__ = ("Line", "clip_lines")
@@ -1,11 +1,22 @@
 # -*- coding: utf-8 -*-
+from __future__ import division
+import math
 from .body import GeoBody
+from .line import Line
 from .point import Point
-from .solver import solve
 from .vector import Vector
 
 class Plane(GeoBody):
     """A Plane (not the flying one)"""
+    @classmethod
+    def fit(cls, points):
+        """Returns the plane that fits the given points (Points or
+        coordinate triples) best, in the least-squares sense. See
+        sgl.fit.PlaneFitter for fitting in chunks.
+        """
+        from .fit import PlaneFitter
+        return PlaneFitter(points).plane()
+
     def __init__(self, *args):
         """Plane(Point, Point, Point):
         Initialise a plane going through the three given points.
@@ -26,7 +37,7 @@ class Plane(GeoBody):
             a, b, c = args
             if (isinstance(a, Point) and
                 isinstance(b, Point) and
-                isinstance(b, Point)):
+                isinstance(c, Point)):
                 # for three points we just calculate the vectors AB
                 # and AC and continue like we were given two vectors
                 # instead
@@ -36,6 +47,9 @@ class Plane(GeoBody):
                   isinstance(b, Vector) and
                   isinstance(c, Vector)):
                 vab, vac = b, c
+            else:
+                raise TypeError("Plane() takes three Points or a Point and "
+                                "two Vectors")
             # We need a vector orthogonal to the two given ones so we
             # (the length doesn't matter) so we just use the cross
             # product
@@ -45,9 +59,14 @@ class Plane(GeoBody):
             self._init_pn(*args)
         elif len(args) == 4:
             self._init_gf(*args)
-    
+        else:
+            raise TypeError("Plane() takes two, three or four arguments, "
+                            "not {}".format(len(args)))
+
     def _init_pn(self, p, normale):
         """Initialise a plane given in the point normal form."""
+        if not (normale[0] or normale[1] or normale[2]):
+            raise ValueError("Invalid Plane, normal Vector(0 | 0 | 0)")
         self.p = p
         self.n = normale
 
@@ -55,11 +74,15 @@ class Plane(GeoBody):
         """Initialise a plane given in the general form."""
         # We need
         # 1) a normal vector -> given by (a, b, c)
-        # 2) a point on the plane -> solve the equation and chose a
-        #    "random" point
-        solution = solve([[a, b, c, d]])
+        # 2) a point on the plane -> the one closest to the origin is
+        #    a multiple of the normal, t n. Inserted into the equation
+        #    t (n * n) = d, so t = d / |n|²
+        nn = a * a + b * b + c * c
+        if not nn:
+            raise ValueError("Invalid Plane, normal Vector(0 | 0 | 0)")
+        t = d / nn
         self.n = Vector(a, b, c)
-        self.p = Point(*solution(1, 1))
+        self.p = Point(t * a, t * b, t * c)
 
     def __eq__(self, other):
         """Checks if two planes are equal. Two planes can be equal even
@@ -71,7 +94,6 @@ class Plane(GeoBody):
         """Checks if a Point lies on the Plane or a Line is a subset of
         the plane.
         """
-        from .line import Line
         if isinstance(other, Point):
             return other.pv() * self.n == self.p.pv() * self.n
         elif isinstance(other, Line):
@@ -112,108 +134,156 @@ class Plane(GeoBody):
            _   _    _    _ 
         E: x = u + rv + sw ; (r, s) e R
 
-        to describe the plane (a point and two vectors).
+        to describe the plane (a point and two vectors). v and w are
+        orthonormal, and v × w points in the direction of the normal.
         """
-        s = solve([list(self.n) + [0]])
-        # Pick a first vector orthogonal to the normal vector
-        # there are infinitely many solutions, varying in direction
-        # and length, so just choose some values
-        v = Vector(*s(1, 1))
-        assert v.orthogonal(self.n)
-        # Pick a second vector orthogonal to the normal vector and
-        # orthogonal to the first vector (v)
-        # again, there are infinitely many solutions, varying in length
-        s = solve([
-            list(self.n) + [0],
-            list(v) + [0],
-        ])
-        w = Vector(*s(1))
-        return (self.p.pv(), v, w)
+        v, w = _basis(self.n._v)
+        return (self.p.pv(), Vector(v), Vector(w))
 
-    def draw(self, renderer, box, color=(1, 1, 0), draw_normal=True):
-        """Draw the plane on the given renderer (vtk).
+    def clip(self, box):
+        """Return the polygon where the plane cuts through the cuboid
+        box (as ((minx, miny, minz), (maxx, maxy, maxz))), as a list of
+        Points in counterclockwise order around the normal. The list is
+        empty if the plane misses the box and has fewer than three
+        points if it only touches an edge or a corner.
+        """
+        return clip_planes((self,), box)[0]
+
+    def collect(self, batch, box, color=(1, 1, 0), draw_normal=True):
+        """Add the part of the plane inside of box to the given
+        sgl.draw.Batch.
 
         color defaults to yellow.
         draw_normal defaults to True.
         """
-        from .line import Line
-        from .calc import distance
-        min_, max_ = box
-        # Define the 12 edges of the cuboid that is visible. We define
-        # it as 12 (infinitely long) lines and later discard any points
-        # outside of the cuboid.
-        boundaries = [
-            Line(Point(max_[0], max_[1], 0), Vector(0, 0, 1)),
-            Line(Point(max_[0], 0, min_[2]), Vector(0, 1, 0)),
-            Line(Point(max_[0], 0, max_[2]), Vector(0, 1, 0)),
-            Line(Point(max_[0], min_[1], 0), Vector(0, 0, 1)),
-            Line(Point(0, min_[1], min_[2]), Vector(1, 0, 0)),
-            Line(Point(0, min_[1], max_[2]), Vector(1, 0, 0)),
-            Line(Point(min_[0], min_[0], 0), Vector(0, 0, 1)),
-            Line(Point(min_[0], 0, max_[2]), Vector(0, 1, 0)),
-            Line(Point(min_[0], 0, min_[2]), Vector(0, 1, 0)),
-            Line(Point(min_[0], max_[1], 0), Vector(0, 0, 1)),
-            Line(Point(0, max_[1], max_[2]), Vector(1, 0, 0)),
-            Line(Point(0, max_[1], min_[2]), Vector(1, 0, 0)),
-        ]
-        intersections = filter(None, map(self.intersection, boundaries))
-        # If a line is a subset of a plane, we will get back a Line as
-        # intersection. We need to filter those out, otherwise they
-        # will break everything
-        intersections = filter(lambda x: not isinstance(x, Line),
-                intersections)
-        # Remove duplicates
-        intersections = list(set(intersections))
-
-        # Filter out any out of bounds intersections
-        def in_bounds(point):
-            # intersect is actually (num, point)
-            return (
-                # <3 Python's comparison operator
-                min_[0] <= point.x <= max_[0] and
-                min_[1] <= point.y <= max_[1] and
-                min_[2] <= point.z <= max_[2]
-            )
-        intersections = list(filter(in_bounds, intersections))
-        polygon = [intersections.pop()]
-        while intersections:
-            last = polygon[-1]
-            distances = [distance(last, x) for x in intersections]
-            # We're only interested in the index of the next point,
-            # this min function returns the minimum (index, distance)
-            # tuple...
-            successor = min(enumerate(distances), key=lambda x: x[1])
-            # ...but we only need the index :)
-            successor = successor[0]
-            polygon.append(intersections.pop(successor))
-        
-        # Please don't ask me what all this stuff is for
-        import vtk
-        points = vtk.vtkPoints()
-        for point in polygon:
-            # The axes are labelled differently in maths and 3d
-            # graphic programming
-            points.InsertNextPoint(point.y, point.z, point.x)
-        poly = vtk.vtkPolygon()
-        poly.GetPointIds().SetNumberOfIds(len(polygon))
-        for i in range(len(polygon)):
-            poly.GetPointIds().SetId(i, i)
-        polys = vtk.vtkCellArray()
-        polys.InsertNextCell(poly)
-        data = vtk.vtkPolyData()
-        data.SetPoints(points)
-        data.SetPolys(polys)
-        mapper = vtk.vtkPolyDataMapper()
-        mapper.SetInput(data)
-        actor = vtk.vtkActor()
-        actor.SetMapper(mapper)
-        # Yellow planes
-        actor.GetProperty().SetColor(*color)
-        renderer.AddActor(actor)
+        polygon = self.clip(box)
+        if len(polygon) >= 3:
+            batch.add_polygon(polygon, color)
 
         # Draw the normal
         if draw_normal:
-            self.n.draw(renderer, None, origin=self.p)
+            self.n.collect(batch, None, origin=self.p)
+
+    def draw(self, renderer, box, color=(1, 1, 0), draw_normal=True):
+        """Draw the plane on the given renderer (vtk). See collect() for
+        the arguments.
+        """
+        from .draw import Batch
+        batch = Batch()
+        self.collect(batch, box, color=color, draw_normal=draw_normal)
+        batch.render(renderer)
+
+
+def _box_edges():
+    """The 12 edges of a cuboid as pairs of corner indices. Bit i of
+    a corner index says whether the corner has the minimum (0) or the
+    maximum (1) coordinate on axis i.
+    """
+    return [(c, c | bit) for bit in (1, 2, 4) for c in range(8)
+            if not c & bit]
+
+BOX_EDGES = _box_edges()
+
+
+def clip_planes(planes, box):
+    """Return [plane.clip(box) for plane in planes], sharing the work
+    that only depends on the box.
+
+    The polygon vertices are where the plane crosses the edges of the
+    box, found by the sign change of n*x - d between the two corners
+    of each edge. The cross-section of a convex cuboid is convex, so
+    sorting the vertices by their angle around the centroid (in a 2D
+    frame of the plane) gives the polygon.
+    """
+    min_, max_ = box
+    corners = [(max_[0] if c & 1 else min_[0],
+                max_[1] if c & 2 else min_[1],
+                max_[2] if c & 4 else min_[2]) for c in range(8)]
+    polygons = []
+    for plane in planes:
+        n = plane.n._v
+        d = n[0] * plane.p.x + n[1] * plane.p.y + n[2] * plane.p.z
+        f = [n[0] * x + n[1] * y + n[2] * z - d for x, y, z in corners]
+        # Corners on the plane are shared by several edges, collect
+        # them by index to get each one only once
+        on_plane = set(c for c in range(8) if f[c] == 0)
+        vertices = [corners[c] for c in sorted(on_plane)]
+        for a, b in BOX_EDGES:
+            if f[a] * f[b] < 0:
+                t = f[a] / (f[a] - f[b])
+                ca, cb = corners[a], corners[b]
+                vertices.append((ca[0] + t * (cb[0] - ca[0]),
+                                 ca[1] + t * (cb[1] - ca[1]),
+                                 ca[2] + t * (cb[2] - ca[2])))
+        if len(vertices) >= 3:
+            vertices = _sort_around(vertices, n)
+        polygons.append([Point(*v) for v in vertices])
+    return polygons
+
+
+def _basis(n):
+    """Return two orthonormal vectors (as tuples) that are orthogonal to
+    n, so that n, u, v are right-handed.
+    """
+    # Use the axis that is "most orthogonal" to n as helper, so the
+    # cross product can't get close to zero
+    axis = min(range(3), key=lambda i: abs(n[i]))
+    helper = [0, 0, 0]
+    helper[axis] = 1
+    u = (n[1] * helper[2] - n[2] * helper[1],
+         n[2] * helper[0] - n[0] * helper[2],
+         n[0] * helper[1] - n[1] * helper[0])
+    lu = math.sqrt(u[0] * u[0] + u[1] * u[1] + u[2] * u[2])
+    u = (u[0] / lu, u[1] / lu, u[2] / lu)
+    ln = math.sqrt(n[0] * n[0] + n[1] * n[1] + n[2] * n[2])
+    v = ((n[1] * u[2] - n[2] * u[1]) / ln,
+         (n[2] * u[0] - n[0] * u[2]) / ln,
+         (n[0] * u[1] - n[1] * u[0]) / ln)
+    return u, v
+
+
+def _sort_around(vertices, n):
+    """Sort coplanar vertices counterclockwise around the normal n."""
+    # u and v span the plane
+    u, v = _basis(n)
+    count = len(vertices)
+    cx = sum(p[0] for p in vertices) / count
+    cy = sum(p[1] for p in vertices) / count
+    cz = sum(p[2] for p in vertices) / count
+
+    def angle(p):
+        dx, dy, dz = p[0] - cx, p[1] - cy, p[2] - cz
+        return math.atan2(dx * v[0] + dy * v[1] + dz * v[2],
+                          dx * u[0] + dy * u[1] + dz * u[2])
+    return sorted(vertices, key=angle)
+
+
+def planes_from_coefficients(rows):
+    """Return [Plane(a, b, c, d) for a, b, c, d in rows], for building
+    many planes from the general form at once. Rows of floats skip the
+    type unification of the Point and Vector constructors, which is
+    most of the work for a single Plane.
+    """
+    planes = []
+    new = object.__new__
+    for row in rows:
+        a, b, c, d = row
+        if not (type(a) is float and type(b) is float and
+                type(c) is float and type(d) is float):
+            planes.append(Plane(a, b, c, d))
+            continue
+        nn = a * a + b * b + c * c
+        if not nn:
+            raise ValueError("Invalid Plane, normal Vector(0 | 0 | 0)")
+        t = d / nn
+        n = new(Vector)
+        n._v = [a, b, c]
+        p = new(Point)
+        p.x, p.y, p.z = t * a, t * b, t * c
+        plane = new(Plane)
+        plane.p, plane.n = p, n
+        planes.append(plane)
+    return planes
 
 
-__all__ = ("Plane",)
+__all__ = ("Plane", "clip_planes", "planes_from_coefficients")
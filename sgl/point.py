@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 from .util import unify_types
+from .vector import Vector
+
+
 class Point(object):
     """Provides a basic Point in the 3D space"""
     @classmethod
@@ -52,16 +55,15 @@ class Point(object):
 
     def pv(self):
         """Return the position vector of the point."""
-        from .vector import Vector
         return Vector(self.x, self.y, self.z)
 
     def moved(self, v):
         """Return the point that you get when you move self by vector v."""
         return Point(self.pv() + v)
 
-    def draw(self, renderer, box, color=(1, 0, 1), radius=0.2):
-        """Draws the point, represented by a little sphere, on the
-        given renderer (vtk).
+    def collect(self, batch, box, color=(1, 0, 1), radius=0.2):
+        """Add the point, represented by a little sphere, to the given
+        sgl.draw.Batch.
 
         The box argument is ignored. You have to make sure that the
         point is inside the cuboid by yourself.
@@ -69,16 +71,16 @@ class Point(object):
         color defaults to a pinkish one.
         radius defaults to 0.2.
         """
-        import vtk
-        source = vtk.vtkSphereSource()
-        source.SetCenter(self.y, self.z, self.x)
-        source.SetRadius(radius)
-        mapper = vtk.vtkPolyDataMapper()
-        mapper.SetInput(source.GetOutput())
-        actor = vtk.vtkActor()
-        actor.SetMapper(mapper)
-        actor.GetProperty().SetColor(*color)
-        renderer.AddActor(actor)
+        batch.add_point(self, color, radius)
+
+    def draw(self, renderer, box, color=(1, 0, 1), radius=0.2):
+        """Draws the point, represented by a little sphere, on the
+        given renderer (vtk). See collect() for the arguments.
+        """
+        from .draw import Batch
+        batch = Batch()
+        self.collect(batch, box, color=color, radius=radius)
+        batch.render(renderer)
 
 
 __all__ = ("Point",)
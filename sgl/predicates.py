@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""Orientation predicates that always give the exact answer.
+
+Each predicate is first evaluated with plain floats, together with a
+bound on the rounding error (as in J. R. Shewchuk, "Adaptive Precision
+Floating-Point Arithmetic and Fast Robust Geometric Predicates"). Only
+if the float result is smaller than that bound, so that its sign can't
+be trusted, it is evaluated again exactly. For most inputs that never
+happens, so the predicates run at nearly float speed.
+
+Shewchuk's intermediate stages (the expansion arithmetic between the
+float filter and the exact result) are left out. Instead, the exact
+stage scales all coordinates to integers (every float is an integer
+times a power of two) and uses Python's unlimited integers, which is
+a lot faster than Fractions.
+
+The coordinates have to be finite, inf and nan raise ValueError.
+"""
+from fractions import Fraction
+try:
+    from math import gcd
+except ImportError:
+    from fractions import gcd
+from .plane import Plane
+from .point import Point
+from .triangle import Triangle
+from .vector import Vector
+
+#: The machine epsilon of the float arithmetic, 2^-53
+EPSILON = 2.0 ** -53
+
+# Relative error bounds of the float evaluations, see Shewchuk's paper
+_DET2_BOUND = (3 + 16 * EPSILON) * EPSILON
+_DET3_BOUND = (7 + 56 * EPSILON) * EPSILON
+_DOT3_BOUND = (5 + 64 * EPSILON) * EPSILON
+
+# Integers up to this size are exactly representable as floats
+_MAX_EXACT_INT = 2 ** 53
+
+
+def _coords(p):
+    """The coordinates of a Point, Vector or sequence as a tuple."""
+    if isinstance(p, Point):
+        return p.x, p.y, p.z
+    elif isinstance(p, Vector):
+        return tuple(p._v)
+    return tuple(p)
+
+
+def _floats(coords):
+    """Return the coordinates as a list of floats if this is exact, or
+    None if the float filter can't be used for them.
+    """
+    result = []
+    for x in coords:
+        if type(x) is float:
+            if x - x != 0:
+                # inf or nan
+                return None
+            result.append(x)
+        elif type(x) is int and -_MAX_EXACT_INT <= x <= _MAX_EXACT_INT:
+            result.append(float(x))
+        else:
+            return None
+    return result
+
+
+def _integers(coords):
+    """Return the coordinates multiplied by a common positive factor,
+    so that they are all integers. This doesn't change the sign of any
+    of the (homogeneous) predicates.
+    """
+    ratios = []
+    for x in coords:
+        if type(x) is float:
+            if x - x != 0:
+                raise ValueError("The coordinates have to be finite, not {}"
+                                 .format(x))
+            ratios.append(x.as_integer_ratio())
+        else:
+            x = Fraction(x)
+            ratios.append((x.numerator, x.denominator))
+    lcm = 1
+    for _, den in ratios:
+        lcm = lcm * den // gcd(lcm, den)
+    return [num * (lcm // den) for num, den in ratios]
+
+
+def _sign(x):
+    return (x > 0) - (x < 0)
+
+
+def _det3_sign(p0, q0, p1, q1, p2, q2):
+    """Return the sign of the determinant of the rows p0 - q0, p1 - q1
+    and p2 - q2.
+    """
+    p0, q0, p1, q1, p2, q2 = (_coords(p0), _coords(q0), _coords(p1),
+                              _coords(q1), _coords(p2), _coords(q2))
+    coords = _floats(p0 + q0 + p1 + q1 + p2 + q2)
+    if coords is not None:
+        ax, ay, az = coords[0] - coords[3], coords[1] - coords[4], \
+            coords[2] - coords[5]
+        bx, by, bz = coords[6] - coords[9], coords[7] - coords[10], \
+            coords[8] - coords[11]
+        cx, cy, cz = coords[12] - coords[15], coords[13] - coords[16], \
+            coords[14] - coords[17]
+        bycz, bzcy = by * cz, bz * cy
+        bzcx, bxcz = bz * cx, bx * cz
+        bxcy, bycx = bx * cy, by * cx
+        det = ax * (bycz - bzcy) + ay * (bzcx - bxcz) + az * (bxcy - bycx)
+        permanent = (abs(ax) * (abs(bycz) + abs(bzcy)) +
+                     abs(ay) * (abs(bzcx) + abs(bxcz)) +
+                     abs(az) * (abs(bxcy) + abs(bycx)))
+        if abs(det) > _DET3_BOUND * permanent:
+            return _sign(det)
+    # Exact evaluation
+    coords = _integers(p0 + q0 + p1 + q1 + p2 + q2)
+    a = [coords[i] - coords[i + 3] for i in (0, 1, 2)]
+    b = [coords[i] - coords[i + 3] for i in (6, 7, 8)]
+    c = [coords[i] - coords[i + 3] for i in (12, 13, 14)]
+    return _sign(a[0] * (b[1] * c[2] - b[2] * c[1]) +
+                 a[1] * (b[2] * c[0] - b[0] * c[2]) +
+                 a[2] * (b[0] * c[1] - b[1] * c[0]))
+
+
+def _det2_sign(a, b, c, d):
+    """Return the sign of a*d - b*c."""
+    coords = _floats((a, b, c, d))
+    if coords is not None:
+        a, b, c, d = coords
+        ad, bc = a * d, b * c
+        det = ad - bc
+        if abs(det) > _DET2_BOUND * (abs(ad) + abs(bc)):
+            return _sign(det)
+    a, b, c, d = _integers((a, b, c, d))
+    return _sign(a * d - b * c)
+
+
+def _dot3_sign(n, p, q):
+    """Return the sign of n * (p - q)."""
+    n, p, q = _coords(n), _coords(p), _coords(q)
+    coords = _floats(n + p + q)
+    if coords is not None:
+        t0 = coords[0] * (coords[3] - coords[6])
+        t1 = coords[1] * (coords[4] - coords[7])
+        t2 = coords[2] * (coords[5] - coords[8])
+        result = t0 + t1 + t2
+        if abs(result) > _DOT3_BOUND * (abs(t0) + abs(t1) + abs(t2)):
+            return _sign(result)
+    # n and p - q scale independently, so the factor is still positive
+    n = _integers(n)
+    coords = _integers(p + q)
+    return _sign(sum(n[i] * (coords[i] - coords[i + 3]) for i in (0, 1, 2)))
+
+
+def orient3d(a, b, c, d):
+    """Return the orientation of the point d relative to the plane
+    through the points a, b and c:
+    +1 if d is on the side that the normal (b - a) x (c - a) points to
+       (a, b, c appear counterclockwise when seen from d),
+    -1 if it is on the other side,
+     0 if the four points are coplanar.
+
+    Note that this is the opposite sign of Shewchuk's orient3d.
+    """
+    # (b - a) x (c - a) * (d - a) = det(d - a, b - a, c - a)
+    return _det3_sign(d, a, b, a, c, a)
+
+
+def coplanar(a, b, c, d):
+    """Checks if the four points lie in one plane."""
+    return orient3d(a, b, c, d) == 0
+
+
+def plane_side(plane, point):
+    """Return on which side of the plane the point lies: +1 if it is on
+    the side that the normal points to, -1 for the other side and 0 if
+    it is on the plane.
+
+    The plane can also be given as a Triangle, then the answer is exact
+    with respect to its corners.
+    """
+    if isinstance(plane, Triangle):
+        return orient3d(plane.a, plane.b, plane.c, point)
+    elif isinstance(plane, Plane):
+        return _dot3_sign(plane.n, point, plane.p)
+    raise TypeError("plane_side() needs a Plane or Triangle, not {!r}"
+                    .format(plane))
+
+
+def lines_intersect(a, b):
+    """Checks if the lines a and b intersect in exactly one point, that
+    is if they are coplanar, but not parallel.
+    """
+    u, v = a.dv, b.dv
+    parallel = (_det2_sign(u[1], u[2], v[1], v[2]) == 0 and
+                _det2_sign(u[2], u[0], v[2], v[0]) == 0 and
+                _det2_sign(u[0], u[1], v[0], v[1]) == 0)
+    if parallel:
+        return False
+    # Coplanar if (s_b - s_a) * (u x v) = det(s_b - s_a, u, v) is 0
+    zero = (0, 0, 0)
+    return _det3_sign(b.sv, a.sv, u, zero, v, zero) == 0
+
+
+__all__ = ("orient3d", "coplanar", "plane_side", "lines_intersect")
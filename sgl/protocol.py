@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""The JSON representation of bodies and queries, used by sgl.serve.
+
+A body is an object with a "type" and its coordinates:
+
+    {"type": "Point", "coords": [1, 2, 3]}
+    {"type": "Vector", "coords": [1, 0, 0]}
+    {"type": "Line", "sv": [0, 0, 0], "dv": [1, 0, 0]}   (also Ray, Segment)
+    {"type": "Plane", "p": [0, 0, 0], "n": [0, 0, 1]}
+    {"type": "Triangle", "corners": [[0, 0, 0], [1, 0, 0], [0, 1, 0]]}
+
+A query is {"id": ..., "op": "distance", "args": [body, body]}, and its
+response is {"id": ..., "result": ...} or {"id": ..., "error": "..."}.
+"""
+import json
+
+from . import calc
+from .line import Line
+from .plane import Plane
+from .point import Point
+from .ray import Ray
+from .segment import Segment
+from .triangle import Triangle
+from .vector import Vector
+
+#: The calc functions that can be queried
+OPERATIONS = ("distance", "intersection", "angle", "parallel", "orthogonal")
+
+
+class ProtocolError(ValueError):
+    """Raised for queries that are not valid."""
+
+
+def _triple(value):
+    if not isinstance(value, list) or len(value) != 3:
+        raise ProtocolError("Expected a list of three coordinates, not {!r}"
+                            .format(value))
+    return value
+
+
+def _field(data, name):
+    try:
+        return _triple(data[name])
+    except KeyError:
+        raise ProtocolError("{} needs {!r}".format(data.get("type"), name))
+
+
+def encode_body(body):
+    """Return the JSON-compatible dict for a body."""
+    if isinstance(body, Point):
+        return {"type": "Point", "coords": [body.x, body.y, body.z]}
+    elif isinstance(body, Vector):
+        return {"type": "Vector", "coords": list(body)}
+    elif isinstance(body, (Line, Ray, Segment)):
+        return {"type": type(body).__name__, "sv": list(body.sv),
+                "dv": list(body.dv)}
+    elif isinstance(body, Plane):
+        return {"type": "Plane", "p": list(body.p), "n": list(body.n)}
+    elif isinstance(body, Triangle):
+        return {"type": "Triangle", "corners": [list(p) for p in body]}
+    raise TypeError("Can't encode {!r}".format(body))
+
+
+def decode_body(data):
+    """Return the body for a dict created by encode_body()."""
+    if not isinstance(data, dict):
+        raise ProtocolError("Expected a body, not {!r}".format(data))
+    kind = data.get("type")
+    try:
+        if kind == "Point":
+            return Point(_field(data, "coords"))
+        elif kind == "Vector":
+            return Vector(_field(data, "coords"))
+        elif kind in ("Line", "Ray", "Segment"):
+            cls = {"Line": Line, "Ray": Ray, "Segment": Segment}[kind]
+            return cls(Vector(_field(data, "sv")), Vector(_field(data, "dv")))
+        elif kind == "Plane":
+            return Plane(Point(_field(data, "p")), Vector(_field(data, "n")))
+        elif kind == "Triangle":
+            corners = data.get("corners")
+            if not isinstance(corners, list) or len(corners) != 3:
+                raise ProtocolError("Triangle needs three 'corners'")
+            return Triangle(*[Point(_triple(c)) for c in corners])
+    except (TypeError, ValueError) as e:
+        if isinstance(e, ProtocolError):
+            raise
+        raise ProtocolError("Invalid {}: {}".format(kind, e))
+    raise ProtocolError("Unknown body type {!r}".format(kind))
+
+
+def encode_result(result):
+    """Return the JSON-compatible value for the result of a calc
+    function.
+    """
+    if result is None or isinstance(result, (bool, int, float)):
+        return result
+    return encode_body(result)
+
+
+def decode_result(data):
+    """The inverse of encode_result()."""
+    if isinstance(data, dict):
+        return decode_body(data)
+    return data
+
+
+def parse_query(query):
+    """Check a query (the decoded JSON object) and return
+    (op, bodies).
+    """
+    if not isinstance(query, dict):
+        raise ProtocolError("A query has to be an object")
+    op = query.get("op")
+    if op not in OPERATIONS:
+        raise ProtocolError("Unknown operation {!r}".format(op))
+    args = query.get("args")
+    if not isinstance(args, list) or len(args) != 2:
+        raise ProtocolError("{} needs two args".format(op))
+    return op, [decode_body(arg) for arg in args]
+
+
+def evaluate(query):
+    """Answer a single query and return the response dict."""
+    return evaluate_batch([query])[0]
+
+
+def evaluate_batch(queries):
+    """Answer many queries at once and return the list of responses.
+
+    The queries are grouped by operation, and each group is answered
+    by one broadcasting call of the calc function on the lists of
+    operands. If that raises (e.g. for a division by zero in one
+    query), the group is answered query by query instead, so the error
+    only ends up in the response of the query that caused it.
+    """
+    responses = [None] * len(queries)
+    groups = {}
+    for index, query in enumerate(queries):
+        query_id = query.get("id") if isinstance(query, dict) else None
+        try:
+            op, bodies = parse_query(query)
+        except ProtocolError as e:
+            responses[index] = {"id": query_id, "error": str(e)}
+            continue
+        groups.setdefault(op, []).append((index, query_id, bodies))
+    for op, items in groups.items():
+        # Looked up at call time, so that caching() and profiling()
+        # see the calls
+        func = getattr(calc, op)
+        try:
+            results = func([a for _, _, (a, _) in items],
+                           [b for _, _, (_, b) in items])
+        except _ERRORS:
+            for index, query_id, (a, b) in items:
+                responses[index] = _answer(func, op, query_id, a, b)
+            continue
+        for (index, query_id, (a, b)), result in zip(items, results):
+            responses[index] = _response(op, query_id, a, b, result)
+    return responses
+
+
+# The exceptions that are reported as errors of a query
+_ERRORS = (ArithmeticError, TypeError, ValueError)
+
+
+def _answer(func, op, query_id, a, b):
+    try:
+        result = func(a, b)
+    except _ERRORS as e:
+        return {"id": query_id, "error": "{}: {}".format(type(e).__name__, e)}
+    return _response(op, query_id, a, b, result)
+
+
+def _response(op, query_id, a, b, result):
+    if result is NotImplemented:
+        return {"id": query_id, "error": "{} is not supported for {} and {}"
+                .format(op, type(a).__name__, type(b).__name__)}
+    return {"id": query_id, "result": encode_result(result)}
+
+
+def dumps(data):
+    """Serialize a message as one line of JSON (with the newline)."""
+    return json.dumps(data, separators=(",", ":")) + "\n"
+
+
+def loads(line):
+    """Parse one line of JSON, raising ProtocolError if it isn't."""
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        raise ProtocolError("Invalid JSON: {}".format(e))
+
+
+__all__ = ("encode_body", "decode_body", "encode_result", "decode_result",
+           "evaluate", "evaluate_batch", "ProtocolError")
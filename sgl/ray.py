@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from .body import GeoBody
+from .line import Line, clip_parameters
+from .point import Point
+from .vector import Vector, dot, norm2
+
+
+class Ray(GeoBody):
+    """Provides a ray (half line) in 3d space"""
+    def __init__(self, a, b):
+        """Ray(Point, Vector):
+        The ray starting at the given point, going in the direction
+        pointed by the given Vector.
+
+        Ray(Point, Point):
+        The ray starting at the first point, going through the second
+        one.
+
+        Ray(Vector, Vector):
+        The same as Ray(Point, Vector), but with instead of the point
+        only the position vector of the point is given.
+        """
+        if isinstance(a, Point):
+            a = a.pv()
+        # Like a Line, but only for parameters >= 0
+        self.sv = a
+        if isinstance(b, Vector):
+            self.dv = b
+        elif isinstance(b, Point):
+            self.dv = b.pv() - self.sv
+
+        if self.dv == Vector.zero():
+            raise ValueError("Invalid Ray, Vector(0 | 0 | 0)")
+
+    @property
+    def origin(self):
+        """The point where the ray starts"""
+        return Point(self.sv)
+
+    def __repr__(self):
+        return "Ray({}, {})".format(self.origin, self.dv)
+
+    def __contains__(self, point):
+        """Checks if a point lies on the ray"""
+        if point not in self.line():
+            return False
+        return dot(point.pv() - self.sv, self.dv) >= 0
+
+    def __eq__(self, other):
+        """Checks if two rays have the same origin and direction"""
+        return (isinstance(other, Ray) and self.sv == other.sv and
+                self.dv.parallel(other.dv) and dot(self.dv, other.dv) > 0)
+
+    def parametric(self):
+        """Returns (s, u) so that the ray is
+           _   _    _
+        g: x = s + ru ; r >= 0
+        """
+        return (self.sv, self.dv)
+
+    def line(self):
+        """Returns the Line that the ray lies on."""
+        return Line(self.sv, self.dv)
+
+    def closest_point(self, point):
+        """Returns the point of the ray that is closest to the given
+        point.
+        """
+        t = max(dot(point.pv() - self.sv, self.dv) / norm2(self.dv), 0)
+        return Point(self.sv + t * self.dv)
+
+    def collect(self, batch, box, color=(0, 0, 1)):
+        """Add the part of the ray inside of box to the given
+        sgl.draw.Batch. box should have the shape ((minx, miny, minz),
+        (maxx, maxy, maxz)).
+
+        color defaults to blue.
+        """
+        s, d = self.sv, self.dv
+        interval = clip_parameters(s, d, box)
+        if interval is None:
+            return
+        t0, t1 = max(interval[0], 0), interval[1]
+        if t0 < t1:
+            batch.add_segment(Point(s + t0 * d), Point(s + t1 * d), color)
+
+    def draw(self, renderer, box, color=(0, 0, 1)):
+        """Draw the ray on the given renderer (vtk). See collect() for
+        the arguments.
+        """
+        from .draw import Batch
+        batch = Batch()
+        self.collect(batch, box, color=color)
+        batch.render(renderer)
+
+
+__all__ = ("Ray",)
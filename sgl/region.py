@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""Classifying many points against planes and convex regions at once.
+
+Unlike Plane.__contains__ and sgl.predicates.plane_side, which are
+exact, these functions compare the signed distance to a plane with a
+tolerance, so that points that are on a plane up to rounding count as
+being on it. The points can be Points or coordinate triples.
+"""
+from __future__ import division
+import math
+from .hull import vertices
+from .plane import planes_from_coefficients
+from .point import Point
+
+
+def _unit(plane):
+    """Return (nx, ny, nz, d) of the plane with a unit normal, so that
+    nx x + ny y + nz z - d is the signed distance of (x, y, z).
+    """
+    n = plane.n
+    length = math.sqrt(n[0] * n[0] + n[1] * n[1] + n[2] * n[2])
+    nx, ny, nz = n[0] / length, n[1] / length, n[2] / length
+    return nx, ny, nz, nx * plane.p.x + ny * plane.p.y + nz * plane.p.z
+
+
+def side(plane, points, tolerance=1e-10):
+    """Return a list that says for each of the points on which side of
+    the plane it is: +1 on the side that the normal points to, -1 on
+    the other side and 0 if it is closer to the plane than tolerance.
+    """
+    nx, ny, nz, d = _unit(plane)
+    result = []
+    for p in points:
+        if type(p) is Point:
+            h = nx * p.x + ny * p.y + nz * p.z - d
+        else:
+            h = nx * p[0] + ny * p[1] + nz * p[2] - d
+        result.append(1 if h > tolerance else -1 if h < -tolerance else 0)
+    return result
+
+
+class ConvexRegion(object):
+    """The intersection of the half-spaces behind the given planes (the
+    normals point outwards), like in sgl.hull.
+    """
+    def __init__(self, planes, tolerance=1e-10):
+        """ConvexRegion(planes, tolerance=1e-10):
+        Points that are at most tolerance outside of a plane still count
+        as inside.
+        """
+        self.planes = list(planes)
+        self.tolerance = tolerance
+        self._tests = [(nx, ny, nz, d + tolerance)
+                       for nx, ny, nz, d in map(_unit, self.planes)]
+        # A bounded region rejects most points by its bounding box
+        # already, which is much cheaper than going through the planes.
+        # The box is the one of the planes that are actually tested
+        # (moved outwards by tolerance): at a sharp corner, those reach
+        # a lot farther than tolerance beyond the corner
+        try:
+            corners = vertices(planes_from_coefficients(self._tests)).points
+        except ValueError:
+            # Unbounded, empty or flat, the planes alone decide
+            self._box = None
+        else:
+            low = [min(p[axis] for p in corners) for axis in range(3)]
+            high = [max(p[axis] for p in corners) for axis in range(3)]
+            # Leave room for the rounding of the corners
+            margin = 1e-10 * max(abs(x) for x in low + high)
+            self._box = ([x - margin for x in low],
+                         [x + margin for x in high])
+
+    def __repr__(self):
+        return "ConvexRegion({} planes)".format(len(self.planes))
+
+    def __contains__(self, point):
+        return self.contains((point,))[0]
+
+    def contains(self, points):
+        """Return a list that says for each of the points whether it is
+        inside of the region (or on its boundary).
+        """
+        tests = self._tests
+        if not tests:
+            return [True for _ in points]
+        box = self._box
+        if box is not None:
+            (x0, y0, z0), (x1, y1, z1) = box
+        # Neighbouring points tend to be rejected by the same plane, so
+        # the last plane that rejected a point is tried first
+        last = tests[0]
+        result = []
+        for p in points:
+            if type(p) is Point:
+                x, y, z = p.x, p.y, p.z
+            else:
+                x, y, z = p
+            if box is not None and not (x0 <= x <= x1 and y0 <= y <= y1 and
+                                        z0 <= z <= z1):
+                result.append(False)
+                continue
+            a, b, c, d = last
+            if a * x + b * y + c * z > d:
+                result.append(False)
+                continue
+            for test in tests:
+                a, b, c, d = test
+                if a * x + b * y + c * z > d:
+                    last = test
+                    result.append(False)
+                    break
+            else:
+                result.append(True)
+        return result
+
+
+__all__ = ("side", "ConvexRegion")
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from .body import GeoBody
+from .line import Line, clip_parameters
+from .point import Point
+from .vector import Vector, dot, norm2
+
+
+class Segment(GeoBody):
+    """Provides a line segment (the part of a line between two points)
+    in 3d space
+    """
+    def __init__(self, a, b):
+        """Segment(Point, Point):
+        The segment from the first to the second point.
+
+        Segment(Point, Vector):
+        The segment from the given point to the point that you get when
+        you move it by the given Vector.
+        """
+        if isinstance(a, Point):
+            a = a.pv()
+        # Like a Line, but only for parameters in [0, 1]
+        self.sv = a
+        if isinstance(b, Vector):
+            self.dv = b
+        elif isinstance(b, Point):
+            self.dv = b.pv() - self.sv
+
+        if self.dv == Vector.zero():
+            raise ValueError("Invalid Segment, Vector(0 | 0 | 0)")
+
+    @property
+    def a(self):
+        """The start point"""
+        return Point(self.sv)
+
+    @property
+    def b(self):
+        """The end point"""
+        return Point(self.sv + self.dv)
+
+    def __repr__(self):
+        return "Segment({}, {})".format(self.a, self.b)
+
+    def __contains__(self, point):
+        """Checks if a point lies on the segment"""
+        if point not in self.line():
+            return False
+        t = dot(point.pv() - self.sv, self.dv) / norm2(self.dv)
+        return 0 <= t <= 1
+
+    def __eq__(self, other):
+        """Checks if two segments have the same end points, in any
+        order
+        """
+        return (isinstance(other, Segment) and
+                (self.a, self.b) in ((other.a, other.b), (other.b, other.a)))
+
+    def parametric(self):
+        """Returns (s, u) so that the segment is
+           _   _    _
+        g: x = s + ru ; 0 <= r <= 1
+        """
+        return (self.sv, self.dv)
+
+    def line(self):
+        """Returns the Line that the segment lies on."""
+        return Line(self.sv, self.dv)
+
+    def length(self):
+        return self.dv.length()
+
+    def closest_point(self, point):
+        """Returns the point of the segment that is closest to the
+        given point.
+        """
+        t = dot(point.pv() - self.sv, self.dv) / norm2(self.dv)
+        t = min(max(t, 0), 1)
+        return Point(self.sv + t * self.dv)
+
+    def collect(self, batch, box, color=(0, 0, 1)):
+        """Add the part of the segment inside of box to the given
+        sgl.draw.Batch. box should have the shape ((minx, miny, minz),
+        (maxx, maxy, maxz)).
+
+        color defaults to blue.
+        """
+        s, d = self.sv, self.dv
+        interval = clip_parameters(s, d, box)
+        if interval is None:
+            return
+        t0, t1 = max(interval[0], 0), min(interval[1], 1)
+        if t0 < t1:
+            batch.add_segment(Point(s + t0 * d), Point(s + t1 * d), color)
+
+    def draw(self, renderer, box, color=(0, 0, 1)):
+        """Draw the segment on the given renderer (vtk). See collect()
+        for the arguments.
+        """
+        from .draw import Batch
+        batch = Batch()
+        self.collect(batch, box, color=color)
+        batch.render(renderer)
+
+
+__all__ = ("Segment",)
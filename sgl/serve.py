@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""A local query server, so that short-lived processes don't have to
+import sgl themselves (Python 3.7+ only).
+
+    $ python -m sgl.serve --port 7357
+
+Clients connect via TCP on localhost and send one query per line, see
+sgl.protocol for the format. A query with "op": "stats" returns the
+request count, throughput, batch sizes and latency percentiles of the
+server. Queries that arrive within a short window (from any number of
+connections) are answered together in one batch, and the responses
+come back on each connection in the order of its queries. Clients may
+send the next query before the previous one is answered.
+"""
+import argparse
+import asyncio
+import collections
+import time
+
+from . import protocol
+from .util import percentile
+
+_clock = getattr(time, "perf_counter", time.time)
+
+#: The hosts that the server may listen on
+LOCAL_HOSTS = ("127.0.0.1", "::1", "localhost")
+
+
+class ServerStats(object):
+    """Counters of a running Server."""
+    def __init__(self, keep=10000):
+        self.started = _clock()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        #: The last latencies (seconds from reading a query until its
+        #: answer is ready) and batch sizes
+        self.latencies = collections.deque(maxlen=keep)
+        self.batch_sizes = collections.deque(maxlen=keep)
+
+    def as_dict(self):
+        uptime = _clock() - self.started
+        latencies = list(self.latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "batches": self.batches,
+            "uptime": uptime,
+            "throughput": self.requests / uptime if uptime else 0.0,
+            "mean_batch_size": (sum(self.batch_sizes) /
+                                float(len(self.batch_sizes))
+                                if self.batch_sizes else 0.0),
+            "latency": dict(("p{}".format(q), percentile(latencies, q))
+                            for q in (50, 90, 99)),
+        }
+
+
+class Server(object):
+    """Answers sgl queries on a local TCP port. port=0 picks a free
+    port, which is available as server.port after start().
+
+    window is the time (in seconds) that the first query of a batch
+    waits for more queries, max_batch the largest batch.
+    """
+    def __init__(self, host="127.0.0.1", port=0, window=0.002,
+                 max_batch=256):
+        if host not in LOCAL_HOSTS:
+            raise ValueError("The server only listens on localhost, not {!r}"
+                             .format(host))
+        self.host = host
+        self.port = port
+        self.window = window
+        self.max_batch = max_batch
+        self.stats = ServerStats()
+        # (query, future, arrival time) waiting for the next batch
+        self._pending = []
+        self._flush = None
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host,
+                                                  self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.stats = ServerStats()
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+        if self._flush is not None:
+            self._flush.cancel()
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    def submit(self, query):
+        """Queue a query (the decoded JSON object) for the next batch and
+        return a future for its response.
+        """
+        future = asyncio.get_event_loop().create_future()
+        self._pending.append((query, future, _clock()))
+        if len(self._pending) >= self.max_batch:
+            self._run_batch()
+        elif self._flush is None:
+            self._flush = asyncio.get_event_loop().call_later(
+                self.window, self._run_batch)
+        return future
+
+    def _run_batch(self):
+        if self._flush is not None:
+            self._flush.cancel()
+            self._flush = None
+        batch, self._pending = self._pending, []
+        # The stats are answered after the rest of the batch, so that
+        # they include the queries that were sent before
+        stats = [item for item in batch if _is_stats(item[0])]
+        batch = [item for item in batch if not _is_stats(item[0])]
+        if batch:
+            queries = [query for query, _, _ in batch]
+            try:
+                responses = protocol.evaluate_batch(queries)
+            except Exception as e:
+                # This runs as a callback of the event loop, where an
+                # exception would leave the clients waiting forever
+                error = "{}: {}".format(type(e).__name__, e)
+                responses = [{"id": query.get("id")
+                              if isinstance(query, dict) else None,
+                              "error": error} for query in queries]
+            done = _clock()
+            self.stats.batches += 1
+            self.stats.batch_sizes.append(len(batch))
+            for (_, future, arrived), response in zip(batch, responses):
+                self.stats.requests += 1
+                if "error" in response:
+                    self.stats.errors += 1
+                self.stats.latencies.append(done - arrived)
+                if not future.done():
+                    future.set_result(response)
+        for query, future, _ in stats:
+            if not future.done():
+                future.set_result({"id": query.get("id"),
+                                   "result": self.stats.as_dict()})
+
+    async def _handle(self, reader, writer):
+        # The futures of this connection, answered in order by _respond
+        queue = asyncio.Queue()
+        responder = asyncio.ensure_future(self._respond(queue, writer))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    query = protocol.loads(line.decode("utf-8"))
+                except (protocol.ProtocolError, UnicodeDecodeError) as e:
+                    future = asyncio.get_event_loop().create_future()
+                    future.set_result({"id": None, "error": str(e)})
+                else:
+                    future = self.submit(query)
+                await queue.put(future)
+        finally:
+            await queue.put(None)
+            await responder
+
+    async def _respond(self, queue, writer):
+        try:
+            while True:
+                future = await queue.get()
+                if future is None:
+                    break
+                response = await future
+                writer.write(protocol.dumps(response).encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def _is_stats(query):
+    return isinstance(query, dict) and query.get("op") == "stats"
+
+
+class Client(object):
+    """A connection to a Server. Queries can be sent concurrently, e.g.
+    with asyncio.gather(), and are matched to their responses by id.
+    """
+    def __init__(self, host="127.0.0.1", port=7357):
+        self.host = host
+        self.port = port
+        self._next_id = 0
+        self._waiting = {}
+        self._reader = self._writer = self._receiver = None
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.open_connection(
+            self.host, self.port)
+        self._receiver = asyncio.ensure_future(self._receive())
+        return self
+
+    async def close(self):
+        self._writer.close()
+        await self._receiver
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _receive(self):
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                break
+            response = protocol.loads(line.decode("utf-8"))
+            future = self._waiting.pop(response.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(response)
+        for future in self._waiting.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Connection closed"))
+        self._waiting.clear()
+
+    async def send(self, query):
+        """Send a raw query (the id is set here) and return the raw
+        response.
+        """
+        self._next_id += 1
+        query = dict(query, id=self._next_id)
+        future = asyncio.get_event_loop().create_future()
+        self._waiting[self._next_id] = future
+        self._writer.write(protocol.dumps(query).encode("utf-8"))
+        await self._writer.drain()
+        return await future
+
+    async def query(self, op, a, b):
+        """Return op(a, b) as computed by the server, e.g.
+        await client.query("distance", point, plane). Raises ValueError
+        if the server answers with an error.
+        """
+        response = await self.send({
+            "op": op,
+            "args": [protocol.encode_body(a), protocol.encode_body(b)],
+        })
+        if "error" in response:
+            raise ValueError(response["error"])
+        return protocol.decode_result(response["result"])
+
+    async def stats(self):
+        """Return the statistics of the server."""
+        return (await self.send({"op": "stats"}))["result"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m sgl.serve",
+        description="Answer sgl queries on a local port.")
+    parser.add_argument("-H", "--host", default="127.0.0.1",
+                        choices=LOCAL_HOSTS)
+    parser.add_argument("-p", "--port", type=int, default=7357)
+    parser.add_argument("-w", "--window", type=float, default=2.0,
+                        help="batching window in milliseconds")
+    parser.add_argument("-b", "--max-batch", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    server = Server(args.host, args.port, args.window / 1000.0,
+                    args.max_batch)
+
+    async def run():
+        await server.start()
+        print("Listening on {}:{}".format(server.host, server.port))
+        await server.serve_forever()
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -125,3 +125,63 @@ class Solution(object):
             s += row[-1]
             vals[tbd] = s / row[tbd]
         return tuple(vals)
+
+class UniqueSolution(object):
+    """The solution of a system with exactly one solution. It behaves
+    like the Solution that solve() returns for the system, but is
+    built from the values directly."""
+    varargs = 0
+    exact = True
+
+    def __init__(self, values):
+        self._values = tuple(values)
+        self.varcount = len(self._values)
+
+    def __bool__(self):
+        return True
+    __nonzero__ = __bool__
+
+    def __call__(self, *v):
+        if v:
+            raise ValueError("Expected 0 values, got {}".format(len(v)))
+        return self._values
+
+def _cramer2(m):
+    (a, b, e), (c, d, f) = m
+    det = a * d - b * c
+    if null(det):
+        return None
+    return ((e * d - b * f) / det, (a * f - e * c) / det)
+
+def _cramer3(m):
+    (a, b, c, j), (d, e, f, k), (g, h, i, l) = m
+    # The cofactors of the first row, reused for all three numerators
+    ei_fh, fg_di, dh_eg = e * i - f * h, f * g - d * i, d * h - e * g
+    det = a * ei_fh + b * fg_di + c * dh_eg
+    if null(det):
+        return None
+    x = j * ei_fh + b * (f * l - k * i) + c * (k * h - e * l)
+    y = a * (k * i - f * l) + j * fg_di + c * (d * l - k * g)
+    z = a * (e * l - k * h) + b * (k * g - d * l) + j * dh_eg
+    return (x / det, y / det, z / det)
+
+_CRAMER = {(2, 3): _cramer2, (3, 4): _cramer3}
+
+def solve_batch(systems):
+    """Solve many systems (augmented matrices) at once and return the
+    list of their solutions, like [solve(m) for m in systems], but
+    without changing the matrices.
+
+    2x3 and 3x4 systems whose determinant isn't null() are solved with
+    Cramer's rule, which gives a UniqueSolution. All others (singular
+    or other shapes) go through the gaussian elimination of solve(),
+    so their rank shows in the Solution as usual."""
+    solutions = []
+    for m in systems:
+        cramer = _CRAMER.get(shape(m))
+        values = cramer(m) if cramer is not None else None
+        if values is None:
+            solutions.append(solve([list(row) for row in m]))
+        else:
+            solutions.append(UniqueSolution(values))
+    return solutions
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""Opt-in instrumentation of the calc functions, the solver and the
+body constructors.
+
+    >>> from sgl import profiling
+    >>> with profiling() as stats:
+    ...     distance(Point(1, 2, 3), Line(Point(0, 0, 0), Vector(1, 0, 0)))
+    >>> print(stats.report())
+
+While profiling is not active nothing is wrapped, so there is no
+overhead at all. Inside the block, the functions are replaced
+everywhere in sgl (module globals and GeoBody methods alike), but not
+references that your own code took before the block started, like
+a name imported with "from sgl import distance". Calls through those
+are only counted by what they call internally.
+"""
+import contextlib
+import time
+from collections import Counter
+
+from . import calc, solver
+from .line import Line
+from .plane import Plane
+from .point import Point
+from .ray import Ray
+from .segment import Segment
+from .triangle import Triangle
+from .util import rebind
+from .vector import Vector
+
+#: The calc functions that are counted as operations
+OPERATIONS = ("intersection", "parallel", "angle", "orthogonal", "distance",
+              "closest_points")
+
+#: The classes whose instantiations are counted
+BODIES = (Point, Vector, Line, Plane, Ray, Segment, Triangle)
+
+_clock = getattr(time, "perf_counter", time.time)
+
+# The Stats instance that is currently recording, if any
+_active = None
+
+
+class OperationStats(object):
+    """Counters for one operation, e.g. distance(Point, Line).
+
+    Everything except calls is inclusive: the solver calls and
+    allocations of nested operations are counted for the outer
+    operation as well.
+    """
+    def __init__(self):
+        self.calls = 0
+        self.time = 0.0
+        self.solver_calls = 0
+        self.allocations = Counter()
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "time": self.time,
+            "solver_calls": self.solver_calls,
+            "allocations": dict(self.allocations),
+        }
+
+
+class Stats(object):
+    """The data collected while profiling was active."""
+    def __init__(self):
+        #: "op(TypeA, TypeB)" -> OperationStats
+        self.operations = {}
+        self.solver_calls = 0
+        #: (rows, columns) of the matrices given to solve()
+        self.solver_shapes = Counter()
+        #: class name -> number of created instances
+        self.allocations = Counter()
+        # Keys of the operations that are currently running
+        self._stack = []
+
+    def _operation(self, key):
+        try:
+            return self.operations[key]
+        except KeyError:
+            self.operations[key] = op = OperationStats()
+            return op
+
+    def _running(self):
+        """The stats of the running operations, each one only once."""
+        return [self.operations[key] for key in set(self._stack)]
+
+    def as_dict(self):
+        return {
+            "operations": dict((key, op.as_dict())
+                               for key, op in self.operations.items()),
+            "solver_calls": self.solver_calls,
+            "solver_shapes": dict(("{}x{}".format(*shape), count)
+                                  for shape, count in self.solver_shapes.items()),
+            "allocations": dict(self.allocations),
+        }
+
+    def report(self):
+        """Return a human readable table of the collected data, the
+        most expensive operations first.
+        """
+        lines = ["{:<36} {:>8} {:>12} {:>8} {:>8}".format(
+            "operation", "calls", "time (ms)", "solves", "allocs")]
+        ranked = sorted(self.operations.items(),
+                        key=lambda item: item[1].time, reverse=True)
+        for key, op in ranked:
+            lines.append("{:<36} {:>8} {:>12.3f} {:>8} {:>8}".format(
+                key, op.calls, op.time * 1e3, op.solver_calls,
+                sum(op.allocations.values())))
+        lines.append("")
+        lines.append("solver calls: {}".format(self.solver_calls))
+        for shape, count in sorted(self.solver_shapes.items()):
+            lines.append("  {}x{}: {}".format(shape[0], shape[1], count))
+        lines.append("allocations: {}".format(sum(self.allocations.values())))
+        for name, count in sorted(self.allocations.items()):
+            lines.append("  {}: {}".format(name, count))
+        return "\n".join(lines)
+
+
+def _wrap_operation(name, func):
+    def wrapper(a, b, *args):
+        stats = _active
+        key = "{}({}, {})".format(name, type(a).__name__, type(b).__name__)
+        op = stats._operation(key)
+        op.calls += 1
+        stats._stack.append(key)
+        start = _clock()
+        try:
+            return func(a, b, *args)
+        finally:
+            op.time += _clock() - start
+            stats._stack.pop()
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+def _wrap_solve(func):
+    def wrapper(matrix):
+        stats = _active
+        stats.solver_calls += 1
+        stats.solver_shapes[solver.shape(matrix)] += 1
+        for op in stats._running():
+            op.solver_calls += 1
+        return func(matrix)
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+def _wrap_init(func):
+    def wrapper(self, *args, **kwargs):
+        stats = _active
+        name = type(self).__name__
+        stats.allocations[name] += 1
+        for op in stats._running():
+            op.allocations[name] += 1
+        return func(self, *args, **kwargs)
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+def _wrappers():
+    """Return the (original, wrapper) pairs that need to be installed."""
+    pairs = [(getattr(calc, name), _wrap_operation(name, getattr(calc, name)))
+             for name in OPERATIONS]
+    pairs.append((solver.solve, _wrap_solve(solver.solve)))
+    pairs += [(cls.__init__, _wrap_init(cls.__init__)) for cls in BODIES]
+    return pairs
+
+
+@contextlib.contextmanager
+def profiling():
+    """Record statistics about the sgl operations done inside the with
+    block. Yields the Stats object that the data is collected in.
+    """
+    global _active
+    if _active is not None:
+        raise RuntimeError("profiling() is already active")
+    pairs = _wrappers()
+    stats = _active = Stats()
+    for original, wrapper in pairs:
+        rebind(original, wrapper)
+    try:
+        yield stats
+    finally:
+        for original, wrapper in reversed(pairs):
+            rebind(wrapper, original)
+        _active = None
+
+
+__all__ = ("profiling", "Stats")
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+import math
+from .line import Line
+from .plane import Plane
+from .point import Point
+from .ray import Ray
+from .segment import Segment
+from .triangle import Triangle
+from .vector import Vector
+
+
+class Transform(object):
+    """An affine transformation x -> Ax + t of the 3D space, stored as
+    the 4x4 matrix
+        / A  t \\
+        \\ 0  1 /
+    """
+    def __init__(self, matrix):
+        """Transform(matrix):
+        The transformation given by a 4x4 matrix (a list of rows) whose
+        last row is (0, 0, 0, 1), or by the 3x4 matrix (A | t) without
+        that row.
+        """
+        rows = [list(row) for row in matrix]
+        if len(rows) == 4:
+            if list(rows[3]) != [0, 0, 0, 1]:
+                raise ValueError("Not an affine transformation, the last "
+                                 "row must be (0, 0, 0, 1)")
+            rows = rows[:3]
+        if len(rows) != 3 or any(len(row) != 4 for row in rows):
+            raise ValueError("Transform() needs a 4x4 or 3x4 matrix")
+        self._m = rows
+        # (A^-1)^T, for normal vectors, computed when needed
+        self._normal_matrix = None
+
+    @classmethod
+    def identity(cls):
+        """The transformation that changes nothing."""
+        return cls([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0]])
+
+    @classmethod
+    def translation(cls, v):
+        """Moves everything by the vector v."""
+        return cls([[1, 0, 0, v[0]], [0, 1, 0, v[1]], [0, 0, 1, v[2]]])
+
+    @classmethod
+    def scaling(cls, sx, sy=None, sz=None):
+        """Scales by sx, sy, sz along the axes (uniformly by sx if only
+        that is given), keeping the origin in place.
+        """
+        if sy is None:
+            sy = sx
+        if sz is None:
+            sz = sx
+        return cls([[sx, 0, 0, 0], [0, sy, 0, 0], [0, 0, sz, 0]])
+
+    @classmethod
+    def rotation(cls, axis, angle, center=None):
+        """Rotates by angle (radians, counterclockwise when looking
+        against axis) around the axis through center (the origin by
+        default).
+        """
+        length = math.sqrt(axis[0] ** 2 + axis[1] ** 2 + axis[2] ** 2)
+        if length == 0:
+            raise ValueError("Invalid rotation axis, Vector(0 | 0 | 0)")
+        x, y, z = (float(axis[0]) / length, float(axis[1]) / length,
+                   float(axis[2]) / length)
+        c, s = math.cos(angle), math.sin(angle)
+        t = 1 - c
+        # Rodrigues' rotation formula as a matrix
+        rotation = cls([
+            [t * x * x + c, t * x * y - s * z, t * x * z + s * y, 0],
+            [t * x * y + s * z, t * y * y + c, t * y * z - s * x, 0],
+            [t * x * z - s * y, t * y * z + s * x, t * z * z + c, 0],
+        ])
+        if center is None:
+            return rotation
+        return cls.chain(cls.translation([-c_ for c_ in center]), rotation,
+                         cls.translation(center))
+
+    @classmethod
+    def chain(cls, *transforms):
+        """Return the single transformation that applies the given ones
+        in order (the first one first). Applying the result to N bodies
+        costs N matrix multiplications, not N times the number of
+        transformations.
+        """
+        result = cls.identity()
+        for transform in transforms:
+            result = transform * result
+        return result
+
+    def matrix(self):
+        """Return the 4x4 matrix as a tuple of rows."""
+        return tuple(tuple(row) for row in self._m) + ((0, 0, 0, 1),)
+
+    def __repr__(self):
+        return "Transform({})".format([list(row) for row in self.matrix()])
+
+    def __eq__(self, other):
+        return isinstance(other, Transform) and self._m == other._m
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __mul__(self, other):
+        """self * other is the transformation that first applies other
+        and then self (like the matrix product).
+        """
+        if not isinstance(other, Transform):
+            return NotImplemented
+        a, b = self._m, other._m
+        rows = []
+        for i in range(3):
+            row = [a[i][0] * b[0][j] + a[i][1] * b[1][j] + a[i][2] * b[2][j]
+                   for j in range(4)]
+            row[3] += a[i][3]
+            rows.append(row)
+        return Transform(rows)
+
+    def determinant(self):
+        """The determinant of the linear part A."""
+        m = self._m
+        return (m[0][0] * (m[1][1] * m[2][2] - m[1][2] * m[2][1]) -
+                m[0][1] * (m[1][0] * m[2][2] - m[1][2] * m[2][0]) +
+                m[0][2] * (m[1][0] * m[2][1] - m[1][1] * m[2][0]))
+
+    def _inverse_linear(self):
+        """Return A^-1 as a list of rows (adjugate / determinant)."""
+        m = self._m
+        det = self.determinant()
+        if det == 0:
+            raise ValueError("Transform is not invertible")
+        cof = [[m[(j + 1) % 3][(i + 1) % 3] * m[(j + 2) % 3][(i + 2) % 3] -
+                m[(j + 1) % 3][(i + 2) % 3] * m[(j + 2) % 3][(i + 1) % 3]
+                for j in range(3)] for i in range(3)]
+        return [[cof[i][j] / det for j in range(3)] for i in range(3)]
+
+    def inverse(self):
+        """Return the transformation that undoes this one."""
+        inv = self._inverse_linear()
+        t = [row[3] for row in self._m]
+        return Transform([
+            inv[i] + [-(inv[i][0] * t[0] + inv[i][1] * t[1] +
+                        inv[i][2] * t[2])]
+            for i in range(3)
+        ])
+
+    def _apply_point(self, p):
+        m = self._m
+        x, y, z = p[0], p[1], p[2]
+        return (m[0][0] * x + m[0][1] * y + m[0][2] * z + m[0][3],
+                m[1][0] * x + m[1][1] * y + m[1][2] * z + m[1][3],
+                m[2][0] * x + m[2][1] * y + m[2][2] * z + m[2][3])
+
+    def _apply_vector(self, v, m=None):
+        if m is None:
+            m = self._m
+        x, y, z = v[0], v[1], v[2]
+        return (m[0][0] * x + m[0][1] * y + m[0][2] * z,
+                m[1][0] * x + m[1][1] * y + m[1][2] * z,
+                m[2][0] * x + m[2][1] * y + m[2][2] * z)
+
+    def _apply_normal(self, n):
+        # Normals have to stay orthogonal to the vectors in the plane,
+        # which takes the inverse transpose of A
+        if self._normal_matrix is None:
+            inv = self._inverse_linear()
+            self._normal_matrix = [[inv[j][i] for j in range(3)]
+                                   for i in range(3)]
+        return self._apply_vector(n, self._normal_matrix)
+
+    def __call__(self, body):
+        """Apply the transformation to a Point, Vector (which is only
+        affected by the linear part, not the translation), Line or
+        Plane, Ray, Segment or Triangle. Returns a new body of the same
+        kind.
+        """
+        if isinstance(body, Point):
+            return Point(*self._apply_point(body))
+        elif isinstance(body, Vector):
+            return Vector(*self._apply_vector(body))
+        elif isinstance(body, (Line, Ray, Segment)):
+            return type(body)(Vector(*self._apply_point(body.sv)),
+                              Vector(*self._apply_vector(body.dv)))
+        elif isinstance(body, Triangle):
+            return Triangle(*[self._apply_point(p) for p in body])
+        elif isinstance(body, Plane):
+            return Plane(Point(*self._apply_point(body.p)),
+                         Vector(*self._apply_normal(body.n)))
+        raise TypeError("Can't transform {!r}".format(body))
+
+    def apply_many(self, bodies):
+        """Return [self(body) for body in bodies]."""
+        return [self(body) for body in bodies]
+
+    def apply_points(self, coords):
+        """Transform a batch of plain coordinate triples (points) and
+        return the list of transformed triples. This skips creating
+        Point objects altogether.
+        """
+        m = self._m
+        (a, b, c, d), (e, f, g, h), (i, j, k, l) = m
+        return [(a * x + b * y + c * z + d,
+                 e * x + f * y + g * z + h,
+                 i * x + j * y + k * z + l) for x, y, z in coords]
+
+
+__all__ = ("Transform",)
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+from __future__ import division
+from collections import namedtuple
+from .body import GeoBody
+from .plane import Plane
+from .point import Point
+from .solver import null
+from .vector import dot, norm2
+
+
+class Triangle(GeoBody):
+    """Provides a triangle in 3d space"""
+    def __init__(self, a, b, c):
+        """Triangle(Point, Point, Point):
+        The triangle with the three given corners.
+        """
+        self.a, self.b, self.c = Point(a), Point(b), Point(c)
+        # Like Plane(a, b, c), only exactly collinear points are
+        # rejected. Slivers are valid triangles, hit_parameters() takes
+        # care of rays that are (nearly) parallel to them
+        if not norm2(self.normal()):
+            raise ValueError("Invalid Triangle, the points are collinear")
+
+    def __repr__(self):
+        return "Triangle({}, {}, {})".format(self.a, self.b, self.c)
+
+    def __contains__(self, point):
+        """Checks if a point lies on the triangle (including its
+        border)
+        """
+        q = self.closest_point(point)
+        return null(norm2((q.x - point.x, q.y - point.y, q.z - point.z)))
+
+    def __eq__(self, other):
+        """Checks if two triangles have the same corners, in any order"""
+        return (isinstance(other, Triangle) and
+                set((self.a, self.b, self.c)) ==
+                set((other.a, other.b, other.c)))
+
+    def __getitem__(self, item):
+        return (self.a, self.b, self.c)[item]
+
+    def normal(self):
+        """Returns the normal AB x AC. It points to the side from which
+        the corners are counterclockwise, and its length is twice the
+        area.
+        """
+        return (self.b.pv() - self.a.pv()).cross(self.c.pv() - self.a.pv())
+
+    def area(self):
+        return 0.5 * self.normal().length()
+
+    def plane(self):
+        """Returns the Plane that the triangle lies in."""
+        return Plane(self.a, self.normal())
+
+    def closest_point(self, point):
+        """Returns the point of the triangle that is closest to the
+        given point.
+        """
+        # Find the Voronoi region of the triangle that the point is in:
+        # the region of a corner, of an edge or of the inside.
+        a, b, c, p = self.a, self.b, self.c, point
+        ab = (b.x - a.x, b.y - a.y, b.z - a.z)
+        ac = (c.x - a.x, c.y - a.y, c.z - a.z)
+        ap = (p.x - a.x, p.y - a.y, p.z - a.z)
+        d1, d2 = dot(ab, ap), dot(ac, ap)
+        if d1 <= 0 and d2 <= 0:
+            return a
+        bp = (p.x - b.x, p.y - b.y, p.z - b.z)
+        d3, d4 = dot(ab, bp), dot(ac, bp)
+        if d3 >= 0 and d4 <= d3:
+            return b
+        vc = d1 * d4 - d3 * d2
+        if vc <= 0 and d1 >= 0 and d3 <= 0:
+            v = d1 / (d1 - d3)
+            return Point(a.x + v * ab[0], a.y + v * ab[1], a.z + v * ab[2])
+        cp = (p.x - c.x, p.y - c.y, p.z - c.z)
+        d5, d6 = dot(ab, cp), dot(ac, cp)
+        if d6 >= 0 and d5 <= d6:
+            return c
+        vb = d5 * d2 - d1 * d6
+        if vb <= 0 and d2 >= 0 and d6 <= 0:
+            w = d2 / (d2 - d6)
+            return Point(a.x + w * ac[0], a.y + w * ac[1], a.z + w * ac[2])
+        va = d3 * d6 - d5 * d4
+        if va <= 0 and d4 - d3 >= 0 and d5 - d6 >= 0:
+            w = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+            return Point(b.x + w * (c.x - b.x), b.y + w * (c.y - b.y),
+                         b.z + w * (c.z - b.z))
+        # Inside, use the barycentric coordinates
+        v, w = vb / (va + vb + vc), vc / (va + vb + vc)
+        return Point(a.x + v * ab[0] + w * ac[0],
+                     a.y + v * ab[1] + w * ac[1],
+                     a.z + v * ab[2] + w * ac[2])
+
+    def collect(self, batch, box, color=(1, 1, 0)):
+        """Add the triangle to the given sgl.draw.Batch.
+
+        The box argument is ignored. You have to make sure that the
+        triangle is inside the cuboid by yourself.
+
+        color defaults to yellow, like planes.
+        """
+        batch.add_polygon([self.a, self.b, self.c], color)
+
+    def draw(self, renderer, box, color=(1, 1, 0)):
+        """Draw the triangle on the given renderer (vtk). See collect()
+        for the arguments.
+        """
+        from .draw import Batch
+        batch = Batch()
+        self.collect(batch, box, color=color)
+        batch.render(renderer)
+
+
+def prepare(triangle):
+    """Return the data that hit_parameters() needs for the triangle:
+    the corner A, the edges AB and AC and the squared length of their
+    cross product.
+    """
+    a, b, c = triangle.a, triangle.b, triangle.c
+    e1 = (b.x - a.x, b.y - a.y, b.z - a.z)
+    e2 = (c.x - a.x, c.y - a.y, c.z - a.z)
+    n = (e1[1] * e2[2] - e1[2] * e2[1],
+         e1[2] * e2[0] - e1[0] * e2[2],
+         e1[0] * e2[1] - e1[1] * e2[0])
+    return (a.x, a.y, a.z), e1, e2, norm2(n)
+
+
+def hit_parameters(s, d, prepared, d2=None):
+    """Intersect the line x = s + t*d with a triangle, given by the
+    result of prepare(triangle), using the Möller–Trumbore algorithm.
+
+    Returns (t, u, v), where t is the parameter of the hit on the line
+    and u, v are its barycentric coordinates (the point is
+    A + u*AB + v*AC), or None if the line misses the triangle or is
+    parallel to it. d2 is the squared length of d, if it is known
+    already.
+    """
+    a, e1, e2, n2 = prepared
+    if d2 is None:
+        d2 = norm2(d)
+    # det = e1 * (d x e2) = -(d * n)
+    p = (d[1] * e2[2] - d[2] * e2[1],
+         d[2] * e2[0] - d[0] * e2[2],
+         d[0] * e2[1] - d[1] * e2[0])
+    det = e1[0] * p[0] + e1[1] * p[1] + e1[2] * p[2]
+    # Parallel if the sine of the angle between line and plane is
+    # (nearly) 0
+    if null(det * det / (d2 * n2)):
+        return None
+    w = (s[0] - a[0], s[1] - a[1], s[2] - a[2])
+    u = (w[0] * p[0] + w[1] * p[1] + w[2] * p[2]) / det
+    if u < 0 or u > 1:
+        return None
+    q = (w[1] * e1[2] - w[2] * e1[1],
+         w[2] * e1[0] - w[0] * e1[2],
+         w[0] * e1[1] - w[1] * e1[0])
+    v = (d[0] * q[0] + d[1] * q[1] + d[2] * q[2]) / det
+    if v < 0 or u + v > 1:
+        return None
+    t = (e2[0] * q[0] + e2[1] * q[1] + e2[2] * q[2]) / det
+    return t, u, v
+
+
+#: A hit of cast_rays(): the ray parameter, the index of the triangle,
+#: the point and its barycentric coordinates in the triangle
+Hit = namedtuple("Hit", ["param", "index", "point", "u", "v"])
+
+
+def cast_rays(rays, triangles):
+    """Cast all rays against all triangles (e.g. the faces of a mesh).
+    Returns a list with the nearest Hit for each ray, or None if the ray
+    misses every triangle.
+
+    The triangles are prepared only once, so this is a lot faster than
+    calling intersection() for every pair.
+    """
+    prepared = [prepare(triangle) for triangle in triangles]
+    results = []
+    for ray in rays:
+        s, d = ray.sv._v, ray.dv._v
+        d2 = norm2(d)
+        best = best_index = None
+        for index, data in enumerate(prepared):
+            hit = hit_parameters(s, d, data, d2)
+            if hit is not None and hit[0] >= 0 and (
+                    best is None or hit[0] < best[0]):
+                best, best_index = hit, index
+        if best is None:
+            results.append(None)
+            continue
+        t, u, v = best
+        results.append(Hit(t, best_index, Point(s[0] + t * d[0],
+                                                s[1] + t * d[1],
+                                                s[2] + t * d[2]), u, v))
+    return results
+
+
+__all__ = ("Triangle", "Hit", "cast_rays")
@@ -1,6 +1,26 @@
 # -*- coding: utf-8 -*-
-from decimal import Decimal
-from fractions import Fraction
+import sys
+
+
+def _type_values():
+    """Return the type ranking used by unify_types.
+
+    decimal and fractions are expensive to import, and if nobody else
+    has imported them there can't be any Decimal or Fraction instances
+    around either, so they are only ranked once they are loaded.
+    """
+    type_values = {
+        float: 3,
+        int: 4,
+    }
+    decimal = sys.modules.get("decimal")
+    if decimal is not None:
+        type_values[decimal.Decimal] = 2
+    fractions = sys.modules.get("fractions")
+    if fractions is not None:
+        type_values[fractions.Fraction] = 1
+    return type_values
+
 
 def unify_types(items):
     """Promote all items to the same type. The resulting type is the
@@ -12,12 +32,7 @@ def unify_types(items):
     - fractions.Fraction
     - user defined
     """
-    type_values = {
-        Fraction: 1,
-        Decimal: 2,
-        float: 3,
-        int: 4,
-    }
+    type_values = _type_values()
     types = []
     for item in items:
         for type_, value in type_values.items():
@@ -28,3 +43,38 @@ def unify_types(items):
             types.append((0, type(item)))
     result_type = min(types)[1]
     return [result_type(i) for i in items]
+
+
+def rebind(old, new):
+    """Replace every reference to old in the loaded sgl modules with new.
+
+    This covers module globals (e.g. a function imported with
+    "from .solver import solve") as well as class attributes (methods),
+    so that wrappers can be installed and removed at runtime without
+    the wrapped code having to know about them.
+    """
+    for name, module in list(sys.modules.items()):
+        if module is None or not (name == "sgl" or name.startswith("sgl.")):
+            continue
+        namespace = vars(module)
+        for key, value in list(namespace.items()):
+            if value is old:
+                namespace[key] = new
+            elif isinstance(value, type) and value.__module__ == name:
+                for attr, member in list(vars(value).items()):
+                    if member is old:
+                        setattr(value, attr, new)
+
+
+def percentile(values, q):
+    """Return the q-th percentile (0 <= q <= 100) of the values, with
+    linear interpolation between the closest ranks. Returns None for no
+    values.
+    """
+    values = sorted(values)
+    if not values:
+        return None
+    pos = (len(values) - 1) * q / 100.0
+    lower = int(pos)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (pos - lower)
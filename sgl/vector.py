@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import math
 
+from .solver import solve
 from .util import unify_types
 
 class Vector(object):
@@ -47,14 +48,14 @@ class Vector(object):
         return (self._v == other._v)
 
     def __add__(self, other):
-        return Vector(x+y for x, y in zip(self, other))
+        return Vector([x+y for x, y in zip(self._v, other)])
     
     def __sub__(self, other):
-        return Vector([x-y for x, y in zip(self, other)])
+        return Vector([x-y for x, y in zip(self._v, other)])
 
     def __mul__(self, other):
         if isinstance(other, Vector):
-            return sum(x*y for x, y in zip(self, other))
+            return dot(self._v, other._v)
         return Vector([x*other for x in self._v])
 
     def __rmul__(self, other):
@@ -87,12 +88,11 @@ class Vector(object):
 
     def length(self):
         """Returns |v|, the length of the vector."""
-        return (self * self) ** 0.5
+        return norm2(self._v) ** 0.5
     __abs__ = length
 
     def parallel(self, other):
         """Returns true if both vectors are parallel."""
-        from .solver import solve
         if self == Vector.zero() or other == Vector.zero():
             return False
         if self == other:
@@ -128,9 +128,9 @@ class Vector(object):
         return float(1 / self.length()) * self
     unit = normalized
 
-    def draw(self, renderer, box, origin=(0, 0, 0), color=(1, 0, 0)):
-        """Draw the vector, represented by an arrow, starting at the
-        given origin on the given renderer (vtk).
+    def collect(self, batch, box, origin=(0, 0, 0), color=(1, 0, 0)):
+        """Add the vector, represented by an arrow starting at the given
+        origin, to the given sgl.draw.Batch.
 
         The box argument is ignored.
 
@@ -138,37 +138,125 @@ class Vector(object):
         color defaults to red.
         """
         from .point import Point
-        import vtk
         if not isinstance(origin, Point):
             origin = Point(origin)
-        # Drawing arrows needs transformation matrices, which I don't
-        # know anything about, so we just draw a simple line and put
-        # a little hat (cone) on it. This the easier way for us
-        # mortals.
-        lineSrc = vtk.vtkLineSource()
-        # Again, using switched coordinates
-        lineSrc.SetPoint1(origin.y, origin.z, origin.x)
         end = Point(origin.pv() + self)
-        lineSrc.SetPoint2(end.y, end.z, end.x)
-        lineMap = vtk.vtkPolyDataMapper()
-        lineMap.SetInput(lineSrc.GetOutput())
-        lineAct = vtk.vtkActor()
-        lineAct.SetMapper(lineMap)
-        lineAct.GetProperty().SetColor(*color)
-        renderer.AddActor(lineAct)
-
-        # draw the cone
-        coneSrc = vtk.vtkConeSource()
-        coneSrc.SetCenter(end.y, end.z, end.x)
-        coneSrc.SetHeight(1)
-        coneSrc.SetRadius(0.2)
-        coneSrc.SetDirection(self[1], self[2], self[0])
-        coneMap = vtk.vtkPolyDataMapper()
-        coneMap.SetInput(coneSrc.GetOutput())
-        coneAct = vtk.vtkActor()
-        coneAct.SetMapper(coneMap)
-        coneAct.GetProperty().SetColor(*color)
-        renderer.AddActor(coneAct)
-
-
-__all__ = ("Vector",)
+        batch.add_arrow(origin, end, color)
+
+    def draw(self, renderer, box, origin=(0, 0, 0), color=(1, 0, 0)):
+        """Draw the vector, represented by an arrow, starting at the
+        given origin on the given renderer (vtk). See collect() for the
+        arguments.
+        """
+        from .draw import Batch
+        batch = Batch()
+        self.collect(batch, box, origin=origin, color=color)
+        batch.render(renderer)
+
+    def mutable(self):
+        """Return a MutableVector copy of the vector."""
+        return MutableVector(self._v)
+
+
+class MutableVector(Vector):
+    """A vector that supports the in-place operators +=, -= and *=,
+    meant as an accumulator in loops that would otherwise create a new
+    Vector in every step:
+
+        position = start.mutable()
+        for step in range(1000):
+            position.axpy(dt, velocity)   # position += dt * velocity
+
+    Since it changes, a MutableVector is not hashable. Use frozen() to
+    get a normal Vector with the current value.
+    """
+    __hash__ = None
+
+    def _unify(self):
+        v = self._v
+        # Mixing e.g. ints and floats needs a promotion, as in __init__
+        if not type(v[0]) is type(v[1]) is type(v[2]):
+            self._v = unify_types(v)
+
+    def __iadd__(self, other):
+        v = self._v
+        v[0] += other[0]
+        v[1] += other[1]
+        v[2] += other[2]
+        self._unify()
+        return self
+
+    def __isub__(self, other):
+        v = self._v
+        v[0] -= other[0]
+        v[1] -= other[1]
+        v[2] -= other[2]
+        self._unify()
+        return self
+
+    def __imul__(self, other):
+        v = self._v
+        v[0] *= other
+        v[1] *= other
+        v[2] *= other
+        self._unify()
+        return self
+
+    def axpy(self, t, d):
+        """Add t * d to the vector in place (self += t * d) without
+        creating the temporary t * d. Returns self.
+        """
+        v = self._v
+        v[0] += t * d[0]
+        v[1] += t * d[1]
+        v[2] += t * d[2]
+        self._unify()
+        return self
+
+    def frozen(self):
+        """Return a (hashable) Vector with the current value."""
+        return Vector(self._v)
+
+
+# Fused operations. They take anything that can be indexed like a
+# vector (Vectors, Points, tuples, ...) and compute the result directly
+# from the coordinates, without the intermediate Vectors that writing
+# them with the operators would create.
+
+def dot(a, b):
+    """Return the dot product a * b."""
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def norm2(a):
+    """Return the squared length |a|² = a * a."""
+    return a[0] * a[0] + a[1] * a[1] + a[2] * a[2]
+
+
+def cross_dot(a, b, c):
+    """Return the scalar triple product a * (b × c), the signed volume
+    of the parallelepiped spanned by a, b and c.
+    """
+    return (a[0] * (b[1] * c[2] - b[2] * c[1]) +
+            a[1] * (b[2] * c[0] - b[0] * c[2]) +
+            a[2] * (b[0] * c[1] - b[1] * c[0]))
+
+
+def axpy(s, t, d):
+    """Return the Vector s + t * d, e.g. the point with parameter t on
+    the line with support vector s and direction vector d.
+    """
+    return Vector(s[0] + t * d[0], s[1] + t * d[1], s[2] + t * d[2])
+
+
+def lerp(a, b, t):
+    """Return the Vector a + t * (b - a), which linearly interpolates
+    between a (t = 0) and b (t = 1).
+    """
+    return Vector(a[0] + t * (b[0] - a[0]),
+                  a[1] + t * (b[1] - a[1]),
+                  a[2] + t * (b[2] - a[2]))
+
+
+__all__ = ("Vector", "MutableVector", "axpy", "cross_dot", "dot", "lerp",
+           "norm2")
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import unittest
+from fractions import Fraction
+from sgl import Line, Plane, Point, Vector, caching, calc, profiling
+from sgl.cache import ResultCache, body_key
+
+
+class CacheTest(unittest.TestCase):
+    def setUp(self):
+        self.a = Plane(Point(0, 0, 0), Vector(0, 0, 1))
+        self.b = Plane(Point(0, 0, 0), Vector(1, 0, 0))
+
+    def test_hits_and_misses(self):
+        with caching() as cache:
+            first = calc.intersection(self.a, self.b)
+            second = calc.intersection(self.a, self.b)
+            calc.intersection(self.b, self.a)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertEqual(first.parametric(), second.parametric())
+        self.assertIsNot(first, second)
+
+    def test_keyed_on_values(self):
+        point = Point(0, 0, 5)
+        with caching() as cache:
+            self.assertEqual(calc.distance(point, self.a), 5)
+            point[2] = 3
+            self.assertEqual(calc.distance(point, self.a), 3)
+            # An equal, but different object
+            self.assertEqual(calc.distance(Point(0, 0, 3), self.a), 3)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_keyed_on_types(self):
+        # Equal coordinates of different types don't share results
+        points = [Point(0, 0, 3), Point(0.0, 0.0, 3.0),
+                  Point(Fraction(0), Fraction(0), Fraction(3))]
+        with caching() as cache:
+            for point in points:
+                calc.distance(point, self.a)
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+        self.assertEqual(len(set(map(body_key, points))), 3)
+
+    def test_results_are_copied(self):
+        line = Line(Point(0, 0, 1), Vector(0, 0, 1))
+        with caching():
+            result = calc.intersection(line, self.a)
+            result[2] = 10
+            self.assertEqual(calc.intersection(line, self.a), Point(0, 0, 0))
+
+    def test_batches(self):
+        points = [Point(0, 0, 1), Point(0, 0, 2), Point(0, 0, 1)]
+        with caching() as cache:
+            self.assertEqual(calc.distance(points, self.a), [1, 2, 1])
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_lru_eviction(self):
+        cache = ResultCache(maxsize=2)
+        points = [Point(0, 0, i) for i in range(3)]
+        with caching(cache=cache):
+            calc.distance(points[0], self.a)
+            calc.distance(points[1], self.a)
+            calc.distance(points[0], self.a)
+            # Evicts points[1], the least recently used one
+            calc.distance(points[2], self.a)
+            calc.distance(points[0], self.a)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+        with caching(cache=cache):
+            calc.distance(points[1], self.a)
+        self.assertEqual(cache.misses, 4)
+
+    def test_restores_originals(self):
+        original = calc.distance
+        with caching():
+            self.assertIsNot(calc.distance, original)
+            with self.assertRaises(RuntimeError):
+                with caching():
+                    pass
+        self.assertIs(calc.distance, original)
+        self.assertIs(Line.distance, original)
+
+    def test_with_profiling(self):
+        original = calc.angle
+        with profiling() as stats:
+            with caching() as cache:
+                for _ in range(3):
+                    calc.angle(self.a, self.b)
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(stats.operations["angle(Plane, Plane)"].calls, 1)
+        self.assertIs(calc.angle, original)
+
+    def test_decorator(self):
+        @caching(maxsize=10)
+        def query():
+            return calc.angle(self.a, self.b), calc.angle(self.a, self.b)
+        self.assertEqual(*query())
+
+
+if __name__ == "__main__":
+    unittest.main()
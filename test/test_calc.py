@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+import unittest
+from sgl import Line, Plane, Point, Vector, closest_points, \
+    closest_points_batch, distance, intersection, parallel
+from sgl.calc import broadcast_shapes
+
+
+class ClosestPointsTest(unittest.TestCase):
+    def setUp(self):
+        self.line = Line(Point(0, 0, 0), Vector(1, 0, 0))
+
+    def test_skew(self):
+        other = Line(Point(2, 1, 5), Vector(0, 2, 0))
+        result = closest_points(self.line, other)
+        self.assertEqual(result.point_a, Point(2, 0, 0))
+        self.assertEqual(result.point_b, Point(2, 0, 5))
+        self.assertAlmostEqual(result.param_a, 2)
+        self.assertAlmostEqual(result.param_b, -0.5)
+        self.assertAlmostEqual(result.distance, 5)
+        self.assertFalse(result.parallel)
+        self.assertAlmostEqual(distance(self.line, other), 5)
+
+    def test_intersecting(self):
+        other = Line(Point(3, -1, 0), Vector(0, 1, 0))
+        result = closest_points(self.line, other)
+        self.assertEqual(result.point_a, result.point_b)
+        self.assertEqual(result.point_a, Point(3, 0, 0))
+        self.assertAlmostEqual(result.distance, 0)
+
+    def test_parallel(self):
+        other = Line(Point(4, 0, 3), Vector(-2, 0, 0))
+        result = closest_points(self.line, other)
+        self.assertTrue(result.parallel)
+        self.assertEqual(result.param_a, 0)
+        self.assertEqual(result.point_a, Point(0, 0, 0))
+        self.assertEqual(result.point_b, Point(0, 0, 3))
+        self.assertAlmostEqual(result.param_b, 2)
+        self.assertAlmostEqual(result.distance, 3)
+        self.assertAlmostEqual(distance(self.line, other), 3)
+
+    def test_coincident(self):
+        other = Line(Point(5, 0, 0), Vector(3, 0, 0))
+        result = closest_points(self.line, other)
+        self.assertTrue(result.parallel)
+        self.assertEqual(result.point_b, Point(0, 0, 0))
+        self.assertAlmostEqual(result.distance, 0)
+
+    def test_almost_parallel(self):
+        # Lines that meet far away are not parallel
+        other = Line(Point(0, 1, 0), Vector(1, -1e-6, 0))
+        result = closest_points(self.line, other)
+        self.assertFalse(result.parallel)
+        self.assertAlmostEqual(result.param_a / 1e6, 1)
+        self.assertAlmostEqual(result.point_b.x / 1e6, 1)
+        self.assertAlmostEqual(result.distance, 0)
+        self.assertAlmostEqual(distance(self.line, other), 0)
+        other = Line(Point(0, 1, 0), Vector(1, -1e-6, 1e-6))
+        self.assertAlmostEqual(distance(self.line, other), 0.5 ** 0.5)
+        self.assertAlmostEqual(
+            closest_points_batch(self.line, [other])[0].distance, 0.5 ** 0.5)
+
+    def test_batch(self):
+        others = [Line(Point(2, 1, 5), Vector(0, 2, 0)),
+                  Line(Point(4, 0, 3), Vector(-2, 0, 0))]
+        expected = [closest_points(self.line, other) for other in others]
+        self.assertEqual(closest_points_batch([self.line] * 2, others),
+                         expected)
+        self.assertEqual(closest_points_batch(self.line, others), expected)
+        with self.assertRaises(ValueError):
+            closest_points_batch([self.line], others)
+
+
+class BroadcastTest(unittest.TestCase):
+    def setUp(self):
+        self.points = [Point(0, 0, 1), Point(0, 0, 2), Point(0, 0, 3)]
+        self.planes = [Plane(Point(0, 0, 0), Vector(0, 0, 1)),
+                       Plane(Point(0, 0, 1), Vector(0, 0, 1))]
+
+    def test_single_and_batch(self):
+        plane = self.planes[0]
+        self.assertEqual(distance(plane, self.points), [1, 2, 3])
+        self.assertEqual(distance(self.points, plane), [1, 2, 3])
+        self.assertEqual(plane.distance(tuple(self.points)), [1, 2, 3])
+        self.assertEqual(distance([], plane), [])
+
+    def test_two_batches(self):
+        self.assertEqual(distance(self.points, self.points[::-1]), [2, 0, 2])
+        # 2x1 against 3 -> 2x3
+        self.assertEqual(distance([[p] for p in self.planes], self.points),
+                         [[1, 2, 3], [0, 1, 2]])
+        # 1 is stretched
+        self.assertEqual(distance(self.points[:1], self.planes), [1, 0])
+        with self.assertRaises(ValueError):
+            distance(self.points, self.planes)
+
+    def test_batch_kernels(self):
+        # The batch kernels give exactly the results of the single ones
+        points = [Point(i * 0.3, 1 - i * 0.7, i * i * 0.1) for i in range(9)]
+        line = Line(Point(1, 2, 3), Vector(0.5, -1, 2))
+        plane = Plane(Point(1, 2, 3), Vector(0.5, -1, 2))
+        for body in (line, plane):
+            expected = [distance(point, body) for point in points]
+            self.assertEqual(distance(points, body), expected)
+            self.assertEqual(distance(body, points), expected)
+            # Mixed types use the single kernels
+            self.assertEqual(distance(points + [line], body)[:-1], expected)
+
+    def test_shapes(self):
+        self.assertEqual(broadcast_shapes((2, 1), (3,)), (2, 3))
+        self.assertEqual(broadcast_shapes((), (4,)), (4,))
+        self.assertEqual(broadcast_shapes((1, 5), (2, 1)), (2, 5))
+        with self.assertRaises(ValueError):
+            broadcast_shapes((2, 3), (2,))
+
+    def test_mixed_types(self):
+        line = Line(Point(0, 0, 0), Vector(1, 0, 0))
+        result = intersection(line, [self.planes[0], Plane(
+            Point(2, 0, 0), Vector(1, 0, 0)), Point(1, 0, 0)])
+        self.assertEqual(result, [line, Point(2, 0, 0), NotImplemented])
+        self.assertEqual(parallel([line, self.planes[1]], self.planes[0]),
+                         [True, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from sgl import Plane, Point, Vector, cli, protocol
+
+PLANE = protocol.encode_body(Plane(Point(0, 0, 0), Vector(0, 0, 1)))
+
+
+def query(z, **extra):
+    extra.update(op="distance",
+                 args=[protocol.encode_body(Point(0, 0, z)), PLANE])
+    return json.dumps(extra)
+
+
+class CliTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.input = os.path.join(self.dir, "in.jsonl")
+        self.output = os.path.join(self.dir, "out.jsonl")
+        lines = [query(z) for z in range(20)]
+        lines[3] = query(3, id="three")
+        lines[5] = ""
+        lines[7] = "not json"
+        with open(self.input, "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def run_cli(self, *args):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(cli.main([self.input, "-o", self.output] +
+                                      list(args)), 0)
+        with open(self.output) as f:
+            return [json.loads(line) for line in f], stderr.getvalue()
+
+    def check(self, responses):
+        self.assertEqual(len(responses), 19)
+        self.assertEqual(responses[0], {"id": 1, "result": 0})
+        self.assertEqual(responses[3], {"id": "three", "result": 3})
+        # The empty line 6 is skipped
+        self.assertEqual(responses[5]["id"], 7)
+        self.assertEqual(responses[6]["id"], 8)
+        self.assertIn("error", responses[6])
+        self.assertEqual(responses[-1], {"id": 20, "result": 19})
+
+    def test_single_process(self):
+        responses, stats = self.run_cli()
+        self.check(responses)
+        self.assertIn("queries: 19 (1 errors)", stats)
+        self.assertIn("p99", stats)
+
+    def test_workers(self):
+        responses, _ = self.run_cli("-j", "2", "-c", "3")
+        self.check(responses)
+
+    def test_quiet(self):
+        _, stats = self.run_cli("-q")
+        self.assertEqual(stats, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
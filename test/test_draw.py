@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from sgl import Line, Plane, Point, Vector
+from sgl.draw import CONE_LOD, POINT_LOD, Batch, Camera, OffscreenRenderer, \
+    PointCloud, Scene, collect_grid, grid_count, level_of_detail, \
+    render_to_file
+
+try:
+    import vtk
+except ImportError:
+    vtk = None
+
+try:
+    from unittest import mock
+except ImportError:
+    mock = None
+
+# The name sgl.draw is the draw() function
+draw_module = sys.modules["sgl.draw"]
+
+BOX = ((-10, -10, -10), (10, 10, 10))
+
+
+class BatchTest(unittest.TestCase):
+    def test_add(self):
+        batch = Batch()
+        self.assertEqual(len(batch), 0)
+        batch.add_segment((0, 0, 0), (1, 0, 0), [1, 0, 0])
+        batch.add_segment((0, 0, 0), (0, 1, 0), (1, 0, 0))
+        batch.add_point((1, 2, 3), (0, 1, 0), 0.2)
+        batch.add_points([(1, 1, 1), (2, 2, 2)], (0, 1, 0), 0.2)
+        batch.add_points([(3, 3, 3)], (0, 1, 0), 0.5)
+        batch.add_polygon([(0, 0, 0), (1, 0, 0), (0, 1, 0)], (0, 0, 1))
+        # Styles are grouped, lists and tuples are the same color
+        self.assertEqual(list(batch.segments), [(1, 0, 0)])
+        self.assertEqual(len(batch.segments[1, 0, 0]), 2)
+        self.assertEqual(batch.points[(0, 1, 0), 0.2],
+                         [(1, 2, 3), (1, 1, 1), (2, 2, 2)])
+        self.assertEqual(batch.points[(0, 1, 0), 0.5], [(3, 3, 3)])
+        self.assertEqual(len(batch.polygons[0, 0, 1]), 1)
+        self.assertEqual(len(batch), 7)
+
+    def test_arrow(self):
+        batch = Batch()
+        batch.add_arrow((1, 1, 1), (1, 3, 1), (1, 0, 0))
+        # A shaft and a head
+        self.assertEqual(batch.segments[1, 0, 0], [((1, 1, 1), (1, 3, 1))])
+        self.assertEqual(batch.cones[1, 0, 0], [((1, 3, 1), (0, 2, 0))])
+        self.assertEqual(len(batch), 2)
+
+    @unittest.skipIf(vtk is None, "vtk is not installed")
+    def test_build(self):
+        batch = Batch()
+        batch.add_segment((0, 0, 0), (1, 0, 0), (1, 0, 0))
+        batch.add_points([(i, 0, 0) for i in range(5)], (0, 1, 0), 0.2)
+        batch.add_arrow((0, 0, 0), (0, 0, 1), (0, 0, 1))
+        layers = batch.build()
+        self.assertEqual(set(key[0] for key in layers),
+                         set(["segments", "points", "cones"]))
+        self.assertIn(("points", ((0, 1, 0), 0.2), 16), layers)
+
+
+class LevelOfDetailTest(unittest.TestCase):
+    def test_level_of_detail(self):
+        self.assertEqual(level_of_detail(POINT_LOD, 1), 16)
+        self.assertEqual(level_of_detail(POINT_LOD, 1000), 16)
+        self.assertEqual(level_of_detail(POINT_LOD, 1001), 8)
+        self.assertEqual(level_of_detail(POINT_LOD, 200000), 4)
+        self.assertIsNone(level_of_detail(POINT_LOD, 200001))
+        self.assertEqual(level_of_detail(CONE_LOD, 50000), 6)
+        self.assertIsNone(level_of_detail(CONE_LOD, 50001))
+        self.assertIsNone(level_of_detail((), 0))
+
+
+class GridTest(unittest.TestCase):
+    def test_grid_count(self):
+        self.assertEqual(grid_count(-10, 10, 1), (-10, 21))
+        self.assertEqual(grid_count(-10, 10, 2.5), (-10, 9))
+        self.assertEqual(grid_count(-2.5, 3.5, 1), (-2, 6))
+        start, count = grid_count(-10, 10, 3)
+        self.assertEqual((start, count), (-10, 7))
+        self.assertIsInstance(count, int)
+
+    def test_collect_grid(self):
+        batch = Batch()
+        collect_grid(batch, BOX, (1, 0, 0))
+        # 21 lines in each direction of the x1x2 plane
+        self.assertEqual(len(batch), 42)
+        batch = Batch()
+        collect_grid(batch, BOX, (0, 0, 0))
+        self.assertEqual(len(batch), 0)
+
+
+class CollectTest(unittest.TestCase):
+    def test_point(self):
+        batch = Batch()
+        Point(1, 2, 3).collect(batch, BOX)
+        Point(4, 5, 6).collect(batch, BOX, color=(0, 0, 0), radius=1)
+        self.assertEqual(batch.points[(1, 0, 1), 0.2], [Point(1, 2, 3)])
+        self.assertEqual(batch.points[(0, 0, 0), 1], [Point(4, 5, 6)])
+
+    def test_vector(self):
+        batch = Batch()
+        Vector(1, 0, 0).collect(batch, BOX, origin=(1, 2, 3))
+        self.assertEqual(batch.segments[1, 0, 0],
+                         [(Point(1, 2, 3), Point(2, 2, 3))])
+        self.assertEqual(len(batch.cones[1, 0, 0]), 1)
+
+    def test_line(self):
+        batch = Batch()
+        Line(Point(0, 0, 0), Vector(1, 0, 0)).collect(batch, BOX)
+        (a, b), = batch.segments[0, 0, 1]
+        self.assertEqual(set([tuple(a), tuple(b)]),
+                         set([(-10, 0, 0), (10, 0, 0)]))
+        # Missing the box, and only touching an edge
+        batch = Batch()
+        Line(Point(0, 20, 0), Vector(1, 0, 0)).collect(batch, BOX)
+        Line(Point(10, 10, 0), Vector(1, -1, 0)).collect(batch, BOX)
+        self.assertEqual(len(batch), 0)
+
+    def test_plane(self):
+        batch = Batch()
+        Plane(0, 0, 1, 0).collect(batch, BOX)
+        polygon, = batch.polygons[1, 1, 0]
+        self.assertEqual(len(polygon), 4)
+        self.assertEqual(len(batch.cones[1, 0, 0]), 1)
+        batch = Batch()
+        Plane(0, 0, 1, 0).collect(batch, BOX, draw_normal=False)
+        Plane(0, 0, 1, 20).collect(batch, BOX, draw_normal=False)
+        self.assertEqual(len(batch), 1)
+
+    def test_point_cloud(self):
+        points = [(i, i, i) for i in range(10)]
+        cloud = PointCloud(points)
+        self.assertEqual(len(cloud), 10)
+        self.assertEqual(repr(cloud), "PointCloud(<10 points>)")
+        batch = Batch()
+        cloud.collect(batch, BOX)
+        cloud.collect(batch, BOX, color=(0, 1, 0), radius=0.5)
+        self.assertEqual(batch.points[(1, 0, 1), 0.2], points)
+        self.assertEqual(batch.points[(0, 1, 0), 0.5], points)
+
+
+
+class FakeVtkTest(unittest.TestCase):
+    """Runs the vtk code against a mock of the vtk module, to check
+    which calls it makes without a render window.
+    """
+    def setUp(self):
+        self.vtk = mock.MagicMock()
+        # A new actor each time, so that they can be told apart
+        self.vtk.vtkActor.side_effect = lambda: mock.MagicMock()
+        patcher = mock.patch.dict(sys.modules, {"vtk": self.vtk})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(draw_module._offscreen.clear)
+
+
+@unittest.skipIf(mock is None, "needs unittest.mock")
+class OffscreenTest(FakeVtkTest):
+    def test_render(self):
+        renderer = OffscreenRenderer()
+        add = renderer.renderer.AddActor
+        renderer.render([Point(1, 2, 3)], "scene.png", grid=(1, 0, 0))
+        # The axes, the grid lines and the point, each once
+        self.assertEqual(add.call_count, 3)
+        add.reset_mock()
+        renderer.render([Point(1, 2, 3)], "other.png", grid=(1, 0, 0))
+        self.assertEqual(add.call_count, 3)
+        renderer.render([], "scene.jpg", grid=(1, 0, 0))
+        # One writer per format, one grid per box and grid
+        self.assertEqual(self.vtk.vtkPNGWriter.call_count, 1)
+        self.assertEqual(self.vtk.vtkJPEGWriter.call_count, 1)
+        self.assertEqual(len(renderer._grids), 1)
+        self.vtk.vtkJPEGWriter().SetFileName.assert_called_with("scene.jpg")
+
+    def test_render_to_file(self):
+        render_to_file([Point(0, 0, 0)], "a.png", size=(20, 10))
+        render_to_file([Point(0, 0, 0)], "b.png", size=(20, 10))
+        render_to_file([Point(0, 0, 0)], "c.png", size=(30, 10))
+        self.assertEqual(sorted(draw_module._offscreen),
+                         [(20, 10), (30, 10)])
+
+    def test_camera(self):
+        renderer = mock.MagicMock()
+        camera = renderer.GetActiveCamera()
+        Camera(position=(1, 2, 3), focal_point=(4, 5, 6), view_up=(0, 0, 1),
+               zoom=2, view_angle=30).apply(renderer)
+        # In vtk's order of the axes
+        camera.SetPosition.assert_called_with(2, 3, 1)
+        camera.SetFocalPoint.assert_called_with(5, 6, 4)
+        camera.SetViewUp.assert_called_with(0, 1, 0)
+        camera.SetViewAngle.assert_called_with(30)
+        camera.Zoom.assert_called_with(2)
+        self.assertFalse(renderer.ResetCamera.called)
+        renderer = mock.MagicMock()
+        Camera().apply(renderer)
+        self.assertTrue(renderer.ResetCamera.called)
+        self.assertFalse(renderer.GetActiveCamera().Zoom.called)
+
+
+@unittest.skipIf(mock is None, "needs unittest.mock")
+class SceneTest(FakeVtkTest):
+    def setUp(self):
+        super(SceneTest, self).setUp()
+        self.scene = Scene(grid=(1, 0, 0))
+        self.add = self.scene.renderer.AddActor
+        self.remove = self.scene.renderer.RemoveActor
+        # The axes and the grid
+        self.assertEqual(self.add.call_count, 2)
+        self.add.reset_mock()
+
+    def test_add_remove(self):
+        point = Point(1, 2, 3)
+        self.scene.add(point)
+        self.assertEqual(len(self.scene), 1)
+        self.assertIn(point, self.scene)
+        # Elements are told apart by identity, not equality
+        self.assertNotIn(Point(1, 2, 3), self.scene)
+        self.scene.add(Point(1, 2, 3))
+        self.assertEqual(self.add.call_count, 2)
+        with self.assertRaises(ValueError):
+            self.scene.add(point)
+        self.scene.remove(point)
+        self.assertNotIn(point, self.scene)
+        self.assertEqual(len(self.scene), 1)
+        self.assertEqual(self.remove.call_count, 1)
+        with self.assertRaises(ValueError):
+            self.scene.remove(point)
+        with self.assertRaises(ValueError):
+            self.scene.update(point)
+
+    def test_update(self):
+        point = Point(1, 2, 3)
+        self.scene.add(point)
+        actor, = self.scene._entries[id(point)].actors.values()
+        # New geometry goes into the existing actor
+        point[0] = 5
+        self.scene.update(point)
+        self.assertEqual(self.add.call_count, 1)
+        self.assertFalse(self.remove.called)
+        self.assertTrue(actor.GetMapper().SetInputData.called)
+        # A new style is a new actor, the style is kept for later updates
+        self.scene.update(point, color=(0, 1, 0))
+        self.assertEqual(self.add.call_count, 2)
+        self.remove.assert_called_once_with(actor)
+        self.scene.update(point, radius=1)
+        self.assertEqual(self.scene._entries[id(point)].style,
+                         {"color": (0, 1, 0), "radius": 1})
+
+    def test_update_kinds(self):
+        plane = Plane(0, 0, 1, 0)
+        self.scene.add(plane)
+        # The polygon, and the shaft and head of the normal
+        self.assertEqual(self.add.call_count, 3)
+        self.scene.update(plane, draw_normal=False)
+        self.assertEqual(self.remove.call_count, 2)
+        self.assertEqual(len(self.scene._entries[id(plane)].actors), 1)
+
+    def test_throttle(self):
+        clock = mock.Mock(return_value=10.0)
+        patcher = mock.patch.object(draw_module, "_clock", clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        render = self.scene.window.Render
+        self.assertTrue(self.scene.render())
+        # Nothing changed
+        self.assertFalse(self.scene.render())
+        self.scene.add(Point(0, 0, 0))
+        clock.return_value = 10.01
+        self.assertFalse(self.scene.render())
+        self.assertTrue(self.scene.render(force=True))
+        self.scene.add(Point(1, 0, 0))
+        clock.return_value = 10.1
+        self.assertTrue(self.scene.render())
+        self.assertEqual(render.call_count, 3)
+
+
+class ImageFormatTest(unittest.TestCase):
+    def test_unsupported(self):
+        # Checked before vtk is needed
+        for filename in ("scene.gif", "scene"):
+            with self.assertRaises(ValueError):
+                render_to_file([], filename)
+
+
+@unittest.skipIf(vtk is None, "vtk is not installed")
+class RenderToFileTest(unittest.TestCase):
+    def test_png(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        filename = os.path.join(directory, "scene.png")
+        render_to_file([Point(1, 2, 3), Plane(0, 0, 1, 0)], filename,
+                       size=(64, 48), camera=Camera(position=(20, 20, 20)))
+        self.assertGreater(os.path.getsize(filename), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
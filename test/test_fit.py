@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+import pickle
+import random
+import unittest
+from sgl import Line, Plane, Point, Vector, dot
+from sgl.fit import LineFitter, PlaneFitter, eigenvector, symmetric_eigenvalues
+
+
+class EigenTest(unittest.TestCase):
+    def test_symmetric(self):
+        m = [[4, 1, 2], [1, 3, 0], [2, 0, 5]]
+        for value in symmetric_eigenvalues(m):
+            v = eigenvector(m, value)
+            for i in range(3):
+                self.assertAlmostEqual(sum(m[i][j] * v[j] for j in range(3)),
+                                       value * v[i])
+        self.assertAlmostEqual(sum(symmetric_eigenvalues(m)), 12)
+
+    def test_diagonal_and_double(self):
+        self.assertEqual(symmetric_eigenvalues([[1, 0, 0], [0, 3, 0],
+                                                [0, 0, 2]]), [3, 2, 1])
+        m = [[2, 0, 0], [0, 1, 0], [0, 0, 1]]
+        v = eigenvector(m, 1)
+        self.assertAlmostEqual(v[0], 0)
+        self.assertAlmostEqual(v[1] ** 2 + v[2] ** 2, 1)
+
+
+class PlaneFitterTest(unittest.TestCase):
+    def setUp(self):
+        rnd = random.Random(4)
+        self.plane = Plane(Point(1e3, -2e3, 5e2), Vector(1, 2, -1))
+        _, u, v = self.plane.parametric()
+        self.points = [Point(self.plane.p.pv() + rnd.uniform(-5, 5) * u +
+                             rnd.uniform(-5, 5) * v) for _ in range(500)]
+
+    def assertSamePlane(self, plane):
+        # Vector.parallel() is stricter than the rounding of the fit
+        cos = dot(plane.n, self.plane.n) / (plane.n.length() *
+                                            self.plane.n.length())
+        self.assertAlmostEqual(abs(cos), 1)
+        for point in self.points[:10]:
+            self.assertAlmostEqual(plane.distance(point), 0, places=6)
+
+    def test_fit(self):
+        plane = Plane.fit(self.points)
+        self.assertSamePlane(plane)
+        self.assertAlmostEqual(PlaneFitter(self.points).rms(), 0, places=6)
+        # Coordinate triples work as well
+        plane = Plane.fit([tuple(p) for p in self.points])
+        self.assertSamePlane(plane)
+
+    def test_noise(self):
+        # A checkerboard 0.1 above and below z = 0
+        fitter = PlaneFitter([(x, y, 0.1 if (x + y) % 2 else -0.1)
+                              for x in range(10) for y in range(10)])
+        self.assertAlmostEqual(fitter.rms(), 0.1)
+        self.assertAlmostEqual(abs(fitter.plane().n[2]), 1)
+
+    def test_thin(self):
+        # 1000 across, far from the origin, with 1e-6 of noise
+        fitter = PlaneFitter([(1e4 + 100 * x, 1e4 + 100 * y,
+                               1e4 + (1e-6 if (x + y) % 2 else -1e-6))
+                              for x in range(11) for y in range(11)])
+        self.assertAlmostEqual(fitter.rms() / 1e-6, 1, places=3)
+
+    def test_merge(self):
+        whole = PlaneFitter(self.points)
+        parts = [PlaneFitter(self.points[i:i + 128])
+                 for i in range(0, 500, 128)]
+        # As if they came back from worker processes
+        merged = pickle.loads(pickle.dumps(parts[0]))
+        for part in parts[1:]:
+            merged.merge(part)
+        self.assertEqual(len(merged), 500)
+        for a, b in zip(merged.mean, whole.mean):
+            self.assertAlmostEqual(a, b)
+        for row_a, row_b in zip(merged.covariance(), whole.covariance()):
+            for a, b in zip(row_a, row_b):
+                self.assertAlmostEqual(a, b)
+        self.assertSamePlane(merged.plane())
+
+    def test_streaming(self):
+        fitter = PlaneFitter()
+        for point in self.points:
+            fitter.add(point)
+        self.assertSamePlane(fitter.plane())
+
+    def test_degenerate(self):
+        with self.assertRaises(ValueError):
+            Plane.fit([(0, 0, 0), (1, 0, 0)])
+        with self.assertRaises(ValueError):
+            Plane.fit([(i, 2 * i, 3 * i) for i in range(10)])
+        with self.assertRaises(ValueError):
+            PlaneFitter().rms()
+
+
+class LineFitterTest(unittest.TestCase):
+    def setUp(self):
+        self.line = Line(Point(-3e3, 2e3, 1e3), Vector(1, -2, 0.5))
+        self.points = [Point(self.line.sv + (i * 0.37 - 40) * self.line.dv)
+                       for i in range(200)]
+
+    def test_fit(self):
+        line = Line.fit(self.points)
+        cos = dot(line.dv, self.line.dv) / (line.dv.length() *
+                                            self.line.dv.length())
+        self.assertAlmostEqual(abs(cos), 1)
+        for point in self.points[::20]:
+            self.assertAlmostEqual(line.distance(point), 0, places=6)
+        self.assertAlmostEqual(LineFitter(self.points).rms(), 0, places=6)
+
+    def test_rms(self):
+        # Points 1 away from the x axis, all around it
+        fitter = LineFitter([(x, y, z) for x in range(5)
+                             for y, z in ((1, 0), (0, 1), (-1, 0), (0, -1))])
+        self.assertAlmostEqual(fitter.rms(), 1)
+        self.assertAlmostEqual(abs(fitter.line().dv[0]), 1)
+
+    def test_thin(self):
+        # 1000 long, far from the origin, with 1e-6 of noise
+        fitter = LineFitter([(1e4 + 10 * x, 1e4 + y * 1e-6, 1e4 + z * 1e-6)
+                             for x in range(101)
+                             for y, z in ((1, 0), (0, 1), (-1, 0), (0, -1))])
+        self.assertAlmostEqual(fitter.rms() / 1e-6, 1, places=3)
+
+    def test_merge(self):
+        # Alternating 0.1 to either side of the line
+        points = [p.moved((-1) ** i * 0.1 * Vector(2, 1, 0).normalized())
+                  for i, p in enumerate(self.points)]
+        fitter = LineFitter(points[:50])
+        rest = LineFitter()
+        for i in range(50, 200, 30):
+            rest.extend(points[i:i + 30])
+        fitter.merge(rest)
+        whole = LineFitter(points)
+        self.assertAlmostEqual(whole.rms(), 0.1, places=4)
+        self.assertEqual(len(fitter), 200)
+        self.assertAlmostEqual(fitter.rms(), whole.rms())
+        for a, b in zip(fitter.mean, whole.mean):
+            self.assertAlmostEqual(a, b)
+
+    def test_degenerate(self):
+        with self.assertRaises(ValueError):
+            Line.fit([(1, 2, 3)])
+        with self.assertRaises(ValueError):
+            Line.fit([(1, 2, 3)] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
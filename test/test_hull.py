@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+import itertools
+import math
+import random
+import unittest
+from sgl import Line, Plane, Point, Vector, chebyshev_center, \
+    convex_hull, intersection, vertices
+
+
+def halfspace(n, d):
+    """n x <= d"""
+    return Plane(n[0], n[1], n[2], d)
+
+
+def box(x, y, z):
+    """The half-spaces of the cuboid [x0, x1] x [y0, y1] x [z0, z1]"""
+    return [halfspace((1, 0, 0), x[1]), halfspace((-1, 0, 0), -x[0]),
+            halfspace((0, 1, 0), y[1]), halfspace((0, -1, 0), -y[0]),
+            halfspace((0, 0, 1), z[1]), halfspace((0, 0, -1), -z[0])]
+
+
+class ThreePlanesTest(unittest.TestCase):
+    def test_point(self):
+        a, b, c = Plane(1, 2, 3, 4), Plane(-1, 0.5, 2, 1), Plane(3, -1, 1, 7)
+        point = intersection(a, b, c)
+        for plane in (a, b, c):
+            self.assertAlmostEqual(plane.distance(point), 0)
+        self.assertEqual(a.intersection(b, c), point)
+
+    def test_special_cases(self):
+        x, y = Plane(1, 0, 0, 1), Plane(0, 1, 0, 2)
+        # Three planes through one line
+        line = intersection(x, y, Plane(1, 1, 0, 3))
+        self.assertIsInstance(line, Line)
+        self.assertTrue(Point(1, 2, 7) in line)
+        self.assertIsNone(intersection(x, y, Plane(1, 1, 0, 4)))
+        self.assertIsNone(intersection(x, Plane(1, 0, 0, 5), y))
+        self.assertEqual(intersection(x, Plane(2, 0, 0, 2), x), x)
+        self.assertIs(intersection(x, y, Line(Point(0, 0, 0),
+                                              Vector(1, 0, 0))),
+                      NotImplemented)
+
+
+class VerticesTest(unittest.TestCase):
+    def test_chebyshev_center(self):
+        center, radius = chebyshev_center(box((-1, 1), (0, 2), (1, 5)))
+        self.assertAlmostEqual(radius, 1)
+        self.assertAlmostEqual(center.x, 0)
+        self.assertAlmostEqual(center.y, 1)
+        self.assertTrue(2 - 1e-9 <= center.z <= 4 + 1e-9)
+
+    def test_box(self):
+        # The last half-space doesn't touch the box
+        halfspaces = box((-1, 1), (0, 2), (1, 3)) + [
+            halfspace((1, 1, 1), 100)]
+        result = vertices(halfspaces)
+        self.assertEqual(set(tuple(p) for p in result.points), set(
+            itertools.product((-1, 1), (0, 2), (1, 3))))
+        self.assertEqual(len(result.edges), 12)
+        self.assertEqual(result.facets[-1], [])
+        for facet, plane in zip(result.facets[:6], halfspaces):
+            self.assertEqual(len(facet), 4)
+            for v in facet:
+                self.assertAlmostEqual(plane.distance(result.points[v]), 0)
+            # Counterclockwise seen from outside
+            a, b, c = [result.points[v].pv() for v in facet[:3]]
+            self.assertGreater((b - a).cross(c - b) * plane.n, 0)
+        # Neighbouring vertices of a facet are joined by an edge
+        for facet in result.facets[:6]:
+            for a, b in zip(facet, facet[1:] + facet[:1]):
+                self.assertIn((min(a, b), max(a, b)), result.edges)
+
+    def test_octahedron(self):
+        # Four planes meet in every vertex
+        result = vertices([halfspace((a, b, c), 1) for a in (1, -1)
+                           for b in (1, -1) for c in (1, -1)])
+        self.assertEqual(len(result.points), 6)
+        self.assertEqual(len(result.edges), 12)
+        for point in result.points:
+            self.assertAlmostEqual(abs(point.x) + abs(point.y) +
+                                   abs(point.z), 1)
+
+    def test_random(self):
+        rnd = random.Random(3)
+        halfspaces = []
+        for _ in range(25):
+            n = Vector(rnd.gauss(0, 1), rnd.gauss(0, 1), rnd.gauss(0, 1))
+            n = n.normalized()
+            halfspaces.append(Plane(Point(0.5 * n + Vector(2, 0, -1)), n))
+        result = vertices(halfspaces)
+        # All vertices from intersecting every triple of planes
+        expected = set()
+        for a, b, c in itertools.combinations(halfspaces, 3):
+            p = intersection(a, b, c)
+            if isinstance(p, Point) and all(
+                    (p.pv() - h.p.pv()) * h.n <= 1e-9 for h in halfspaces):
+                expected.add(tuple(round(x, 6) for x in p))
+        self.assertEqual(set(tuple(round(x, 6) for x in p)
+                             for p in result.points), expected)
+        # Euler's formula
+        faces = sum(1 for facet in result.facets if facet)
+        self.assertEqual(len(result.points) - len(result.edges) + faces, 2)
+
+    def test_invalid(self):
+        cube = box((0, 1), (0, 1), (0, 1))
+        with self.assertRaises(ValueError):
+            vertices(cube[:5])
+        with self.assertRaises(ValueError):
+            # An infinite prism
+            vertices(cube[:4] + [halfspace((1, 1, 0), 5)])
+        with self.assertRaises(ValueError):
+            vertices(cube[:5] + [halfspace((0, 0, -1), -2)])
+        with self.assertRaises(ValueError):
+            vertices(cube[:5] + [halfspace((0, 0, -1), -1)])
+
+
+class ConvexHullTest(unittest.TestCase):
+    def check(self, hull, points):
+        # Every point is behind every face, and every face has its
+        # vertices on its plane
+        self.assertTrue(all(hull.contains(points)))
+        for (i, j, k), plane in zip(hull.faces, hull.planes):
+            for v in (i, j, k):
+                self.assertAlmostEqual(plane.distance(hull.vertices[v]), 0)
+            for p in points:
+                self.assertLessEqual((Point(*p).pv() - plane.p.pv()) *
+                                     plane.n, 1e-9)
+        # A closed surface made of triangles
+        self.assertEqual(len(hull.vertices) - len(hull.faces) * 3 // 2 +
+                         len(hull.faces), 2)
+
+    def test_cube(self):
+        # A grid, so most points are on the surface, and all of them twice
+        points = [(x, y, z) for x in range(3) for y in range(3)
+                  for z in range(3)] * 2
+        hull = convex_hull(points)
+        self.assertEqual(set(tuple(p) for p in hull.vertices),
+                         set(itertools.product((0, 2), repeat=3)))
+        self.assertEqual(len(hull.faces), 12)
+        for v, i in zip(hull.vertices, hull.indices):
+            self.assertEqual(tuple(v), points[i])
+        self.check(hull, points)
+
+    def test_random(self):
+        rnd = random.Random(5)
+        points = [Point(rnd.uniform(-5, 5), rnd.uniform(-5, 5),
+                        rnd.uniform(10, 20)) for _ in range(300)]
+        hull = convex_hull(points)
+        self.check(hull, [tuple(p) for p in points])
+        self.assertTrue(set(hull.indices) <= set(range(len(points))))
+
+    def test_contains(self):
+        rnd = random.Random(6)
+        points = []
+        for _ in range(200):
+            p = Vector(rnd.gauss(0, 1), rnd.gauss(0, 1), rnd.gauss(0, 1))
+            points.append(tuple(p.normalized() * 2))
+        hull = convex_hull(points)
+        queries = [(rnd.uniform(-2.5, 2.5), rnd.uniform(-2.5, 2.5),
+                    rnd.uniform(-2.5, 2.5)) for _ in range(300)]
+        forms = [plane.general_form() for plane in hull.planes]
+        expected = [all(a * x + b * y + c * z <= d + 1e-9
+                        for a, b, c, d in forms) for x, y, z in queries]
+        self.assertEqual(hull.contains(queries), expected)
+        self.assertIn(Point(0, 0, 0), hull)
+        self.assertNotIn((0, 0, 2.01), hull)
+        self.assertTrue(all(hull.contains(points)))
+        self.assertFalse(any(hull.contains(
+            [(x * 1.001, y * 1.001, z * 1.001) for x, y, z in points])))
+
+    def test_degenerate(self):
+        for points in ([(0, 0, 0), (1, 0, 0), (0, 1, 0)],
+                       [(1, 2, 3)] * 5,
+                       [(i, 2 * i, 3 * i) for i in range(5)],
+                       [(i, j, i + j) for i in range(3) for j in range(3)]):
+            with self.assertRaises(ValueError):
+                convex_hull(points)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+import unittest
+from sgl import Line, Point, Vector, clip_lines
+
+BOX = ((-10, -10, -10), (10, 10, 10))
+
+
+class LineClipTest(unittest.TestCase):
+    def test_clip_diagonal(self):
+        line = Line(Point(0, 0, 0), Vector(1, 1, 1))
+        t0, t1, a, b = line.clip(BOX)
+        self.assertEqual((t0, t1), (-10, 10))
+        self.assertEqual(a, Point(-10, -10, -10))
+        self.assertEqual(b, Point(10, 10, 10))
+
+    def test_clip_axis_parallel(self):
+        line = Line(Point(3, 4, 0), Vector(0, 0, 2))
+        t0, t1, a, b = line.clip(BOX)
+        self.assertEqual((t0, t1), (-5, 5))
+        self.assertEqual(a, Point(3, 4, -10))
+        self.assertEqual(b, Point(3, 4, 10))
+
+    def test_clip_miss(self):
+        self.assertIsNone(Line(Point(11, 0, 0), Vector(0, 1, 0)).clip(BOX))
+        self.assertIsNone(Line(Point(0, 0, 25), Vector(1, 1, 0)).clip(BOX))
+
+    def test_clip_touching_corner(self):
+        line = Line(Point(10, 10, 10), Vector(1, -1, 0))
+        t0, t1, a, b = line.clip(BOX)
+        self.assertEqual(t0, t1)
+        self.assertEqual(a, b)
+
+    def test_clip_lines_matches_clip(self):
+        lines = [
+            Line(Point(0, 0, 0), Vector(1, 2, 3)),
+            Line(Point(11, 0, 0), Vector(0, 1, 0)),
+            Line(Point(-3, 5, 9), Vector(0.5, 0, -0.25)),
+            Line(Point(0, 0, 25), Vector(1, 1, 0)),
+        ]
+        self.assertEqual(clip_lines(lines, BOX),
+                         [line.clip(BOX) for line in lines])
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import subprocess
+import sys
+import unittest
+import sgl
+
+
+def run(code):
+    """Run code in a fresh interpreter and return its output."""
+    return subprocess.check_output([sys.executable, "-c", code],
+                                   universal_newlines=True).strip()
+
+
+class PackageTest(unittest.TestCase):
+    def test_draw(self):
+        # Importing the module sgl.draw doesn't replace the function
+        from sgl.draw import Batch
+        import sgl.draw
+        from sgl import draw
+        self.assertTrue(callable(draw))
+        self.assertIs(draw, sgl.draw)
+        self.assertEqual(draw.__module__, "sgl.draw")
+        self.assertEqual(run("from sgl.draw import Batch\n"
+                             "import sgl\n"
+                             "print(callable(sgl.draw))"), "True")
+
+    def test_exports(self):
+        for name in sgl.__all__:
+            self.assertEqual(getattr(sgl, name).__name__, name)
+        self.assertIn("convex_hull", dir(sgl))
+        with self.assertRaises(AttributeError):
+            sgl.no_such_name
+
+    @unittest.skipIf(sys.version_info < (3, 7), "everything is eager")
+    def test_lazy(self):
+        self.assertEqual(run("import sgl, sys\n"
+                             "print('sgl.hull' in sys.modules)\n"
+                             "sgl.convex_hull\n"
+                             "print('sgl.hull' in sys.modules)"),
+                         "False\nTrue")
+
+
+if __name__ == "__main__":
+    unittest.main()
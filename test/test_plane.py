@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import unittest
+from fractions import Fraction
+from sgl import Plane, Point, Vector, clip_planes, dot, \
+    planes_from_coefficients
+
+BOX = ((-10, -10, -10), (10, 10, 10))
+
+
+def normal_of(polygon):
+    """The (unnormalized) normal of a planar polygon (Newell's method)."""
+    n = [0, 0, 0]
+    for a, b in zip(polygon, polygon[1:] + polygon[:1]):
+        n[0] += (a.y - b.y) * (a.z + b.z)
+        n[1] += (a.z - b.z) * (a.x + b.x)
+        n[2] += (a.x - b.x) * (a.y + b.y)
+    return Vector(n)
+
+
+class PlaneTest(unittest.TestCase):
+    def test_general_form(self):
+        plane = Plane(1, 2, 2, 9)
+        self.assertEqual(plane.n, Vector(1, 2, 2))
+        self.assertEqual(plane.p, Point(1, 2, 2))
+        self.assertEqual(plane.general_form(), (1, 2, 2, 9))
+        # Exact types stay exact
+        plane = Plane(Fraction(1), 0, 0, 3)
+        self.assertEqual(plane.p, Point(3, 0, 0))
+        self.assertEqual(type(plane.p.x), Fraction)
+
+    def test_three_points(self):
+        plane = Plane(Point(1, 0, 0), Point(0, 1, 0), Point(0, 0, 1))
+        self.assertEqual(plane, Plane(1, 1, 1, 1))
+        with self.assertRaises(TypeError):
+            Plane(Point(1, 0, 0), Point(0, 1, 0), Vector(0, 0, 1))
+
+    def test_zero_normal(self):
+        with self.assertRaises(ValueError):
+            Plane(0, 0, 0, 1)
+        with self.assertRaises(ValueError):
+            Plane(Point(0, 0, 0), Vector(0, 0, 0))
+        with self.assertRaises(ValueError):
+            Plane(Point(0, 0, 0), Point(1, 1, 1), Point(2, 2, 2))
+
+    def test_parametric(self):
+        for n in (Vector(1, 0, 0), Vector(0, 0, -3), Vector(1, 2, 3),
+                  Vector(1e-8, 1, 1e8)):
+            plane = Plane(Point(1, 2, 3), n)
+            p, u, v = plane.parametric()
+            self.assertEqual(p, Vector(1, 2, 3))
+            self.assertAlmostEqual(u.length(), 1)
+            self.assertAlmostEqual(v.length(), 1)
+            self.assertAlmostEqual(dot(u, v), 0)
+            self.assertAlmostEqual(dot(u, n) / n.length(), 0)
+            self.assertAlmostEqual(dot(v, n) / n.length(), 0)
+            self.assertGreater(dot(u.cross(v), n), 0)
+
+    def test_from_coefficients(self):
+        rows = [(1.0, 2.0, 2.0, 9.0), (0, 0, 1, 5), (0.5, -1.0, 0.25, 0.0)]
+        planes = planes_from_coefficients(rows)
+        for plane, row in zip(planes, rows):
+            expected = Plane(*row)
+            self.assertEqual(plane.n, expected.n)
+            self.assertEqual(plane.p, expected.p)
+        with self.assertRaises(ValueError):
+            planes_from_coefficients([(0.0, 0.0, 0.0, 1.0)])
+
+
+class PlaneClipTest(unittest.TestCase):
+    def assertCounterclockwise(self, polygon, n):
+        self.assertGreater(normal_of(polygon) * n, 0)
+
+    def test_clip_axis_aligned(self):
+        plane = Plane(Point(0, 0, 3), Vector(0, 0, 1))
+        polygon = plane.clip(BOX)
+        self.assertEqual(set(polygon), set([
+            Point(-10, -10, 3), Point(10, -10, 3),
+            Point(10, 10, 3), Point(-10, 10, 3),
+        ]))
+        self.assertCounterclockwise(polygon, plane.n)
+
+    def test_clip_hexagon(self):
+        plane = Plane(Point(0, 0, 0), Vector(1, 1, 1))
+        polygon = plane.clip(BOX)
+        self.assertEqual(len(polygon), 6)
+        for point in polygon:
+            self.assertAlmostEqual(point.x + point.y + point.z, 0)
+        self.assertCounterclockwise(polygon, plane.n)
+        self.assertCounterclockwise(Plane(Point(0, 0, 0),
+                                          Vector(-1, -1, -1)).clip(BOX),
+                                    Vector(-1, -1, -1))
+
+    def test_clip_face(self):
+        polygon = Plane(Point(0, 10, 0), Vector(0, 2, 0)).clip(BOX)
+        self.assertEqual(len(polygon), 4)
+        for point in polygon:
+            self.assertEqual(point.y, 10)
+
+    def test_clip_corner_and_miss(self):
+        corner = Plane(Point(10, 10, 10), Vector(1, 1, 1)).clip(BOX)
+        self.assertEqual(corner, [Point(10, 10, 10)])
+        self.assertEqual(Plane(Point(0, 0, 11), Vector(0, 0, 1)).clip(BOX),
+                         [])
+
+    def test_clip_planes_matches_clip(self):
+        planes = [
+            Plane(Point(1, 2, 3), Vector(1, -2, 0.5)),
+            Plane(Point(0, 0, 11), Vector(0, 0, 1)),
+            Plane(Point(0, 9, 0), Vector(0, 1, 1)),
+        ]
+        self.assertEqual(clip_planes(planes, BOX),
+                         [plane.clip(BOX) for plane in planes])
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+from fractions import Fraction
+from sgl import Line, Plane, Point, Triangle, Vector, coplanar, \
+    lines_intersect, orient3d, plane_side
+
+
+def exact_orient3d(a, b, c, d):
+    u = [Fraction(b[i]) - Fraction(a[i]) for i in range(3)]
+    v = [Fraction(c[i]) - Fraction(a[i]) for i in range(3)]
+    w = [Fraction(d[i]) - Fraction(a[i]) for i in range(3)]
+    det = ((u[1] * v[2] - u[2] * v[1]) * w[0] +
+           (u[2] * v[0] - u[0] * v[2]) * w[1] +
+           (u[0] * v[1] - u[1] * v[0]) * w[2])
+    return (det > 0) - (det < 0)
+
+
+class PredicatesTest(unittest.TestCase):
+    def setUp(self):
+        self.a, self.b, self.c = Point(0, 0, 0), Point(1, 0, 0), Point(0, 1, 0)
+
+    def test_orient3d(self):
+        self.assertEqual(orient3d(self.a, self.b, self.c, Point(0, 0, 1)), 1)
+        self.assertEqual(orient3d(self.a, self.c, self.b, Point(0, 0, 1)), -1)
+        self.assertEqual(orient3d(self.a, self.b, self.c, Point(5, 7, 0)), 0)
+        self.assertEqual(orient3d(self.a, self.b, self.c, (0.5, 0.5, -1e-300)),
+                         -1)
+
+    def test_nearly_coplanar(self):
+        # Points that were computed to lie on a plane, but don't exactly
+        # because of rounding. The naive float determinant often gets
+        # the sign of those wrong.
+        rand = random.Random(4)
+        for _ in range(500):
+            a, b, c = [Point(*[rand.uniform(-10, 10) for _ in range(3)])
+                       for _ in range(3)]
+            s, t = rand.random(), rand.random()
+            d = Point(*[a[i] + s * (b[i] - a[i]) + t * (c[i] - a[i])
+                        for i in range(3)])
+            self.assertEqual(orient3d(a, b, c, d), exact_orient3d(a, b, c, d))
+
+    def test_exact_types(self):
+        third = Fraction(1, 3)
+        self.assertTrue(coplanar((0, 0, 0), (3, 0, 0), (0, 3, 0),
+                                 (third, third, 0)))
+        self.assertFalse(coplanar((0, 0, 0), (1, 0, 0), (0, 1, 0),
+                                  (2 ** 60, 1, 1)))
+
+    def test_not_finite(self):
+        for x in (float("nan"), float("inf"), -float("inf")):
+            with self.assertRaises(ValueError):
+                orient3d((0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, x))
+            with self.assertRaises(ValueError):
+                plane_side(Plane(0, 0, 1, 0), (x, 0, 0))
+
+    def test_plane_side(self):
+        plane = Plane(Point(0, 0, 1), Vector(0, 0, 2))
+        self.assertEqual(plane_side(plane, Point(3, 4, 1)), 0)
+        self.assertEqual(plane_side(plane, Point(0, 0, 1 + 1e-15)), 1)
+        self.assertEqual(plane_side(plane, Point(0, 0, -5)), -1)
+        triangle = Triangle(self.a, self.b, self.c)
+        self.assertEqual(plane_side(triangle, Point(0, 0, -1e-200)), -1)
+        with self.assertRaises(TypeError):
+            plane_side(self.a, self.b)
+
+    def test_lines_intersect(self):
+        x = Line(Point(0, 0, 0), Vector(1, 0, 0))
+        self.assertTrue(lines_intersect(x, Line(Point(0.1, 0.2, 0),
+                                                Vector(0, 0.1, 0))))
+        self.assertFalse(lines_intersect(x, Line(Point(0, 0, 1e-300),
+                                                 Vector(0, 1, 0))))
+        self.assertFalse(lines_intersect(x, Line(Point(0, 1, 0),
+                                                 Vector(3, 0, 0))))
+        self.assertFalse(lines_intersect(x, x))
+
+
+if __name__ == "__main__":
+    unittest.main()
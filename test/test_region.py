@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import math
+import random
+import unittest
+from sgl import ConvexRegion, Plane, Point, convex_hull, side
+
+
+def cube(size):
+    return [Plane(x, y, z, size) for x, y, z in
+            [(1, 0, 0), (-1, 0, 0), (0, 1, 0),
+             (0, -1, 0), (0, 0, 1), (0, 0, -1)]]
+
+
+class SideTest(unittest.TestCase):
+    def test_side(self):
+        # The length of the normal doesn't change the tolerance
+        plane = Plane(0, 0, 4, 4)
+        points = [(0, 0, 2), Point(5, 5, 0), (1, 2, 1), (0, 0, 1 + 1e-12),
+                  (0, 0, 1 - 1e-12)]
+        self.assertEqual(side(plane, points), [1, -1, 0, 0, 0])
+        self.assertEqual(side(plane, points, tolerance=0), [1, -1, 0, 1, -1])
+        self.assertEqual(side(plane, []), [])
+
+
+class ConvexRegionTest(unittest.TestCase):
+    def test_cube(self):
+        region = ConvexRegion(cube(1))
+        self.assertEqual(region.contains([(0, 0, 0), (1, 1, 1),
+                                          Point(1, -1, 0.5), (1.1, 0, 0),
+                                          (0, 0, -1 - 1e-12), (5, 5, 5)]),
+                         [True, True, True, False, True, False])
+        self.assertIn(Point(0.5, 0.5, 0.5), region)
+        self.assertNotIn((0, 2, 0), region)
+
+    def test_sharp_corner(self):
+        # A wedge with its edge on the z axis and a half-angle of 0.01.
+        # Moved outwards by the tolerance, its planes meet 0.1 beyond the
+        # edge, and the bounding box must not cut that off
+        a = 0.01
+        region = ConvexRegion([Plane(math.sin(a), math.cos(a), 0, 0),
+                               Plane(math.sin(a), -math.cos(a), 0, 0),
+                               Plane(-1, 0, 0, 1), Plane(0, 0, 1, 1),
+                               Plane(0, 0, -1, 1)], tolerance=1e-3)
+        self.assertEqual(region.contains([(0.09, 0, 0), (0.09, 0, 1),
+                                          (0.11, 0, 0)]),
+                         [True, True, False])
+
+    def test_unbounded(self):
+        # A square prism along the z axis and a single half-space
+        region = ConvexRegion(cube(1)[:4])
+        self.assertEqual(region.contains([(0, 0, 1e9), (0, 2, 0)]),
+                         [True, False])
+        region = ConvexRegion([Plane(1, 1, 1, 0)])
+        self.assertEqual(region.contains([(-1, -1, -1), (1, 0, 0)]),
+                         [True, False])
+        self.assertEqual(ConvexRegion([]).contains([(1, 2, 3)]), [True])
+
+    def test_empty(self):
+        region = ConvexRegion(cube(1) + [Plane(-1, 0, 0, -2)])
+        self.assertEqual(region.contains([(0, 0, 0), (1.5, 0, 0)]),
+                         [False, False])
+
+    def test_hull(self):
+        rnd = random.Random(7)
+        points = [(rnd.gauss(0, 1), rnd.gauss(0, 1), rnd.gauss(0, 1))
+                  for _ in range(200)]
+        hull = convex_hull(points)
+        region = ConvexRegion(hull.planes)
+        queries = [(rnd.uniform(-3, 3), rnd.uniform(-3, 3),
+                    rnd.uniform(-3, 3)) for _ in range(500)]
+        self.assertEqual(region.contains(queries), hull.contains(queries))
+        self.assertTrue(all(region.contains(points)))
+
+
+if __name__ == "__main__":
+    unittest.main()
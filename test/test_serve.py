@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+from sgl import Line, Plane, Point, Triangle, Vector, calc, protocol
+from sgl.serve import Client, Server
+
+
+class ProtocolTest(unittest.TestCase):
+    def test_round_trip(self):
+        bodies = [Point(1, 2, 3), Vector(1, 0, 0),
+                  Line(Point(0, 0, 0), Vector(1, 1, 0)),
+                  Plane(Point(0, 0, 1), Vector(0, 0, 1)),
+                  Triangle(Point(0, 0, 0), Point(1, 0, 0), Point(0, 1, 0))]
+        for body in bodies:
+            decoded = protocol.decode_body(protocol.encode_body(body))
+            self.assertIs(type(decoded), type(body))
+            self.assertEqual(protocol.encode_body(decoded),
+                             protocol.encode_body(body))
+
+    def test_evaluate_batch(self):
+        point = protocol.encode_body(Point(0, 0, 5))
+        plane = protocol.encode_body(Plane(Point(0, 0, 0), Vector(0, 0, 1)))
+        responses = protocol.evaluate_batch([
+            {"id": 1, "op": "distance", "args": [point, plane]},
+            {"id": 2, "op": "volume", "args": [point, plane]},
+            {"id": 3, "op": "angle", "args": [point, plane]},
+            {"id": 4, "op": "distance", "args": [point, {"type": "Line"}]},
+        ])
+        self.assertEqual(responses[0], {"id": 1, "result": 5})
+        self.assertEqual([r["id"] for r in responses], [1, 2, 3, 4])
+        for response in responses[1:]:
+            self.assertIn("error", response)
+
+    def test_error_in_batch(self):
+        def fail(a, b):
+            raise ZeroDivisionError("float division by zero")
+        vector = protocol.encode_body(Vector(1, 0, 0))
+        point = protocol.encode_body(Point(0, 0, 5))
+        plane = protocol.encode_body(Plane(Point(0, 0, 0), Vector(0, 0, 1)))
+        calc.KERNELS["distance"][Vector, Vector] = fail
+        try:
+            responses = protocol.evaluate_batch([
+                {"id": 1, "op": "distance", "args": [vector, vector]},
+                {"id": 2, "op": "distance", "args": [point, plane]},
+            ])
+        finally:
+            del calc.KERNELS["distance"][Vector, Vector]
+        # Only the failing query gets the error
+        self.assertIn("ZeroDivisionError", responses[0]["error"])
+        self.assertEqual(responses[1], {"id": 2, "result": 5})
+
+
+class ServeTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.server = Server(window=0.01)
+        self.wait(self.server.start())
+
+    def tearDown(self):
+        self.wait(self.server.close())
+        self.loop.close()
+
+    def wait(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def test_only_localhost(self):
+        with self.assertRaises(ValueError):
+            Server("0.0.0.0")
+
+    def test_batched_queries(self):
+        plane = Plane(Point(0, 0, 0), Vector(0, 0, 1))
+        line = Line(Point(0, 0, 1), Vector(1, 0, 1))
+
+        async def session():
+            async with Client(port=self.server.port) as a, \
+                    Client(port=self.server.port) as b:
+                results = await asyncio.gather(*(
+                    [a.query("distance", Point(0, 0, i), plane)
+                     for i in range(5)] +
+                    [b.query("intersection", line, plane)]))
+                with self.assertRaises(ValueError):
+                    await a.query("angle", Point(0, 0, 0), plane)
+                return results, await b.stats()
+        results, stats = self.wait(session())
+        self.assertEqual(results, [0, 1, 2, 3, 4, Point(-1, 0, 0)])
+        self.assertEqual(stats["requests"], 7)
+        self.assertEqual(stats["errors"], 1)
+        self.assertGreaterEqual(stats["batches"], 2)
+        self.assertIsNotNone(stats["latency"]["p50"])
+
+    def submit(self, queries):
+        """Submit the queries and run their batch right away, instead of
+        waiting for the window.
+        """
+        async def run():
+            futures = [self.server.submit(query) for query in queries]
+            self.server._run_batch()
+            return [future.result() for future in futures]
+        return self.wait(run())
+
+    def test_batch(self):
+        point = protocol.encode_body(Point(0, 0, 5))
+        plane = protocol.encode_body(Plane(Point(0, 0, 0), Vector(0, 0, 1)))
+        responses = self.submit(
+            [{"id": i, "op": "distance", "args": [point, plane]}
+             for i in range(3)] + [{"id": 3, "op": "stats"}])
+        self.assertEqual(responses[:3], [{"id": i, "result": 5}
+                                         for i in range(3)])
+        # Everything was answered in one batch, the stats after it
+        stats = responses[3]["result"]
+        self.assertEqual(stats["batches"], 1)
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["mean_batch_size"], 3)
+
+    def test_unexpected_error(self):
+        def fail(a, b):
+            raise AttributeError("unexpected")
+        vector = protocol.encode_body(Vector(1, 0, 0))
+        calc.KERNELS["distance"][Vector, Vector] = fail
+        try:
+            responses = self.submit(
+                [{"id": i, "op": "distance", "args": [vector, vector]}
+                 for i in range(2)])
+        finally:
+            del calc.KERNELS["distance"][Vector, Vector]
+        # Every query of the batch is answered, none is left hanging
+        for i, response in enumerate(responses):
+            self.assertEqual(response["id"], i)
+            self.assertIn("AttributeError", response["error"])
+        self.assertEqual(self.server.stats.errors, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
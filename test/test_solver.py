@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 import unittest
-from sgl import solve
+from sgl import solve, solve_batch
 
 
 class SolverTest(unittest.TestCase):
@@ -48,3 +48,36 @@ class SolverTest(unittest.TestCase):
         solution = solve(m)
         s = solution()
         self.assertEqual(s, (2, 2))
+
+
+class SolveBatchTest(unittest.TestCase):
+    def test_same_as_solve(self):
+        systems = [
+            [[2, 2, 8], [2, -2, 0]],
+            [[1, 2, 3, 4], [0, 1, 5, 2], [3, 0, 1, 7]],
+            [[2, 4, 6], [2, 4, 7]],
+            [[2, 2, 8], [1, 1, 4]],
+            [[1, 2, 3, 4]],
+        ]
+        solutions = solve_batch(systems)
+        expected = [solve([list(row) for row in m]) for m in systems]
+        self.assertEqual(len(solutions), len(systems))
+        for s, e in zip(solutions, expected):
+            self.assertEqual(bool(s), bool(e))
+            if e:
+                self.assertEqual(s.exact, e.exact)
+                self.assertEqual(s.varargs, e.varargs)
+            if e and e.exact:
+                for a, b in zip(s(), e()):
+                    self.assertAlmostEqual(a, b)
+        # More solutions can be picked as usual
+        self.assertEqual(solutions[3](1), expected[3](1))
+
+    def test_keeps_matrices(self):
+        m = [[0, 1, 1], [1, 1, 2]]
+        self.assertEqual(solve_batch([m])[0](), (1, 1))
+        singular = [[1, 1, 2], [2, 2, 4]]
+        solve_batch([singular])
+        self.assertEqual(singular, [[1, 1, 2], [2, 2, 4]])
+        with self.assertRaises(ValueError):
+            solve_batch([m])[0](1)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import unittest
+from sgl import Line, Plane, Point, Vector, calc, profiling, solver
+
+
+class StatsTest(unittest.TestCase):
+    def setUp(self):
+        self.point = Point(1, 2, 3)
+        self.line = Line(Point(0, 0, 0), Vector(1, 0, 0))
+        self.plane = Plane(Point(0, 0, 0), Vector(0, 0, 1))
+
+    def test_counts_operations(self):
+        with profiling() as stats:
+            self.line.distance(self.point)
+            self.line.distance(self.point)
+            calc.angle(self.line, self.plane)
+        self.assertEqual(stats.operations["distance(Line, Point)"].calls, 2)
+        self.assertEqual(stats.operations["angle(Line, Plane)"].calls, 1)
+
+    def test_counts_nested_solver_calls_and_allocations(self):
+        other = Line(Point(0, 1, 0), Vector(2, 0, 0))
+        with profiling() as stats:
+            calc.distance(self.line, self.plane)
+            calc.parallel(self.line, other)
+        op = stats.operations["distance(Line, Plane)"]
+        self.assertEqual(op.allocations["Point"], 1)
+        self.assertIn("distance(Point, Plane)", stats.operations)
+        op = stats.operations["parallel(Line, Line)"]
+        self.assertEqual(op.solver_calls, 1)
+        self.assertEqual(stats.solver_shapes[(3, 3)], 1)
+
+    def test_restores_originals(self):
+        original_distance = calc.distance
+        original_solve = solver.solve
+        original_init = Point.__init__
+        with profiling():
+            self.assertIsNot(calc.distance, original_distance)
+        self.assertIs(calc.distance, original_distance)
+        self.assertIs(Line.distance, original_distance)
+        self.assertIs(solver.solve, original_solve)
+        self.assertIs(Point.__init__, original_init)
+
+    def test_not_reentrant(self):
+        with profiling():
+            with self.assertRaises(RuntimeError):
+                with profiling():
+                    pass
+
+    def test_report(self):
+        with profiling() as stats:
+            self.point.pv()
+        report = stats.report()
+        self.assertIn("Vector: 1", report)
+        self.assertEqual(stats.as_dict()["allocations"], {"Vector": 1})
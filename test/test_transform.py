@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import math
+import unittest
+from sgl import Line, Plane, Point, Transform, Vector
+
+
+class TransformTest(unittest.TestCase):
+    def assertPointAlmostEqual(self, a, b):
+        for x, y in zip(a, b):
+            self.assertAlmostEqual(x, y)
+
+    def test_translation(self):
+        t = Transform.translation(Vector(1, 2, 3))
+        self.assertEqual(t(Point(1, 1, 1)), Point(2, 3, 4))
+        # Vectors are not affected by translations
+        self.assertEqual(t(Vector(1, 1, 1)), Vector(1, 1, 1))
+
+    def test_rotation(self):
+        t = Transform.rotation(Vector(0, 0, 1), math.pi / 2)
+        self.assertPointAlmostEqual(t(Point(1, 0, 0)), Point(0, 1, 0))
+        t = Transform.rotation(Vector(0, 0, 1), math.pi, center=Point(1, 1, 0))
+        self.assertPointAlmostEqual(t(Point(0, 0, 5)), Point(2, 2, 5))
+
+    def test_compose_and_chain(self):
+        move = Transform.translation(Vector(1, 0, 0))
+        scale = Transform.scaling(2)
+        p = Point(1, 1, 1)
+        self.assertEqual((scale * move)(p), scale(move(p)))
+        self.assertEqual(Transform.chain(move, scale), scale * move)
+        self.assertEqual(Transform.chain(move, scale)(p), Point(4, 2, 2))
+
+    def test_inverse(self):
+        t = Transform.chain(
+            Transform.scaling(2, 3, 4),
+            Transform.rotation(Vector(1, 2, 3), 0.7),
+            Transform.translation(Vector(5, -1, 2)),
+        )
+        p = Point(3, -2, 7)
+        self.assertPointAlmostEqual(t.inverse()(t(p)), p)
+        self.assertRaises(ValueError, Transform.scaling(0).inverse)
+
+    def test_line(self):
+        t = Transform.translation(Vector(0, 0, 1))
+        line = Line(Point(0, 0, 0), Vector(1, 0, 0))
+        self.assertEqual(t(line), Line(Point(5, 0, 1), Vector(-1, 0, 0)))
+
+    def test_plane_normal_uses_inverse_transpose(self):
+        # Under a shear, transforming the normal like any other vector
+        # would give a plane that doesn't contain the moved points
+        shear = Transform([[1, 0, 0, 0], [0, 1, 0, 0], [1, 0, 1, 0]])
+        plane = Plane(Point(0, 0, 0), Point(1, 0, 0), Point(0, 1, 0))
+        moved = shear(plane)
+        for p in (Point(1, 0, 0), Point(0, 1, 0), Point(2, 3, 0)):
+            self.assertIn(shear(p), moved)
+
+    def test_apply_points(self):
+        t = Transform.chain(Transform.scaling(2), Transform.translation(
+            Vector(1, 1, 1)))
+        coords = [(0, 0, 0), (1, 2, 3)]
+        self.assertEqual(t.apply_points(coords), [(1, 1, 1), (3, 5, 7)])
+        self.assertEqual(t.apply_many([Point(*c) for c in coords]),
+                         [Point(1, 1, 1), Point(3, 5, 7)])
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import unittest
+from sgl import Line, Plane, Point, Ray, Segment, Triangle, Vector, \
+    cast_rays, distance, intersection
+
+
+class TriangleTest(unittest.TestCase):
+    def setUp(self):
+        self.triangle = Triangle(Point(0, 0, 0), Point(4, 0, 0),
+                                 Point(0, 4, 0))
+
+    def test_collinear(self):
+        with self.assertRaises(ValueError):
+            Triangle(Point(0, 0, 0), Point(1, 1, 1), Point(2, 2, 2))
+
+    def test_sliver(self):
+        # Plane accepts these points, so Triangle does too
+        a, b, c = Point(0, 0, 0), Point(1, 0, 0), Point(0.5, 1e-6, 0)
+        Plane(a, b, c)
+        sliver = Triangle(a, b, c)
+        self.assertIn(Point(0.5, 0, 0), sliver)
+
+    def test_contains(self):
+        self.assertIn(Point(1, 1, 0), self.triangle)
+        self.assertIn(Point(2, 2, 0), self.triangle)
+        self.assertNotIn(Point(3, 3, 0), self.triangle)
+        self.assertNotIn(Point(1, 1, 1), self.triangle)
+
+    def test_area(self):
+        self.assertEqual(self.triangle.area(), 8)
+
+    def test_closest_point(self):
+        closest = self.triangle.closest_point
+        self.assertEqual(closest(Point(-1, -1, 5)), Point(0, 0, 0))
+        self.assertEqual(closest(Point(2, -3, 1)), Point(2, 0, 0))
+        self.assertEqual(closest(Point(3, 3, 0)), Point(2, 2, 0))
+        self.assertEqual(closest(Point(1, 1, -2)), Point(1, 1, 0))
+        self.assertAlmostEqual(distance(Point(1, 1, -2), self.triangle), 2)
+
+    def test_intersection(self):
+        down = Vector(0, 0, -1)
+        self.assertEqual(intersection(Ray(Point(1, 1, 3), down),
+                                      self.triangle), Point(1, 1, 0))
+        self.assertIsNone(intersection(Ray(Point(1, 1, -3), down),
+                                       self.triangle))
+        self.assertEqual(intersection(self.triangle,
+                                      Line(Point(1, 1, -3), down)),
+                         Point(1, 1, 0))
+        self.assertIsNone(intersection(Segment(Point(1, 1, 3),
+                                               Point(1, 1, 1)),
+                                       self.triangle))
+        self.assertIsNone(intersection(Ray(Point(3, 3, 3), down),
+                                       self.triangle))
+        # In the plane of the triangle
+        self.assertIsNone(intersection(Ray(Point(1, 1, 0), Vector(1, 0, 0)),
+                                       self.triangle))
+
+    def test_cast_rays(self):
+        mesh = [self.triangle,
+                Triangle(Point(0, 0, 2), Point(4, 0, 2), Point(0, 4, 2))]
+        rays = [Ray(Point(1, 1, 5), Vector(0, 0, -1)),
+                Ray(Point(1, 1, -5), Vector(0, 0, 1)),
+                Ray(Point(1, 1, 1), Vector(0, 0, -1)),
+                Ray(Point(5, 5, 5), Vector(0, 0, -1))]
+        hits = cast_rays(rays, mesh)
+        self.assertEqual([hit and hit.index for hit in hits], [1, 0, 0, None])
+        self.assertEqual(hits[0].point, Point(1, 1, 2))
+        self.assertAlmostEqual(hits[0].param, 3)
+        self.assertAlmostEqual(hits[0].u, 0.25)
+        self.assertAlmostEqual(hits[0].v, 0.25)
+        for ray, hit in zip(rays, hits):
+            if hit is not None:
+                self.assertEqual(hit.point,
+                                 intersection(ray, mesh[hit.index]))
+
+
+class SegmentRayTest(unittest.TestCase):
+    def setUp(self):
+        self.plane = Plane(Point(0, 0, 0), Vector(0, 0, 1))
+
+    def test_segment(self):
+        segment = Segment(Point(1, 0, 0), Point(3, 0, 0))
+        self.assertEqual(segment, Segment(Point(3, 0, 0), Vector(-2, 0, 0)))
+        self.assertIn(Point(2, 0, 0), segment)
+        self.assertNotIn(Point(4, 0, 0), segment)
+        self.assertEqual(segment.length(), 2)
+        self.assertEqual(distance(Point(5, 1, 0), segment), 5 ** 0.5)
+        with self.assertRaises(ValueError):
+            Segment(Point(1, 0, 0), Point(1, 0, 0))
+
+    def test_ray(self):
+        ray = Ray(Point(1, 0, 0), Vector(1, 0, 0))
+        self.assertEqual(ray, Ray(Point(1, 0, 0), Point(3, 0, 0)))
+        self.assertNotEqual(ray, Ray(Point(1, 0, 0), Vector(-1, 0, 0)))
+        self.assertIn(Point(10, 0, 0), ray)
+        self.assertNotIn(Point(0, 0, 0), ray)
+        self.assertEqual(distance(ray, Point(-2, 4, 0)), 5)
+
+    def test_plane_intersection(self):
+        self.assertEqual(
+            intersection(Segment(Point(0, 0, 2), Point(0, 0, -2)), self.plane),
+            Point(0, 0, 0))
+        self.assertIsNone(
+            intersection(Segment(Point(0, 0, 2), Point(0, 0, 1)), self.plane))
+        self.assertIsNone(
+            intersection(self.plane, Ray(Point(0, 0, 2), Vector(0, 0, 1))))
+        ray = Ray(Point(0, 0, 0), Vector(1, 1, 0))
+        self.assertIs(intersection(ray, self.plane), ray)
+
+
+if __name__ == "__main__":
+    unittest.main()
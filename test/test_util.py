@@ -36,3 +36,11 @@ class UtilTest(unittest.TestCase):
         for i in u:
             self.assertIsInstance(i, MyNumber)
         self.assertEqual([i.x for i in u], [1, 2, 3])
+
+    def test_percentile(self):
+        values = [4, 1, 3, 2, 5]
+        self.assertEqual(util.percentile(values, 0), 1)
+        self.assertEqual(util.percentile(values, 50), 3)
+        self.assertEqual(util.percentile(values, 100), 5)
+        self.assertEqual(util.percentile(values, 90), 4.6)
+        self.assertIsNone(util.percentile([], 50))
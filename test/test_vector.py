@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 import math
 import unittest
-from sgl import Vector
+from sgl import MutableVector, Point, Vector, axpy, cross_dot, dot, lerp, norm2
 
 
 class VectorTest(unittest.TestCase):
@@ -94,3 +94,38 @@ class VectorTest(unittest.TestCase):
 
     def test_vector_normalization(self):
         self.assertAlmostEqual(abs(Vector(1, 1, 1).normalized()), 1)
+
+    def test_vector_fused_operations(self):
+        a, b, c = Vector(2, 3, 5), Vector(7, 11, 13), Vector(1, 0, 2)
+        self.assertEqual(dot(a, b), a * b)
+        self.assertEqual(norm2(a), a * a)
+        self.assertEqual(cross_dot(a, b, c), a * b.cross(c))
+        self.assertEqual(axpy(a, 2, b), a + 2 * b)
+        self.assertEqual(axpy(Point(1, 1, 1), 0.5, c), Vector(1.5, 1, 2))
+        self.assertEqual(lerp(a, b, 0.5), Vector(4.5, 7, 9))
+
+
+class MutableVectorTest(unittest.TestCase):
+    def test_in_place_operators(self):
+        v = MutableVector(1, 2, 3)
+        alias = v
+        v += Vector(1, 1, 1)
+        v -= Vector(0, 1, 2)
+        v *= 3
+        self.assertIs(v, alias)
+        self.assertEqual(v, Vector(6, 6, 6))
+
+    def test_axpy(self):
+        v = Vector(0, 0, 0).mutable()
+        for _ in range(4):
+            v.axpy(0.5, Vector(1, 2, 4))
+        self.assertEqual(v, Vector(2, 4, 8))
+        self.assertEqual(v._v, [2.0, 4.0, 8.0])
+
+    def test_frozen(self):
+        v = MutableVector(1, 2, 3)
+        frozen = v.frozen()
+        v += Vector(1, 1, 1)
+        self.assertEqual(frozen, Vector(1, 2, 3))
+        self.assertEqual(hash(frozen), hash(Vector(1, 2, 3)))
+        self.assertRaises(TypeError, hash, v)